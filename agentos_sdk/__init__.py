@@ -1,4 +1,40 @@
-from agentos_sdk.main import AgentOS
-from agentos_sdk.rag import RAGSystem
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["AgentOS", "RAGSystem"]
+if TYPE_CHECKING:
+    from agentos_sdk.main import AgentOS
+    from agentos_sdk.rag import RAGSystem
+    from agentos_sdk.tools import (
+        BrowserAgent,
+        HuggingFaceAPI,
+        safe_calculator,
+        safe_calculator_batch,
+    )
+
+# Public names are resolved on first access so that importing the package
+# does not pull in swarms, ChromaDB or the model libraries up front
+_LAZY_EXPORTS = {
+    "AgentOS": "agentos_sdk.main",
+    "RAGSystem": "agentos_sdk.rag",
+    "BrowserAgent": "agentos_sdk.tools",
+    "HuggingFaceAPI": "agentos_sdk.tools",
+    "safe_calculator": "agentos_sdk.tools",
+    "safe_calculator_batch": "agentos_sdk.tools",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        )
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
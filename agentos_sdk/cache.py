@@ -0,0 +1,297 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Union
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    A thread-safe least-recently-used cache with optional time-to-live.
+
+    Entries are evicted when the cache grows past ``maxsize`` (least recently
+    used first) or once they are older than ``ttl`` seconds. Hits and misses
+    are counted so callers can expose cache effectiveness.
+
+    Attributes:
+        maxsize (int): Maximum number of entries; 0 disables caching
+        ttl (float, optional): Seconds an entry stays valid; None means forever
+        hits (int): Number of successful lookups
+        misses (int): Number of lookups that found nothing valid
+
+    ``clock`` returns the current time in seconds; tests can pass a fake one.
+
+    Example:
+        >>> cache = LRUCache(maxsize=2, ttl=60)
+        >>> cache.set("a", 1)
+        >>> cache.get("a")
+        1
+        >>> cache.stats()["hits"]
+        1
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default``."""
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at = item
+            if expires_at is not None and expires_at <= self._clock():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self, key: Hashable, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        """
+        Store ``value`` under ``key``, evicting old entries if needed.
+
+        ``ttl`` overrides the cache's time-to-live for this entry.
+        """
+        if self.maxsize <= 0:
+            return
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove ``key`` and return its value, or ``default``."""
+        with self._lock:
+            item = self._data.pop(key, _MISSING)
+        return default if item is _MISSING else item[0]
+
+    def clear(self) -> None:
+        """Remove every entry. Hit and miss counters are kept."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            return False
+        expires_at = item[1]
+        return expires_at is None or expires_at > self._clock()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, hit rate and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+class ResponseCache:
+    """
+    A two-level cache for model responses: in-memory LRU plus optional SQLite.
+
+    Requests are keyed by a hash of their canonical JSON form, so the same
+    model, messages and sampling parameters map to the same entry regardless of
+    key order. Lookups try memory first, then the SQLite file (when ``path`` is
+    set), which lets responses survive restarts and be shared between
+    processes. Both levels honour ``ttl`` and are size bounded.
+
+    Attributes:
+        memory (LRUCache): The in-memory level
+        path (Path, optional): SQLite database file, or None for memory only
+        ttl (float, optional): Seconds an entry stays valid; None means forever
+        max_disk_entries (int): Maximum number of rows kept in SQLite
+        disk_hits (int): Lookups answered by SQLite after missing memory
+        bypassed (int): Requests that were not cacheable and skipped the cache
+
+    ``clock`` replaces the wall clock used for expiry in both levels, which
+    lets tests control time.
+
+    Example:
+        >>> cache = ResponseCache(maxsize=256, ttl=3600, path="llm_cache.db")
+        >>> key = cache.make_key({"model": "gpt-4o-mini", "prompt": "Hi"})
+        >>> cache.set(key, "Hello!")
+        >>> cache.get(key)
+        'Hello!'
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        path: Optional[Union[str, Path]] = None,
+        max_disk_entries: int = 100000,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        self.memory = LRUCache(
+            maxsize=maxsize, ttl=ttl, clock=clock or time.monotonic
+        )
+        self._clock = clock or time.time
+        self.ttl = ttl
+        self.path = Path(path) if path else None
+        self.max_disk_entries = max_disk_entries
+        self.disk_hits = 0
+        self.bypassed = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                str(self.path), check_same_thread=False
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            # Keeps the size-bound trim in set from scanning the table
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed "
+                "ON responses(accessed)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """Return a stable hash of a request's canonical JSON form."""
+        canonical = json.dumps(
+            request,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key`` or None."""
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        now = self._clock()
+        with self._lock:
+            # close() may run concurrently; a closed cache just misses
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT value, created FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl is not None and created + self.ttl <= now:
+                self._db.execute(
+                    "DELETE FROM responses WHERE key = ?", (key,)
+                )
+                self._db.commit()
+                return None
+            self._db.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                (now, key),
+            )
+            self._db.commit()
+            self.disk_hits += 1
+        # The memory copy expires together with the row it came from
+        self.memory.set(
+            key,
+            value,
+            ttl=(
+                created + self.ttl - now
+                if self.ttl is not None
+                else None
+            ),
+        )
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store ``value`` under ``key`` in every level."""
+        self.memory.set(key, value)
+        now = self._clock()
+        with self._lock:
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            # Drop the least recently used rows beyond the size bound
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,),
+            )
+            self._db.commit()
+
+    def record_bypass(self) -> None:
+        """Count a request that skipped the cache."""
+        with self._lock:
+            self.bypassed += 1
+
+    def clear(self) -> None:
+        """Remove every entry from both levels."""
+        self.memory.clear()
+        with self._lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hits per level, misses, bypasses and the overall hit rate."""
+        memory = self.memory.stats()
+        # A disk hit was first counted as a memory miss
+        hits = memory["hits"] + self.disk_hits
+        misses = memory["misses"] - self.disk_hits
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "memory_hits": memory["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": misses,
+            "bypassed": self.bypassed,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "size": memory["size"],
+            "maxsize": memory["maxsize"],
+        }
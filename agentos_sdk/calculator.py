@@ -0,0 +1,394 @@
+import ast
+import functools
+import math
+import operator
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Sequence,
+    Union,
+)
+
+# Bounds that keep every evaluation cheap: integer results may not grow
+# beyond MAX_INT_BITS and exponents may not exceed MAX_EXPONENT in size
+MAX_EXPRESSION_LENGTH = 1000
+MAX_EXPONENT = 10000
+MAX_INT_BITS = 4096
+
+Number = Union[int, float]
+
+
+class CalculatorError(ValueError):
+    """Raised for expressions that are invalid or exceed the limits."""
+
+
+def _check_int(value: Any) -> Any:
+    if isinstance(value, int) and value.bit_length() > MAX_INT_BITS:
+        raise CalculatorError("Result too large")
+    return value
+
+
+def _mul(left: Any, right: Any) -> Any:
+    if (
+        isinstance(left, int)
+        and isinstance(right, int)
+        and left.bit_length() + right.bit_length() > MAX_INT_BITS
+    ):
+        raise CalculatorError("Result too large")
+    return left * right
+
+
+def _pow(base: Any, exponent: Any) -> Any:
+    if (
+        isinstance(exponent, (int, float))
+        and abs(exponent) > MAX_EXPONENT
+    ):
+        raise CalculatorError("Exponent too large")
+    # A result of at least (bit_length - 1) * exponent bits is rejected
+    # before it is computed; anything smaller is checked afterwards
+    if (
+        isinstance(base, int)
+        and isinstance(exponent, int)
+        and exponent > 0
+        and (base.bit_length() - 1) * exponent > MAX_INT_BITS
+    ):
+        raise CalculatorError("Result too large")
+    return base**exponent
+
+
+def _ieee_truediv(left: float, right: float) -> float:
+    """Divide like NumPy: a zero divisor gives ``inf`` or ``nan``."""
+    try:
+        return left / right
+    except ZeroDivisionError:
+        if left == 0 or math.isnan(left):
+            return math.nan
+        return math.copysign(math.inf, left) * math.copysign(
+            1.0, right
+        )
+
+
+def _ieee_floordiv(left: float, right: float) -> float:
+    try:
+        return left // right
+    except ZeroDivisionError:
+        return _ieee_truediv(left, right)
+
+
+def _ieee_mod(left: float, right: float) -> float:
+    try:
+        return left % right
+    except ZeroDivisionError:
+        return math.nan
+
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: _mul,
+    ast.Pow: _pow,
+}
+
+# Division is looked up among the functions at evaluation time, so
+# evaluate_many can return inf and nan where a scalar call raises
+_DIVISION_OPS = {
+    ast.Div: "truediv",
+    ast.FloorDiv: "floordiv",
+    ast.Mod: "mod",
+}
+
+_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+_FUNCTIONS = [
+    "abs",
+    "sqrt",
+    "exp",
+    "log",
+    "log10",
+    "sin",
+    "cos",
+    "tan",
+    "floor",
+    "ceil",
+]
+
+_CONSTANTS = {"pi": math.pi, "e": math.e}
+
+# Function implementations for scalar evaluation
+_MATH = {name: getattr(math, name, abs) for name in _FUNCTIONS}
+_MATH.update(
+    truediv=operator.truediv,
+    floordiv=operator.floordiv,
+    mod=operator.mod,
+)
+
+# The same for the evaluate_many loop, dividing like NumPy does
+_LOOP_MATH = dict(
+    _MATH,
+    truediv=_ieee_truediv,
+    floordiv=_ieee_floordiv,
+    mod=_ieee_mod,
+)
+
+Evaluator = Callable[[Mapping[str, Any], Mapping[str, Callable]], Any]
+
+
+def _compile_node(node: ast.AST) -> Evaluator:
+    """Turn an AST node into a closure of (variables, functions)."""
+    if isinstance(node, ast.Expression):
+        return _compile_node(node.body)
+
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(
+            value, (int, float)
+        ):
+            raise CalculatorError("Only numbers are allowed")
+        _check_int(value)
+        return lambda variables, functions: value
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        op = _BINARY_OPS[type(node.op)]
+        left = _compile_node(node.left)
+        right = _compile_node(node.right)
+        return lambda variables, functions: _check_int(
+            op(
+                left(variables, functions),
+                right(variables, functions),
+            )
+        )
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _DIVISION_OPS:
+        name = _DIVISION_OPS[type(node.op)]
+        left = _compile_node(node.left)
+        right = _compile_node(node.right)
+        return lambda variables, functions: functions[name](
+            left(variables, functions),
+            right(variables, functions),
+        )
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        op = _UNARY_OPS[type(node.op)]
+        operand = _compile_node(node.operand)
+        return lambda variables, functions: op(
+            operand(variables, functions)
+        )
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in _CONSTANTS:
+            value = _CONSTANTS[name]
+            return lambda variables, functions: value
+
+        def variable(variables, functions):
+            try:
+                return variables[name]
+            except KeyError:
+                raise CalculatorError(
+                    f"Unknown name: {name}"
+                ) from None
+
+        return variable
+
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in _FUNCTIONS
+        and len(node.args) == 1
+        and not node.keywords
+    ):
+        name = node.func.id
+        argument = _compile_node(node.args[0])
+        return lambda variables, functions: functions[name](
+            argument(variables, functions)
+        )
+
+    raise CalculatorError(
+        "Only basic mathematical operations are allowed"
+    )
+
+
+class CompiledExpression:
+    """
+    A parsed and validated expression, ready to be evaluated repeatedly.
+
+    Attributes:
+        expression (str): The source expression
+        names (frozenset): Variables the expression refers to
+    """
+
+    def __init__(self, expression: str):
+        if len(expression) > MAX_EXPRESSION_LENGTH:
+            raise CalculatorError("Expression too long")
+        try:
+            tree = ast.parse(expression.strip(), mode="eval")
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            raise CalculatorError("Invalid expression") from None
+        self.expression = expression
+        self.names = frozenset(
+            node.id
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Name)
+            and node.id not in _CONSTANTS
+            and node.id not in _FUNCTIONS
+        )
+        self._evaluate = _compile_node(tree)
+
+    def __call__(self, **variables: Number) -> Number:
+        """Evaluate with scalar variable bindings."""
+        return self._evaluate(variables, _MATH)
+
+    def evaluate_many(
+        self, variables: Mapping[str, Sequence[Number]]
+    ) -> List[float]:
+        """
+        Evaluate over arrays of variable bindings.
+
+        Uses NumPy (the optional ``numpy`` extra) to evaluate every binding
+        in one vectorized pass when it is installed, and a slower loop over
+        the bindings otherwise. Both give the same results: division by zero
+        gives ``inf`` or ``nan`` instead of an error, like NumPy does.
+
+        Args:
+            variables: Maps each variable to its numbers; scalars are
+                broadcast
+
+        Returns:
+            List[float]: One result per binding
+
+        Raises:
+            CalculatorError: If a variable is missing or not numeric, or the
+                sequences differ in length.
+        """
+        missing = self.names - set(variables)
+        if missing:
+            raise CalculatorError(
+                f"Unknown name: {', '.join(sorted(missing))}"
+            )
+        try:
+            import numpy as np
+        except ImportError:
+            return self._evaluate_loop(variables)
+
+        arrays = {
+            name: _as_array(np, name, values)
+            for name, values in variables.items()
+        }
+        try:
+            # Scalars only still give one result
+            shape = np.broadcast_shapes(
+                *(array.shape for array in arrays.values())
+            ) or (1,)
+        except ValueError:
+            raise CalculatorError(
+                "Variables must have the same length"
+            ) from None
+        functions = {name: getattr(np, name) for name in _FUNCTIONS}
+        functions.update(
+            truediv=np.true_divide,
+            floordiv=np.floor_divide,
+            mod=np.mod,
+        )
+        with np.errstate(all="ignore"):
+            result = self._evaluate(arrays, functions)
+        return np.broadcast_to(result, shape).astype(float).tolist()
+
+    def _evaluate_loop(
+        self, variables: Mapping[str, Sequence[Number]]
+    ) -> List[float]:
+        scalars: Dict[str, float] = {}
+        columns: Dict[str, List[float]] = {}
+        for name, values in variables.items():
+            if isinstance(values, Sequence) and not isinstance(
+                values, (str, bytes)
+            ):
+                columns[name] = [
+                    _as_float(name, value) for value in values
+                ]
+            else:
+                scalars[name] = _as_float(name, values)
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise CalculatorError(
+                "Variables must have the same length"
+            )
+        results = []
+        for index in range(lengths.pop() if lengths else 1):
+            binding = dict(scalars)
+            for name, values in columns.items():
+                binding[name] = values[index]
+            try:
+                results.append(
+                    float(self._evaluate(binding, _LOOP_MATH))
+                )
+            except CalculatorError:
+                raise
+            except (
+                ZeroDivisionError,
+                OverflowError,
+                TypeError,
+                ValueError,
+            ):
+                results.append(math.nan)
+        return results
+
+
+def _as_float(name: str, value: Any) -> float:
+    """Coerce one variable value, rejecting strings and other non-numbers."""
+    if isinstance(value, (str, bytes)):
+        raise CalculatorError(f"Variable {name} must be numeric")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise CalculatorError(
+            f"Variable {name} must be numeric"
+        ) from None
+
+
+def _as_array(np: Any, name: str, values: Any) -> Any:
+    """Coerce a variable's values to a float array like ``_as_float``."""
+    if isinstance(values, (str, bytes)):
+        raise CalculatorError(f"Variable {name} must be numeric")
+    array = np.asarray(values)
+    # Booleans, integers and floats convert directly; anything else,
+    # such as strings inside a list, goes through float() one by one
+    if array.dtype.kind in "biuf":
+        return array.astype(np.float64)
+    if array.dtype.kind != "O":
+        raise CalculatorError(f"Variable {name} must be numeric")
+    return np.array(
+        [_as_float(name, value) for value in array.ravel()],
+        dtype=np.float64,
+    ).reshape(array.shape)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_expression(expression: str) -> CompiledExpression:
+    """
+    Compile an expression once; repeated expressions reuse the result.
+
+    Raises:
+        CalculatorError: If the expression is invalid.
+    """
+    return CompiledExpression(expression)
+
+
+def format_result(result: Any) -> str:
+    """Format a calculation result the way safe_calculator reports it."""
+    if isinstance(result, bool) or not isinstance(
+        result, (int, float)
+    ):
+        return "Error: Invalid result type"
+    # Handle very large or very small numbers
+    if abs(result) > 1e15 or (abs(result) < 1e-15 and result != 0):
+        return f"{result:.2e}"
+    # For regular floats, limit decimal places
+    if isinstance(result, float):
+        return f"{result:.6f}".rstrip("0").rstrip(".")
+    return str(result)
@@ -1,4 +1,6 @@
 import time
+from typing import Iterable
+
 import psutil
 
 from rich.console import Console
@@ -363,13 +365,27 @@ class Dashboard:
         if output:
             self.last_output = output
 
-    def append_output(self, new_output: str):
-        """Append new output to the existing output for real-time streaming"""
+    def append_output(self, new_output: str, newline: bool = True):
+        """Append new output to the existing output for real-time streaming
+
+        Pass ``newline=False`` for token chunks that continue the current line.
+        """
         if new_output:
-            if self.last_output:
+            if self.last_output and newline:
                 self.last_output += "\n" + new_output
             else:
-                self.last_output = new_output
+                self.last_output += new_output
+
+    def stream_output(self, chunks: Iterable[str]) -> str:
+        """Append streamed chunks to the output as they arrive and return the full text"""
+        # Start the streamed text on its own line
+        if self.last_output:
+            self.last_output += "\n"
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+            self.append_output(chunk, newline=False)
+        return "".join(parts)
 
     def clear_output(self):
         """Clear the current output"""
@@ -0,0 +1,157 @@
+import asyncio
+import atexit
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Optional
+
+from loguru import logger
+
+
+class BackgroundEventLoop:
+    """
+    A long-lived asyncio event loop running on a dedicated daemon thread.
+
+    Synchronous code submits coroutines to the loop instead of calling
+    ``asyncio.run``, which creates and tears down a loop (and everything bound
+    to it, such as HTTP connection pools and browser sessions) on every call
+    and refuses to run inside an already running loop. Objects created by a
+    coroutine on this loop stay usable by later coroutines submitted to it.
+
+    Attributes:
+        name (str): Name of the loop thread
+
+    Example:
+        >>> runner = get_event_loop_runner()
+        >>> runner.run(asyncio.sleep(0.1, result="done"))
+        'done'
+    """
+
+    def __init__(self, name: str = "agentos-event-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, started on first use."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=loop.run_forever,
+                    name=self.name,
+                    daemon=True,
+                )
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def in_loop_thread(self) -> bool:
+        """Return True if called from the loop's own thread."""
+        return threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable[Any]) -> Future:
+        """
+        Schedule a coroutine on the loop.
+
+        Args:
+            coro: The coroutine to run
+
+        Returns:
+            Future: A thread-safe future resolving to the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(
+        self, coro: Awaitable[Any], timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run a coroutine on the loop and block until it finishes.
+
+        Works from plain threads as well as from inside another running event
+        loop (which is blocked while waiting).
+
+        Args:
+            coro: The coroutine to run
+            timeout: Seconds to wait for the result; None waits forever
+
+        Returns:
+            The coroutine's result. Exceptions it raises are propagated.
+
+        Raises:
+            RuntimeError: If called from the loop's own thread, which would
+                deadlock.
+            concurrent.futures.TimeoutError: If ``timeout`` expires; the
+                coroutine is cancelled.
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError(
+                "BackgroundEventLoop.run cannot be called from its own loop; "
+                "await the coroutine instead"
+            )
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    async def run_async(self, coro: Awaitable[Any]) -> Any:
+        """
+        Await a coroutine on the background loop from another event loop.
+
+        Args:
+            coro: The coroutine to run
+
+        Returns:
+            The coroutine's result
+        """
+        if self.in_loop_thread():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Cancel pending tasks, stop the loop and join its thread."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+        if loop is None:
+            return
+
+        async def cancel_pending():
+            tasks = [
+                task
+                for task in asyncio.all_tasks()
+                if task is not asyncio.current_task()
+            ]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(
+                cancel_pending(), loop
+            ).result(timeout)
+        except Exception as e:
+            logger.error(f"Error cancelling event loop tasks: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+
+_event_loop_runner: Optional[BackgroundEventLoop] = None
+_event_loop_runner_lock = threading.Lock()
+
+
+def get_event_loop_runner() -> BackgroundEventLoop:
+    """Return the process-wide BackgroundEventLoop, creating it on first use."""
+    global _event_loop_runner
+    with _event_loop_runner_lock:
+        if _event_loop_runner is None:
+            _event_loop_runner = BackgroundEventLoop()
+            atexit.register(_event_loop_runner.close)
+    return _event_loop_runner
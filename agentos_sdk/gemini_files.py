@@ -0,0 +1,251 @@
+import atexit
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from agentos_sdk.cache import LRUCache
+
+# Uploaded files are deleted by the Files API after 48 hours
+DEFAULT_FILE_TTL = 48 * 3600
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def is_stale_file_error(error: Exception) -> bool:
+    """
+    Return True if ``error`` means an uploaded file can no longer be used.
+
+    Missing, expired and inaccessible files qualify. Rate limits, timeouts,
+    server errors and anything unrecognized do not.
+    """
+    code = getattr(error, "code", None)
+    if isinstance(code, int) and (code == 429 or code >= 500):
+        return False
+    status = str(getattr(error, "status", "") or "").upper()
+    return (
+        code in (403, 404)
+        or status in ("NOT_FOUND", "PERMISSION_DENIED")
+        or "expired" in str(error).lower()
+    )
+
+
+class GeminiFileCache:
+    """
+    Uploads files to the Gemini Files API once and reuses the handles.
+
+    Handles are keyed by the SHA-256 of the file contents, so the same video
+    under another path is not uploaded again, and are dropped shortly before
+    the API expires them. Digests are memoized by path, size and
+    modification time so unchanged files are not re-hashed. A single GenAI
+    client is shared by every upload and request.
+
+    Attributes:
+        expiry_margin (float): Seconds before expiry at which a handle is
+            no longer reused
+        poll_interval (float): Seconds between checks while an uploaded
+            video is still being processed
+        uploads (int): Number of files uploaded
+        hits (int): Number of uploads avoided
+
+    Example:
+        >>> cache = get_gemini_file_cache()
+        >>> cache.ask("demo.mp4", ["Who speaks first?", "Where is it set?"])
+        ['The presenter ...', 'A conference hall ...']
+    """
+
+    def __init__(
+        self,
+        client: Any = None,
+        expiry_margin: float = 600,
+        poll_interval: float = 2.0,
+        max_workers: int = 4,
+    ):
+        self._client = client
+        self.expiry_margin = expiry_margin
+        self.poll_interval = poll_interval
+        self.max_workers = max_workers
+        self._files: Dict[str, Tuple[Any, float]] = {}
+        self._digests = LRUCache(maxsize=1024)
+        self._lock = threading.Lock()
+        self._upload_locks: Dict[str, threading.Lock] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.uploads = 0
+        self.hits = 0
+
+    @property
+    def client(self):
+        """The shared GenAI client, created on first use."""
+        with self._lock:
+            if self._client is None:
+                from google import genai
+
+                self._client = genai.Client()
+            return self._client
+
+    def digest(self, path: str) -> str:
+        """Return the content digest of ``path``, hashing it only when changed."""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = file_digest(path)
+            self._digests.set(key, digest)
+        return digest
+
+    def _expires_at(self, file: Any) -> float:
+        expiration_time = getattr(file, "expiration_time", None)
+        if expiration_time is not None:
+            return expiration_time.timestamp()
+        return time.time() + DEFAULT_FILE_TTL
+
+    def _wait_until_active(self, file: Any) -> Any:
+        """Wait for the API to finish processing an uploaded video."""
+        while getattr(file.state, "name", file.state) == "PROCESSING":
+            time.sleep(self.poll_interval)
+            file = self.client.files.get(name=file.name)
+        if getattr(file.state, "name", file.state) == "FAILED":
+            raise RuntimeError(f"Processing of {file.name} failed")
+        return file
+
+    def upload(self, path: str) -> Any:
+        """
+        Return a usable file handle for ``path``, uploading it if needed.
+
+        Args:
+            path (str): Path of the file to upload
+
+        Returns:
+            The Files API handle, ready to be passed in ``contents``
+        """
+        return self._upload(path)[0]
+
+    def _upload(self, path: str) -> Tuple[Any, bool]:
+        """Return the handle for ``path`` and whether it was reused."""
+        digest = self.digest(path)
+        with self._lock:
+            upload_lock = self._upload_locks.setdefault(
+                digest, threading.Lock()
+            )
+
+        # Concurrent requests for the same content wait for one upload
+        with upload_lock:
+            with self._lock:
+                cached = self._files.get(digest)
+                if (
+                    cached is not None
+                    and cached[1] - self.expiry_margin > time.time()
+                ):
+                    self.hits += 1
+                    return cached[0], True
+
+            file = self.client.files.upload(file=path)
+            file = self._wait_until_active(file)
+            with self._lock:
+                self._files[digest] = (file, self._expires_at(file))
+                self.uploads += 1
+            logger.info(f"Uploaded {path} to Gemini as {file.name}")
+            return file, False
+
+    def invalidate(self, path: str) -> None:
+        """Forget the uploaded handle for ``path``'s contents."""
+        digest = self.digest(path)
+        with self._lock:
+            self._files.pop(digest, None)
+
+    def generate(
+        self, path: str, prompt: str, model_name: str
+    ) -> str:
+        """
+        Ask the model about an uploaded file.
+
+        A reused handle that the API reports as missing, expired or not
+        accessible is dropped and the file uploaded again once. Other errors
+        are raised.
+        """
+        file, reused = self._upload(path)
+        try:
+            response = self.client.models.generate_content(
+                model=model_name, contents=[file, prompt]
+            )
+        except Exception as e:
+            if not reused or not is_stale_file_error(e):
+                raise
+            logger.warning(
+                f"Cached upload of {path} was rejected ({e}); uploading again"
+            )
+            self.invalidate(path)
+            response = self.client.models.generate_content(
+                model=model_name,
+                contents=[self.upload(path), prompt],
+            )
+        return response.text
+
+    def ask(
+        self, path: str, questions: List[str], model_name: str
+    ) -> List[str]:
+        """
+        Ask several questions about one file with a single upload.
+
+        The questions are sent concurrently.
+
+        Returns:
+            List[str]: One answer per question, in the same order
+        """
+        self.upload(path)
+        if len(questions) == 1:
+            return [self.generate(path, questions[0], model_name)]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="gemini-files",
+                )
+            executor = self._executor
+        return list(
+            executor.map(
+                lambda question: self.generate(
+                    path, question, model_name
+                ),
+                questions,
+            )
+        )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "uploads": self.uploads,
+                "hits": self.hits,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+_gemini_file_cache: Optional[GeminiFileCache] = None
+_gemini_file_cache_lock = threading.Lock()
+
+
+def get_gemini_file_cache() -> GeminiFileCache:
+    """Return the process-wide GeminiFileCache, creating it on first use."""
+    global _gemini_file_cache
+    with _gemini_file_cache_lock:
+        if _gemini_file_cache is None:
+            _gemini_file_cache = GeminiFileCache()
+            atexit.register(_gemini_file_cache.close)
+    return _gemini_file_cache
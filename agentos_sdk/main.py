@@ -1,7 +1,19 @@
+import asyncio
+import functools
+import inspect
 import os
+import queue
+import threading
 import traceback
 import time
-from typing import List, Optional
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from loguru import logger
 from swarms import Agent
@@ -11,6 +23,8 @@ from agentos_sdk.banner import AGENTOS_BANNER
 from agentos_sdk.rag import RAGSystem
 from agentos_sdk.prompt import AGENT_OS_SYSTEM_PROMPT
 from agentos_sdk.tools import (
+    TokenStream,
+    get_model_registry,
     run_browser_agent,
     call_huggingface_model,
     call_models_on_litellm,
@@ -19,12 +33,53 @@ from agentos_sdk.tools import (
     generate_speech,
     respond_to_user,
     generate_video_single_clip,
+    generate_video_clips,
     process_video_with_gemini,
+    process_long_video_with_gemini,
     create_file,
     update_file,
 )
 
 
+class RunResult(str):
+    """
+    The output of an AgentOS task together with its latency breakdown.
+
+    Behaves exactly like the output string, so existing callers are unaffected.
+
+    Attributes:
+        timings (Dict[str, float]): Seconds spent per stage: "plan", "rag" and
+            "video" (pre-processing, run concurrently), "agent" and "total"
+        degraded (List[str]): Pre-processing stages that failed or timed out
+            and were left out of the prompt
+
+    Example:
+        >>> result = agent.run("Summarize the report", video="demo.mp4")
+        >>> result.timings
+        {'rag': 0.21, 'video': 4.8, 'agent': 6.3, 'total': 11.1}
+    """
+
+    timings: Dict[str, float]
+    degraded: List[str]
+
+    def __new__(
+        cls,
+        text: str,
+        timings: Optional[Dict[str, float]] = None,
+        degraded: Optional[List[str]] = None,
+    ):
+        result = super().__new__(cls, text)
+        result.timings = dict(timings or {})
+        result.degraded = list(degraded or [])
+        return result
+
+
+def _timed(func: Callable[[], Any]) -> Tuple[Any, float]:
+    """Call ``func`` and return its result and duration in seconds."""
+    started = time.perf_counter()
+    return func(), time.perf_counter() - started
+
+
 class AgentOS:
     """
     AgentOS: A comprehensive autonomous operating system interface for managing and coordinating multiple computational resources.
@@ -41,9 +96,16 @@ class AgentOS:
     Attributes:
         model_name (str): The name of the primary language model to use
         system_prompt (str): The system prompt that defines the agent's behavior
-        rag_system (RAGSystem): The retrieval-augmented generation system for document context
+        rag_system (RAGSystem): The retrieval-augmented generation system for document context.
+            None until the first document is added, unless one is passed in
         rag_chunk_size (int): Size of chunks for document processing in RAG
         rag_collection_name (str): Name of the RAG document collection
+        rag_persist_directory (str): Optional directory where the RAG index is persisted across restarts
+        preload_models (list): Hugging Face models loaded into the shared model cache at startup
+        stage_timeouts (dict): Seconds the "plan", "rag" and "video" pre-processing stages may
+            take before the task continues without them
+        video_segment_seconds (float): When set, videos longer than this are analyzed as
+            concurrently processed segments of this many seconds
 
     Example:
         >>> agent = AgentOS(model_name="gpt-4o-mini")
@@ -51,7 +113,8 @@ class AgentOS:
         >>> print(result)
 
     Notes:
-        - The agent automatically initializes with a RAG system for document processing
+        - The RAG system is created on the first add_file/add_folder call, and retrieval is
+          skipped while no documents are indexed
         - Multiple tools are available including browser automation and model calling
         - The system can handle multi-modal inputs (text, images, video, audio)
         - Error handling is built-in for robustness
@@ -64,26 +127,36 @@ class AgentOS:
         rag_system: Optional[RAGSystem] = None,
         rag_chunk_size: int = 1000,
         rag_collection_name: str = "agentos_docs",
+        rag_persist_directory: Optional[str] = None,
         artifacts_folder: str = "artifacts",
         streaming_on: bool = False,
         plan_on: bool = False,
         max_loops: int = 1,
         reasoning_agent_on: bool = False,
+        preload_models: Optional[
+            List[Union[str, Dict[str, Any]]]
+        ] = None,
+        stage_timeouts: Optional[Dict[str, float]] = None,
+        video_segment_seconds: Optional[float] = None,
     ):
         self.model_name = model_name
         self.system_prompt = system_prompt
         self.rag_system = rag_system
         self.rag_chunk_size = rag_chunk_size
         self.rag_collection_name = rag_collection_name
+        self.rag_persist_directory = rag_persist_directory
         self.artifacts_folder = artifacts_folder
         self.streaming_on = streaming_on
         self.plan_on = plan_on
         self.max_loops = max_loops
         self.reasoning_agent_on = reasoning_agent_on
+        self.preload_models = preload_models
+        self.stage_timeouts = dict(stage_timeouts or {})
+        self.video_segment_seconds = video_segment_seconds
 
         self.setup_agent_os()
 
-        tools = [
+        self.tools = [
             run_browser_agent,
             call_huggingface_model,
             call_models_on_litellm,
@@ -92,24 +165,71 @@ class AgentOS:
             generate_speech,
             respond_to_user,
             generate_video_single_clip,
+            generate_video_clips,
             create_file,
             update_file,
         ]
 
-        self.agent = Agent(
-            model_name=model_name,
-            system_prompt=system_prompt,
+        self.agent = self.create_agent()
+        # Worker threads of concurrent batches each get their own agent so
+        # their conversation memories do not interleave. The same goes for
+        # the streaming agents, created on demand with streaming_on
+        self._thread_local = threading.local()
+        # Shared by the concurrent pre-processing stages of every task
+        self._stage_executor: Optional[ThreadPoolExecutor] = None
+        self._stage_executor_lock = threading.Lock()
+
+        # The RAG system loads an embedding model, so it is only set up once
+        # documents are added (or a persisted index is found)
+        self._rag_lock = threading.Lock()
+
+        if self.preload_models:
+            get_model_registry().preload(self.preload_models)
+
+    def create_agent(
+        self, streaming_on: Optional[bool] = None
+    ) -> Agent:
+        """
+        Create the main tool-using agent.
+
+        Args:
+            streaming_on (bool, optional): Override ``self.streaming_on``.
+        """
+        if streaming_on is None:
+            streaming_on = self.streaming_on
+        return Agent(
+            model_name=self.model_name,
+            system_prompt=self.system_prompt,
             agent_name="AgentOS",
             agent_description="An agent that can perform OS-level tasks",
             dynamic_temperature_enabled=True,
-            tools=tools,
-            streaming_on=self.streaming_on,
+            tools=self.tools,
+            streaming_on=streaming_on,
             max_turns=self.max_loops,
             print_on=True,
             output_type="str-all-except-first",
         )
 
-        self.rag_system = self.setup_rag()
+    def _thread_agent(self) -> Agent:
+        """Return the agent owned by the current worker thread."""
+        agent = getattr(self._thread_local, "agent", None)
+        if agent is None:
+            agent = self.create_agent()
+            self._thread_local.agent = agent
+        return agent
+
+    def _stream_agent(self) -> Agent:
+        """
+        Return the streaming agent owned by the current thread.
+
+        Every ``stream`` call produces on a thread of its own, so concurrent
+        streams never share an agent or interleave their chunks.
+        """
+        agent = getattr(self._thread_local, "stream_agent", None)
+        if agent is None:
+            agent = self.create_agent(streaming_on=True)
+            self._thread_local.stream_agent = agent
+        return agent
 
     def reasoning_agent(self):
         return Agent(
@@ -161,6 +281,8 @@ class AgentOS:
 
         This method initializes the RAG system with the configured collection name and chunk size.
         The RAG system is used to provide relevant context from stored documents when processing tasks.
+        When ``rag_persist_directory`` is set, the index survives restarts and only
+        changed files are re-embedded.
 
         Returns:
             RAGSystem: Initialized RAG system ready for document processing and retrieval.
@@ -168,8 +290,42 @@ class AgentOS:
         return RAGSystem(
             collection_name=self.rag_collection_name,
             chunk_size=self.rag_chunk_size,
+            persist_directory=self.rag_persist_directory,
         )
 
+    def get_rag_system(self) -> RAGSystem:
+        """
+        Return the RAG system, setting it up on first use.
+
+        Returns:
+            RAGSystem: The existing RAG system, or a new one from ``setup_rag``.
+        """
+        if self.rag_system is None:
+            with self._rag_lock:
+                if self.rag_system is None:
+                    self.rag_system = self.setup_rag()
+        return self.rag_system
+
+    def _retrieval_rag(self) -> Optional[RAGSystem]:
+        """
+        Return the RAG system to retrieve context from, or None if nothing is indexed.
+
+        A persisted index from an earlier run is opened on demand; otherwise no
+        RAG system is created and no query is embedded until documents are added.
+        """
+        if self.rag_system is None:
+            if not self.rag_persist_directory or not (
+                RAGSystem.manifest_file(
+                    self.rag_persist_directory,
+                    self.rag_collection_name,
+                ).is_file()
+            ):
+                return None
+            self.get_rag_system()
+        if self.rag_system.is_empty():
+            return None
+        return self.rag_system
+
     def env_warning(self):
         # We need to add warning for the user to set the environment variables
         if os.getenv("OPENAI_API_KEY") is None:
@@ -195,7 +351,7 @@ class AgentOS:
             file_path (str): Path to the file to be added to the RAG system.
                 Supported formats depend on the RAG system's capabilities.
         """
-        self.rag_system.add_document(file_path)
+        self.get_rag_system().add_document(file_path)
 
     def add_multiple_documents(self, file_paths: List[str]):
         """
@@ -205,7 +361,7 @@ class AgentOS:
             file_paths (List[str]): List of file paths to be added to the RAG system.
                 All files should be in supported formats.
         """
-        self.rag_system.add_multiple_documents(file_paths)
+        self.get_rag_system().add_multiple_documents(file_paths)
 
     def add_folder(self, folder_path: str):
         """
@@ -215,7 +371,7 @@ class AgentOS:
             folder_path (str): Path to the folder containing documents to be added.
                 The system will recursively process all supported files in the folder.
         """
-        self.rag_system.add_folder(folder_path)
+        self.get_rag_system().add_folder(folder_path)
 
     def clear_processed_files(self):
         """
@@ -224,7 +380,8 @@ class AgentOS:
         This method removes all documents from the RAG system's collection,
         effectively resetting its knowledge base.
         """
-        self.rag_system.clear_processed_files()
+        if self.rag_system is not None:
+            self.rag_system.clear_processed_files()
 
     def run(
         self,
@@ -232,6 +389,8 @@ class AgentOS:
         img: str = None,
         video: str = None,
         audio: str = None,
+        rag_context: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
     ):
         """
         Execute a task using the AgentOS system with optional multi-modal inputs.
@@ -245,6 +404,12 @@ class AgentOS:
             img (str, optional): Path to an image file for image-based tasks. Defaults to None.
             video (str, optional): Path to a video file for video-based tasks. Defaults to None.
             audio (str, optional): Path to an audio file for audio-based tasks. Defaults to None.
+            rag_context (str, optional): Context already retrieved for this task. When given,
+                the RAG lookup is skipped. Defaults to None.
+            on_token (Callable[[str], None], optional): Called with each chunk of the
+                model's answer as it is generated, e.g.
+                ``lambda chunk: dashboard.append_output(chunk, newline=False)``.
+                Defaults to None (no streaming).
 
         Returns:
             str: The result of the task execution. If an error occurs, returns an error message.
@@ -263,41 +428,169 @@ class AgentOS:
             - The system handles None responses gracefully
             - Errors are caught and returned as informative messages
         """
-        try:
-            task_prompt = ""
+        if on_token is None:
+            return self._run(
+                task, img, video, audio, rag_context, self.agent
+            )
+
+        started = time.perf_counter()
+        first_token = []
 
-            # Plan prompt
-            if self.plan_on:
-                planning_agent = self.reasoning_agent()
-                plan_prompt = planning_agent.run(
-                    task=f"Make a plan for the task: {task}. What are the steps to complete the task? Use the following tools: {self.create_names_for_tools()}"
+        def timed_on_token(chunk: str) -> None:
+            if not first_token:
+                first_token.append(time.perf_counter() - started)
+                logger.info(
+                    f"AgentOS: first token after {first_token[0]:.3f}s"
                 )
-                task_prompt += f"Plan:\n{plan_prompt}\n\n"
-
-            # Add RAG context if available
-            if self.rag_system:
-                context = self.rag_system.get_relevant_context(task)
-                if context:
-                    task_prompt += (
-                        f"Context from knowledge base:\n{context}\n\n"
-                    )
+            on_token(chunk)
+
+        return self._run(
+            task,
+            img,
+            video,
+            audio,
+            rag_context,
+            self._stream_agent(),
+            on_token=timed_on_token,
+        )
+
+    def stream(
+        self,
+        task: str,
+        img: str = None,
+        video: str = None,
+        audio: str = None,
+        rag_context: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> TokenStream:
+        """
+        Execute a task and iterate over the answer as it is generated.
+
+        The task runs in a background thread exactly like ``run``; chunks of the
+        model's answer are yielded as they arrive. If the model produced no chunks
+        (for example because the task failed), the final output is yielded as a
+        single chunk instead.
+
+        Args:
+            task (str): The main task or query to be processed.
+            img (str, optional): Path to an image file. Defaults to None.
+            video (str, optional): Path to a video file. Defaults to None.
+            audio (str, optional): Path to an audio file. Defaults to None.
+            rag_context (str, optional): Context already retrieved for this task.
+            on_token (Callable[[str], None], optional): Also called with every chunk.
+
+        Returns:
+            TokenStream: Iterable of text chunks; ``time_to_first_token`` and
+                ``elapsed`` report the latency once consumed.
+
+        Example:
+            >>> dashboard = Dashboard()
+            >>> stream = agent.stream("Summarize the latest AI news")
+            >>> dashboard.stream_output(stream)
+            >>> print(f"First token after {stream.time_to_first_token:.2f}s")
+        """
+        chunks: "queue.Queue" = queue.Queue()
+        done = object()
 
-            if video:
-                out = process_video_with_gemini(
-                    video_path=video, task=task
+        def produce() -> None:
+            streamed = []
+
+            def forward(chunk: str) -> None:
+                streamed.append(True)
+                chunks.put(chunk)
+
+            try:
+                output = self._run(
+                    task,
+                    img,
+                    video,
+                    audio,
+                    rag_context,
+                    self._stream_agent(),
+                    on_token=forward,
                 )
-                task_prompt += f"Video Analysis Output:\n{out}\n\n"
+                if not streamed and output:
+                    chunks.put(str(output))
+            finally:
+                chunks.put(done)
+
+        def consume():
+            threading.Thread(
+                target=produce, name="agentos-stream", daemon=True
+            ).start()
+            while True:
+                chunk = chunks.get()
+                if chunk is done:
+                    return
+                yield chunk
+
+        return TokenStream(
+            consume(), on_chunk=on_token, label="AgentOS"
+        )
+
+    @staticmethod
+    def _supports_streaming_callback(agent: Agent) -> bool:
+        """Return True if ``agent.run`` can stream tokens to a callback."""
+        try:
+            parameters = inspect.signature(agent.run).parameters
+        except (TypeError, ValueError):
+            return False
+        return "streaming_callback" in parameters
+
+    def _plan(self, task: str) -> str:
+        """Ask the reasoning agent for a step-by-step plan for a task."""
+        planning_agent = self.reasoning_agent()
+        return planning_agent.run(
+            task=f"Make a plan for the task: {task}. What are the steps to complete the task? Use the following tools: {self.create_names_for_tools()}"
+        )
+
+    def _run(
+        self,
+        task: str,
+        img: Optional[str],
+        video: Optional[str],
+        audio: Optional[str],
+        rag_context: Optional[str],
+        agent: Agent,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Execute a task with the given agent. See ``run``."""
+        started = time.perf_counter()
+        try:
+            # Planning, retrieval and video analysis are independent, so
+            # they run concurrently
+            results, timings, degraded = self._run_stages(
+                self._preprocessing_stages(task, video, rag_context)
+            )
+            task_prompt = self._stage_prompt(results, rag_context)
 
             # Run the agent
-            final_output = self.agent.run(
-                task=task_prompt + task if task_prompt else task,
-                img=img,
+            run_kwargs = {}
+            if on_token is not None:
+                if self._supports_streaming_callback(agent):
+                    run_kwargs["streaming_callback"] = on_token
+                else:
+                    logger.warning(
+                        "The installed swarms Agent does not accept a "
+                        "streaming_callback; output will not be streamed"
+                    )
+            final_output, timings["agent"] = _timed(
+                lambda: agent.run(
+                    task=task_prompt + task if task_prompt else task,
+                    img=img,
+                    **run_kwargs,
+                )
             )
+            timings["total"] = time.perf_counter() - started
 
             # Handle None response
             if final_output is None:
-                return "No response generated. Please try again."
+                final_output = (
+                    "No response generated. Please try again."
+                )
 
+            if isinstance(final_output, str):
+                return RunResult(final_output, timings, degraded)
             return final_output
 
         except Exception as e:
@@ -305,7 +598,203 @@ class AgentOS:
             logger.error(
                 f"Error running AgentOS: {str(e)} Traceback: {traceback.format_exc()}"
             )
-            return error_msg
+            return RunResult(
+                error_msg,
+                {"total": time.perf_counter() - started},
+            )
+
+    def _retrieve_context(self, task: str) -> Optional[str]:
+        """Return knowledge base context for ``task``, or None if nothing is indexed."""
+        rag = self._retrieval_rag()
+        if rag is None:
+            return None
+        return rag.get_relevant_context(task)
+
+    def _preprocessing_stages(
+        self,
+        task: str,
+        video: Optional[str],
+        rag_context: Optional[str],
+    ) -> Dict[str, Callable[[], Any]]:
+        """Return the pre-processing stages that apply to a task, by name."""
+        stages = {}
+        if self.plan_on:
+            stages["plan"] = functools.partial(self._plan, task)
+        if rag_context is None:
+            stages["rag"] = functools.partial(
+                self._retrieve_context, task
+            )
+        if video and self.video_segment_seconds:
+            stages["video"] = functools.partial(
+                process_long_video_with_gemini,
+                video_path=video,
+                task=task,
+                segment_seconds=self.video_segment_seconds,
+            )
+        elif video:
+            stages["video"] = functools.partial(
+                process_video_with_gemini, video_path=video, task=task
+            )
+        return stages
+
+    @staticmethod
+    def _stage_prompt(
+        results: Dict[str, Any], rag_context: Optional[str]
+    ) -> str:
+        """Build the prompt prefix from the pre-processing stage outputs."""
+        task_prompt = ""
+        if results.get("plan") is not None:
+            task_prompt += f"Plan:\n{results['plan']}\n\n"
+        context = results.get("rag", rag_context)
+        if context:
+            task_prompt += (
+                f"Context from knowledge base:\n{context}\n\n"
+            )
+        if results.get("video") is not None:
+            task_prompt += (
+                f"Video Analysis Output:\n{results['video']}\n\n"
+            )
+        return task_prompt
+
+    def _submit_stage(
+        self,
+        name: str,
+        stage: Callable[[], Any],
+        starts: Dict[str, float],
+    ) -> Future:
+        """
+        Run ``stage`` on the shared stage pool.
+
+        The time it starts running is recorded in ``starts`` so that its
+        timeout does not include time spent queued for a worker.
+        """
+
+        def start() -> Tuple[Any, float]:
+            starts[name] = time.perf_counter()
+            return _timed(stage)
+
+        with self._stage_executor_lock:
+            if self._stage_executor is None:
+                self._stage_executor = ThreadPoolExecutor(
+                    max_workers=16, thread_name_prefix="agentos-stage"
+                )
+            return self._stage_executor.submit(start)
+
+    def _replace_stage_executor(self) -> None:
+        """
+        Start a new stage pool for later stages.
+
+        A running stage cannot be interrupted, so a timed-out stage keeps
+        its worker until it returns. Giving later tasks a fresh pool stops
+        repeated timeouts from tying up every worker; the old pool finishes
+        the stages already queued on it and then exits.
+        """
+        with self._stage_executor_lock:
+            executor, self._stage_executor = (
+                self._stage_executor,
+                None,
+            )
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _stage_remaining(
+        self, name: str, starts: Dict[str, float]
+    ) -> Optional[float]:
+        """
+        Seconds left before a stage times out, or None without a timeout.
+
+        A stage still waiting for a worker has its whole timeout left.
+        """
+        timeout = self.stage_timeouts.get(name)
+        if timeout is None:
+            return None
+        begun = starts.get(name)
+        if begun is None:
+            return timeout
+        return max(0.0, begun + timeout - time.perf_counter())
+
+    def _stage_timed_out(
+        self, name: str, starts: Dict[str, float]
+    ) -> bool:
+        return (
+            name in starts
+            and self._stage_remaining(name, starts) == 0
+        )
+
+    def _degrade(self, name: str, error: Optional[Exception]) -> None:
+        """Log a pre-processing stage that the task continues without."""
+        if error is None:
+            reason = f"timed out after {self.stage_timeouts.get(name)} seconds"
+        else:
+            reason = f"failed: {str(error)}"
+        logger.warning(
+            f"AgentOS {name} stage {reason}; continuing without it"
+        )
+
+    def _run_stages(
+        self, stages: Dict[str, Callable[[], Any]]
+    ) -> Tuple[Dict[str, Any], Dict[str, float], List[str]]:
+        """
+        Run pre-processing stages concurrently, each within its timeout.
+
+        A stage's timeout counts from when it starts running, not from when
+        it was queued. A stage that times out is abandoned but keeps its
+        worker thread until it returns, so the stage pool is replaced.
+
+        Returns:
+            The outputs of the stages that succeeded, the seconds each stage
+            took (its timeout if it timed out) and the names of the stages
+            that failed or timed out.
+        """
+        results: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        degraded: List[str] = []
+
+        # A lone stage without a timeout needs no worker thread
+        if len(stages) == 1:
+            ((name, stage),) = stages.items()
+            if self.stage_timeouts.get(name) is None:
+                try:
+                    results[name], timings[name] = _timed(stage)
+                except Exception as e:
+                    self._degrade(name, e)
+                    degraded.append(name)
+                return results, timings, degraded
+
+        started = time.perf_counter()
+        starts: Dict[str, float] = {}
+        futures = {
+            name: self._submit_stage(name, stage, starts)
+            for name, stage in stages.items()
+        }
+        timed_out = False
+        for name, future in futures.items():
+            try:
+                while True:
+                    try:
+                        results[name], timings[name] = future.result(
+                            timeout=self._stage_remaining(
+                                name, starts
+                            )
+                        )
+                        break
+                    except FutureTimeoutError:
+                        if self._stage_timed_out(name, starts):
+                            raise
+            except FutureTimeoutError:
+                timings[name] = self.stage_timeouts[name]
+                self._degrade(name, None)
+                degraded.append(name)
+                timed_out = True
+            except Exception as e:
+                timings[name] = time.perf_counter() - starts.get(
+                    name, started
+                )
+                self._degrade(name, e)
+                degraded.append(name)
+        if timed_out:
+            self._replace_stage_executor()
+        return results, timings, degraded
 
     def batched_run(
         self,
@@ -313,15 +802,428 @@ class AgentOS:
         imgs: List[str] = None,
         videos: List[str] = None,
         audios: List[str] = None,
-    ):
+        max_concurrency: int = 1,
+        timeout: Optional[float] = None,
+        progress_callback: Optional[
+            Callable[[int, str, int, int], None]
+        ] = None,
+    ) -> List[str]:
         """
         Execute a list of tasks in a batched manner.
+
+        RAG context for every task is fetched up front with a single batched
+        embedding pass and nearest-neighbour lookup. Tasks then run on a
+        thread pool of ``max_concurrency`` workers, so a batch of
+        network-bound tasks takes roughly the slowest latency times
+        ``len(tasks) / max_concurrency`` instead of the sum of all latencies.
+
+        Args:
+            tasks (List[str]): The tasks to execute.
+            imgs (List[str], optional): Image path per task. Defaults to None.
+            videos (List[str], optional): Video path per task. Defaults to None.
+            audios (List[str], optional): Audio path per task. Defaults to None.
+            max_concurrency (int, optional): Maximum number of tasks running at
+                once. With 1, tasks run one after another on the main agent and
+                share its memory; above 1, each worker thread uses its own agent.
+                Defaults to 1.
+            timeout (float, optional): Seconds each task may run before its slot
+                is filled with a timeout error. The worker thread cannot be
+                interrupted and finishes in the background. The whole batch is
+                also bounded by ``timeout`` times the number of rounds of
+                ``max_concurrency`` tasks: tasks still queued or running then
+                are cancelled and reported as errors, so hung workers cannot
+                stall the batch. Defaults to None.
+            progress_callback (Callable, optional): Called as
+                ``progress_callback(index, output, completed, total)`` each
+                time a task finishes. Defaults to None.
+
+        Returns:
+            List[str]: One output per task, in the same order as ``tasks``. A
+                failing or timed-out task yields an ``"Error: ..."`` string
+                without affecting the others.
+
+        Example:
+            >>> agent = AgentOS()
+            >>> outputs = agent.batched_run(
+            ...     ["Summarize today's AI news", "What is 2 + 2?"],
+            ...     max_concurrency=8,
+            ...     timeout=120,
+            ... )
+        """
+        total = len(tasks)
+        if total == 0:
+            return []
+
+        def pad(items: Optional[List[str]]) -> List[Optional[str]]:
+            items = list(items or [])[:total]
+            return items + [None] * (total - len(items))
+
+        imgs, videos, audios = pad(imgs), pad(videos), pad(audios)
+
+        contexts = [None] * total
+        try:
+            rag = self._retrieval_rag()
+            if rag is not None:
+                contexts = rag.get_relevant_context_many(tasks)
+        except Exception as e:
+            # Fall back to per-task lookups inside run
+            logger.error(f"Error prefetching RAG context: {str(e)}")
+
+        started = {}
+
+        def execute(index: int) -> str:
+            started[index] = time.monotonic()
+            agent = (
+                self.agent
+                if max_concurrency <= 1
+                else self._thread_agent()
+            )
+            return self._run(
+                tasks[index],
+                imgs[index],
+                videos[index],
+                audios[index],
+                contexts[index],
+                agent,
+            )
+
+        outputs: List[Optional[str]] = [None] * total
+        completed = 0
+        workers = max(1, min(max_concurrency, total))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        # Time the batch needs if every task used its full timeout
+        deadline = (
+            time.monotonic() + timeout * -(-total // workers)
+            if timeout is not None
+            else None
+        )
+        futures = {
+            executor.submit(execute, index): index
+            for index in range(total)
+        }
+        pending = set(futures)
+
+        try:
+            while pending:
+                done, pending = wait(
+                    pending,
+                    timeout=0.1 if timeout is not None else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                finished = []
+                for future in done:
+                    try:
+                        output = future.result()
+                    except Exception as e:
+                        output = f"Error: {str(e)}"
+                    finished.append((futures[future], output))
+
+                if timeout is not None:
+                    now = time.monotonic()
+                    for future in list(pending):
+                        index = futures[future]
+                        start = started.get(index)
+                        if (
+                            start is not None
+                            and now - start > timeout
+                        ):
+                            pending.discard(future)
+                            finished.append(
+                                (
+                                    index,
+                                    f"Error: Task timed out after {timeout} seconds",
+                                )
+                            )
+                    if now >= deadline:
+                        # Workers are stuck on timed-out tasks, so the
+                        # tasks still waiting for one would never start
+                        for future in pending:
+                            future.cancel()
+                            finished.append(
+                                (
+                                    futures[future],
+                                    "Error: Task did not finish before the batch deadline",
+                                )
+                            )
+                        pending = set()
+
+                for index, output in finished:
+                    outputs[index] = output
+                    completed += 1
+                    if progress_callback:
+                        try:
+                            progress_callback(
+                                index, output, completed, total
+                            )
+                        except Exception as e:
+                            logger.error(
+                                f"Error in progress callback: {str(e)}"
+                            )
+        finally:
+            # Do not block on timed-out tasks that are still running
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return outputs
+
+    async def arun(
+        self,
+        task: str,
+        img: str = None,
+        video: str = None,
+        audio: str = None,
+        rag_context: Optional[str] = None,
+    ) -> str:
         """
-        outputs = []
-        for task, img, video, audio in zip(
-            tasks, imgs, videos, audios
-        ):
-            outputs.append(self.run(task, img, video, audio))
+        Asynchronously execute a task on the caller's event loop.
+
+        Behaves like ``run`` without blocking the loop. Planning, RAG
+        retrieval, video analysis and the agent are synchronous, so each is
+        offloaded to a worker thread and awaited; the stages still run
+        concurrently with each other and with other coroutines. The stages
+        use the same worker pool as ``run``, and the agent runs on the loop's
+        default executor, so agent calls never hold the threads that stages
+        are waiting for. Concurrent calls each use the agent of their worker
+        thread, so their conversations do not interleave in one agent's
+        memory.
+
+        Args:
+            task (str): The main task or query to be processed.
+            img (str, optional): Path to an image file. Defaults to None.
+            video (str, optional): Path to a video file. Defaults to None.
+            audio (str, optional): Path to an audio file. Defaults to None.
+            rag_context (str, optional): Context already retrieved for this task.
+                Defaults to None.
+
+        Returns:
+            str: The result of the task execution, or an error message.
+
+        Example:
+            >>> agent = AgentOS()
+            >>> result = await agent.arun("What is 2 + 2?")
+
+        Notes:
+            - The swarms Agent loop is synchronous, so it runs in a worker thread
+              and its tools are invoked from that thread
+            - Each call occupies a thread of the loop's default executor while
+              its agent runs, so the number of agents running at once is
+              bounded by that executor's size
+        """
+        return await self._arun(
+            task, img, video, audio, rag_context, self._thread_agent
+        )
+
+    async def _arun(
+        self,
+        task: str,
+        img: Optional[str],
+        video: Optional[str],
+        audio: Optional[str],
+        rag_context: Optional[str],
+        get_agent: Callable[[], Agent],
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> str:
+        """
+        Asynchronously execute a task. See ``arun``.
+
+        Pre-processing stages are offloaded to the stage pool and the agent
+        call to ``executor`` (the loop's default executor when None), so
+        blocked agents cannot starve the stages of other tasks.
+        """
+        loop = asyncio.get_running_loop()
+
+        def in_thread(func, *args):
+            return loop.run_in_executor(
+                executor, functools.partial(func, *args)
+            )
+
+        started = time.perf_counter()
+        results: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        degraded: List[str] = []
+        starts: Dict[str, float] = {}
+
+        async def run_stage(name: str, stage: Callable[[], Any]):
+            future = asyncio.wrap_future(
+                self._submit_stage(name, stage, starts)
+            )
+            try:
+                while not future.done():
+                    await asyncio.wait(
+                        {future},
+                        timeout=self._stage_remaining(name, starts),
+                    )
+                    if not future.done() and self._stage_timed_out(
+                        name, starts
+                    ):
+                        raise asyncio.TimeoutError
+                results[name], timings[name] = future.result()
+            except asyncio.TimeoutError:
+                timings[name] = self.stage_timeouts[name]
+                self._degrade(name, None)
+                degraded.append(name)
+                self._replace_stage_executor()
+            except Exception as e:
+                timings[name] = time.perf_counter() - starts.get(
+                    name, started
+                )
+                self._degrade(name, e)
+                degraded.append(name)
+
+        try:
+            # Planning, retrieval and video analysis are independent, so
+            # they run concurrently
+            stages = self._preprocessing_stages(
+                task, video, rag_context
+            )
+            await asyncio.gather(
+                *(
+                    run_stage(name, stage)
+                    for name, stage in stages.items()
+                )
+            )
+            task_prompt = self._stage_prompt(results, rag_context)
+
+            # Run the agent; get_agent is called in the worker thread so
+            # thread-local agents resolve to that thread
+            final_output, timings["agent"] = await in_thread(
+                _timed,
+                lambda: get_agent().run(
+                    task=task_prompt + task if task_prompt else task,
+                    img=img,
+                ),
+            )
+            timings["total"] = time.perf_counter() - started
+
+            # Handle None response
+            if final_output is None:
+                final_output = (
+                    "No response generated. Please try again."
+                )
+
+            if isinstance(final_output, str):
+                return RunResult(final_output, timings, degraded)
+            return final_output
+
+        except Exception as e:
+            error_msg = f"Error: {str(e)}"
+            logger.error(
+                f"Error running AgentOS: {str(e)} Traceback: {traceback.format_exc()}"
+            )
+            return RunResult(
+                error_msg,
+                {"total": time.perf_counter() - started},
+            )
+
+    async def abatched_run(
+        self,
+        tasks: List[str],
+        imgs: List[str] = None,
+        videos: List[str] = None,
+        audios: List[str] = None,
+        max_concurrency: int = 8,
+        timeout: Optional[float] = None,
+        progress_callback: Optional[
+            Callable[[int, str, int, int], None]
+        ] = None,
+    ) -> List[str]:
+        """
+        Asynchronously execute a list of tasks with bounded concurrency.
+
+        The asyncio counterpart of ``batched_run``: context is prefetched with
+        one batched RAG lookup, at most ``max_concurrency`` tasks run at once,
+        each with its own agent, and results are returned in task order.
+        The agent loop is synchronous, so every running task holds one thread
+        of a pool of ``max_concurrency`` workers owned by the batch.
+
+        Args:
+            tasks (List[str]): The tasks to execute.
+            imgs (List[str], optional): Image path per task. Defaults to None.
+            videos (List[str], optional): Video path per task. Defaults to None.
+            audios (List[str], optional): Audio path per task. Defaults to None.
+            max_concurrency (int, optional): Maximum number of tasks running at
+                once. Defaults to 8.
+            timeout (float, optional): Seconds each task may run before it is
+                reported as timed out. Defaults to None.
+            progress_callback (Callable, optional): Called as
+                ``progress_callback(index, output, completed, total)`` each
+                time a task finishes. Defaults to None.
+
+        Returns:
+            List[str]: One output per task, in the same order as ``tasks``.
+
+        Example:
+            >>> outputs = await AgentOS().abatched_run(
+            ...     ["task one", "task two"], max_concurrency=16
+            ... )
+        """
+        total = len(tasks)
+        if total == 0:
+            return []
+
+        def pad(items: Optional[List[str]]) -> List[Optional[str]]:
+            items = list(items or [])[:total]
+            return items + [None] * (total - len(items))
+
+        imgs, videos, audios = pad(imgs), pad(videos), pad(audios)
+
+        contexts = [None] * total
+        try:
+            rag = await asyncio.to_thread(self._retrieval_rag)
+            if rag is not None:
+                contexts = await asyncio.to_thread(
+                    rag.get_relevant_context_many, tasks
+                )
+        except Exception as e:
+            logger.error(f"Error prefetching RAG context: {str(e)}")
+
+        outputs: List[Optional[str]] = [None] * total
+        completed = 0
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        # A dedicated pool for the agent calls, so batches are not capped
+        # by the size of the loop's default executor; stages still use the
+        # shared stage pool
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_concurrency, total))
+        )
+
+        async def execute(index: int) -> None:
+            nonlocal completed
+            async with semaphore:
+                try:
+                    output = await asyncio.wait_for(
+                        self._arun(
+                            tasks[index],
+                            imgs[index],
+                            videos[index],
+                            audios[index],
+                            contexts[index],
+                            self._thread_agent,
+                            executor,
+                        ),
+                        timeout,
+                    )
+                except asyncio.TimeoutError:
+                    output = f"Error: Task timed out after {timeout} seconds"
+                except Exception as e:
+                    output = f"Error: {str(e)}"
+
+            outputs[index] = output
+            completed += 1
+            if progress_callback:
+                try:
+                    progress_callback(index, output, completed, total)
+                except Exception as e:
+                    logger.error(
+                        f"Error in progress callback: {str(e)}"
+                    )
+
+        try:
+            await asyncio.gather(
+                *(execute(index) for index in range(total))
+            )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
         return outputs
 
 
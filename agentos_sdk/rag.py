@@ -1,13 +1,78 @@
 from pathlib import Path
-from typing import List, Optional, Union, Dict, Any
-import chromadb
-from chromadb.utils import embedding_functions
-import pandas as pd
-from PyPDF2 import PdfReader
-from bs4 import BeautifulSoup
+from typing import (
+    List,
+    Optional,
+    Union,
+    Dict,
+    Any,
+    Iterable,
+    Iterator,
+)
+
+from agentos_sdk.cache import LRUCache
+from loguru import logger
+import hashlib
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    wait,
+)
+from functools import lru_cache
 import json
+import os
 import re
 
+# Fallback token pattern (words and individual punctuation marks) used when
+# the embedding model's tokenizer cannot be loaded
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END = frozenset(".!?")
+
+
+@lru_cache(maxsize=8)
+def _load_tokenizer(model_name: str):
+    """
+    Load and cache the fast tokenizer of a sentence-transformers model.
+
+    Bare model names such as ``all-MiniLM-L6-v2`` are resolved under the
+    ``sentence-transformers`` organisation. Returns None if the tokenizer
+    cannot be loaded, in which case callers fall back to ``_TOKEN_PATTERN``.
+    """
+    try:
+        from transformers import AutoTokenizer
+    except ImportError:
+        return None
+
+    candidates = [model_name]
+    if "/" not in model_name:
+        candidates.append(f"sentence-transformers/{model_name}")
+    for candidate in candidates:
+        try:
+            tokenizer = AutoTokenizer.from_pretrained(candidate)
+            if tokenizer.is_fast:
+                return tokenizer
+        except Exception:
+            continue
+    logger.warning(
+        f"Could not load a fast tokenizer for {model_name}, "
+        "falling back to approximate token counts"
+    )
+    return None
+
+
+def _extract_chunks_worker(
+    rag_cls: type, file_path: str, config: Dict[str, Any]
+) -> List[str]:
+    """
+    Parse and chunk a file inside a worker process.
+
+    The RAGSystem instance itself holds a ChromaDB client and an embedding
+    model, neither of which can be pickled, so the worker rebuilds a bare
+    instance that only carries the chunking configuration.
+    """
+    parser = rag_cls.__new__(rag_cls)
+    parser.__dict__.update(config)
+    return parser._extract_chunks(Path(file_path))
+
 
 class RAGSystem:
     """
@@ -16,9 +81,13 @@ class RAGSystem:
 
     Features:
     - Supports multiple file types (txt, pdf, csv, docx, pptx, json, html)
-    - Automatic text chunking based on token count
+    - Sentence-aware text chunking with overlap, measured in embedding model tokens
     - Document embedding using ChromaDB
     - Semantic search capabilities
+    - Optional on-disk persistence with incremental re-indexing
+    - Parallel file parsing and batched embedding for bulk ingestion
+    - Streaming extraction with bounded memory for very large files
+    - Cached query results and query embeddings
     - Integration with AgentOS
 
     Example:
@@ -31,6 +100,8 @@ class RAGSystem:
         >>> rag.add_folder("path/to/docs/")
         >>> # Query the documents
         >>> results = rag.query("What is the main topic?")
+        >>> # Keep the index on disk so restarts only re-embed changed files
+        >>> rag = RAGSystem(persist_directory="rag_store")
     """
 
     def __init__(
@@ -39,10 +110,61 @@ class RAGSystem:
         embedding_model: str = "all-MiniLM-L6-v2",
         chunk_size: int = 500,
         chunk_overlap: int = 50,
+        persist_directory: Optional[Union[str, Path]] = None,
+        num_workers: Optional[int] = None,
+        embedding_batch_size: int = 256,
+        stream_threshold: int = 32 * 1024 * 1024,
+        stream_window: int = 1024 * 1024,
+        csv_block_rows: int = 10000,
+        query_cache_size: int = 256,
+        query_cache_ttl: Optional[float] = 300.0,
+        embedding_cache_size: int = 1024,
     ):
-        """Initialize the RAG system."""
+        """Initialize the RAG system.
+
+        Args:
+            collection_name: Name of the ChromaDB collection
+            embedding_model: SentenceTransformer model used for embeddings
+            chunk_size: Maximum number of tokens per chunk
+            chunk_overlap: Number of tokens shared between adjacent chunks
+            persist_directory: Directory where the collection and the file
+                manifest are stored. If None, everything is kept in memory
+                and lost when the process exits.
+            num_workers: Number of processes used to parse files during bulk
+                ingestion. Defaults to the number of CPU cores; 1 disables
+                the process pool.
+            embedding_batch_size: Number of chunks embedded and written to
+                the collection per call
+            stream_threshold: Files larger than this many bytes are streamed
+                page by page / row block by row block instead of being
+                loaded whole
+            stream_window: Number of characters of extracted text buffered
+                before it is chunked when streaming
+            csv_block_rows: Number of CSV rows read per block when streaming
+            query_cache_size: Maximum number of cached query results; 0
+                disables the cache
+            query_cache_ttl: Seconds a cached query result stays valid; None
+                keeps results until the collection changes
+            embedding_cache_size: Maximum number of cached query embeddings
+        """
+        self.collection_name = collection_name
+        self.persist_directory = (
+            Path(persist_directory) if persist_directory else None
+        )
+
+        # ChromaDB is imported here rather than at module level because it
+        # dominates import time, and parser worker processes never need it
+        import chromadb
+        from chromadb.utils import embedding_functions
+
         # Initialize ChromaDB client
-        self.client = chromadb.Client()
+        if self.persist_directory:
+            self.persist_directory.mkdir(parents=True, exist_ok=True)
+            self.client = chromadb.PersistentClient(
+                path=str(self.persist_directory)
+            )
+        else:
+            self.client = chromadb.Client()
 
         # Set up the embedding function
         self.embedding_fn = (
@@ -56,11 +178,114 @@ class RAGSystem:
             name=collection_name, embedding_function=self.embedding_fn
         )
 
+        self.embedding_model = embedding_model
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.embedding_batch_size = embedding_batch_size
+        self.stream_threshold = stream_threshold
+        self.stream_window = stream_window
+        self.csv_block_rows = csv_block_rows
+
+        # Query results are dropped whenever the collection changes; query
+        # embeddings do not depend on the collection and are kept
+        self.query_cache = LRUCache(
+            maxsize=query_cache_size, ttl=query_cache_ttl
+        )
+        self.embedding_cache = LRUCache(maxsize=embedding_cache_size)
 
-        # Track processed files to avoid duplicates
+        # Track processed files to avoid duplicates. ``file_index`` maps the
+        # absolute path of every indexed file to its size, mtime, content
+        # hash and chunk count so unchanged files can be skipped.
+        self.file_index: Dict[str, Dict[str, Any]] = {}
         self.processed_files = set()
+        self._load_manifest()
+
+    @staticmethod
+    def manifest_file(
+        persist_directory: Union[str, Path], collection_name: str
+    ) -> Path:
+        """Path of the manifest of ``collection_name`` in ``persist_directory``."""
+        return (
+            Path(persist_directory)
+            / f"{collection_name}_manifest.json"
+        )
+
+    @property
+    def manifest_path(self) -> Optional[Path]:
+        """Path of the JSON manifest, or None when running in memory."""
+        if not self.persist_directory:
+            return None
+        return self.manifest_file(
+            self.persist_directory, self.collection_name
+        )
+
+    def _load_manifest(self) -> None:
+        """Restore ``file_index`` and ``processed_files`` from disk."""
+        manifest_path = self.manifest_path
+        if not manifest_path or not manifest_path.is_file():
+            return
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.file_index = data.get("files", {})
+            self.processed_files = set(self.file_index)
+        except Exception as e:
+            logger.error(
+                f"Error loading manifest {manifest_path}: {str(e)}"
+            )
+            self.file_index = {}
+            self.processed_files = set()
+
+    def _save_manifest(self) -> None:
+        """Atomically write ``file_index`` to disk in persistent mode."""
+        manifest_path = self.manifest_path
+        if not manifest_path:
+            return
+        tmp_path = manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "files": self.file_index}, f)
+        os.replace(tmp_path, manifest_path)
+
+    @staticmethod
+    def _hash_file(file_path: Path) -> str:
+        """Compute the SHA-256 digest of a file's contents."""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _file_state(self, file_path: Path) -> tuple:
+        """
+        Compare a file on disk against its ``file_index`` entry.
+
+        Returns:
+            tuple: ``(status, fingerprint)`` where status is one of
+            ``"new"``, ``"unchanged"`` or ``"changed"`` and fingerprint is the
+            size/mtime/hash record to store once the file is indexed.
+        """
+        key = str(file_path.absolute())
+        stat = file_path.stat()
+        entry = self.file_index.get(key)
+        fingerprint = {"size": stat.st_size, "mtime": stat.st_mtime}
+
+        # Cheap check first: identical size and mtime means unchanged
+        if (
+            entry
+            and entry.get("size") == stat.st_size
+            and entry.get("mtime") == stat.st_mtime
+        ):
+            return "unchanged", entry
+
+        fingerprint["hash"] = self._hash_file(file_path)
+        if entry is None:
+            return "new", fingerprint
+        if entry.get("hash") == fingerprint["hash"]:
+            # Touched but not modified; refresh the stored mtime
+            entry.update(fingerprint)
+            return "unchanged", entry
+        return "changed", fingerprint
 
     def add_document(self, file_path: Union[str, Path]) -> bool:
         """
@@ -76,19 +301,7 @@ class RAGSystem:
             >>> rag.add_document("path/to/document.pdf")
             True
         """
-        file_path = Path(file_path)
-        if not file_path.is_file():
-            print(f"Error: {file_path} is not a file")
-            return False
-
-        if str(file_path.absolute()) in self.processed_files:
-            print(f"Warning: {file_path} has already been processed")
-            return False
-
-        success = self._process_file(file_path)
-        if success:
-            self.processed_files.add(str(file_path.absolute()))
-        return success
+        return self._ingest_files([file_path])[str(file_path)]
 
     def add_multiple_documents(
         self, file_paths: List[Union[str, Path]]
@@ -107,11 +320,257 @@ class RAGSystem:
             >>> for path, success in results.items():
             ...     print(f"{path}: {'Success' if success else 'Failed'}")
         """
+        return self._ingest_files(file_paths)
+
+    def _ingest_files(
+        self, file_paths: List[Union[str, Path]]
+    ) -> Dict[str, bool]:
+        """
+        Index a list of files through the parse -> embed -> write pipeline.
+
+        Files are parsed in a process pool, their chunks are accumulated and
+        embedded ``embedding_batch_size`` at a time, and each batch is written
+        to the collection in a single call. The manifest is saved once at the
+        end rather than after every file.
+
+        Returns:
+            Dict[str, bool]: Dictionary mapping file paths to their processing status
+        """
         results = {}
+        pending = []
+        seen = set()
+
         for file_path in file_paths:
-            results[str(file_path)] = self.add_document(file_path)
+            name = str(file_path)
+            file_path = Path(file_path)
+            results[name] = False
+            if not file_path.is_file():
+                print(f"Error: {file_path} is not a file")
+                continue
+
+            key = str(file_path.absolute())
+            status, fingerprint = self._file_state(file_path)
+            if status == "unchanged" or key in seen:
+                print(
+                    f"Warning: {file_path} has already been processed"
+                )
+                continue
+            seen.add(key)
+            # The file's previous chunks stay in place until the new ones
+            # are written, so a failed re-parse keeps the old version
+            pending.append((name, file_path, fingerprint))
+
+        batch = {"ids": [], "documents": [], "metadatas": []}
+        batch_files = []
+
+        for item, chunks in self._parse_files(pending):
+            name, file_path, fingerprint = item
+            source = str(file_path.absolute())
+            prefix = self._chunk_id_prefix(file_path, fingerprint)
+            count = 0
+            try:
+                # Chunks of streamed files arrive lazily, so a huge file is
+                # embedded and written batch by batch as it is read
+                for chunk in chunks:
+                    batch["ids"].append(f"{prefix}{count}")
+                    batch["documents"].append(chunk)
+                    batch["metadatas"].append({"source": source})
+                    count += 1
+                    batch_size = len(batch["documents"])
+                    if batch_size < self.embedding_batch_size:
+                        continue
+                    if not self._flush_batch(
+                        batch, batch_files, results
+                    ):
+                        raise RuntimeError(
+                            "failed to write chunk batch"
+                        )
+            except Exception as e:
+                logger.error(
+                    f"Error processing file {name}: {str(e)}"
+                )
+                # Drop this file's buffered and already written chunks
+                keep = [
+                    i
+                    for i, meta in enumerate(batch["metadatas"])
+                    if meta["source"] != source
+                ]
+                for key, values in batch.items():
+                    batch[key] = [values[i] for i in keep]
+                if count:
+                    self.collection.delete(
+                        ids=[f"{prefix}{i}" for i in range(count)]
+                    )
+                continue
+
+            if count:
+                fingerprint["chunks"] = count
+                batch_files.append(
+                    (name, source, fingerprint, prefix)
+                )
+
+        self._flush_batch(batch, batch_files, results)
+        if pending:
+            self.query_cache.clear()
+        self._save_manifest()
         return results
 
+    @staticmethod
+    def _chunk_id_prefix(
+        file_path: Path, fingerprint: Dict[str, Any]
+    ) -> str:
+        """
+        Return the id prefix of the chunks of one version of a file.
+
+        Ids are keyed on the full path, so files sharing a stem in different
+        folders do not overwrite each other, and on the content hash, so a
+        new version never overwrites the chunks of the previous one.
+        """
+        source = str(file_path.absolute())
+        path_id = hashlib.md5(source.encode("utf-8")).hexdigest()[:12]
+        return (
+            f"{file_path.stem}_{path_id}_{fingerprint['hash'][:12]}_"
+        )
+
+    def _drop_stale_chunks(
+        self, source: str, prefix: str, count: int
+    ) -> None:
+        """Delete chunks of ``source`` other than the ``count`` current ones."""
+        current = {f"{prefix}{i}" for i in range(count)}
+        existing = self.collection.get(
+            where={"source": source}, include=[]
+        )
+        stale = [id_ for id_ in existing["ids"] if id_ not in current]
+        if stale:
+            self.collection.delete(ids=stale)
+
+    def _parse_files(self, pending: list):
+        """
+        Yield ``(item, chunks)`` for every pending file.
+
+        Files larger than ``stream_threshold`` bytes are streamed in this
+        process so their chunks are produced lazily and memory stays bounded.
+        Large files are therefore parsed one after another and gain nothing
+        from the pool, but the pool parses small files while they stream.
+        The remaining files are parsed in a process pool when there is more
+        than one of them and ``num_workers`` is greater than one. At most
+        ``2 * num_workers`` files are in flight at a time and results are
+        yielded as they complete, so parsed chunks never pile up for the
+        whole corpus.
+        """
+        small, large = [], []
+        for item in pending:
+            if item[1].stat().st_size > self.stream_threshold:
+                large.append(item)
+            else:
+                small.append(item)
+
+        if self.num_workers <= 1 or len(small) <= 1:
+            for item in large:
+                yield item, self.iter_file_chunks(item[1])
+            for item in small:
+                yield item, self._extract_chunks(item[1])
+            return
+
+        config = self._parser_config()
+        max_workers = min(self.num_workers, len(small))
+        remaining = iter(small)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+
+            def submit_next():
+                item = next(remaining, None)
+                if item is not None:
+                    future = executor.submit(
+                        _extract_chunks_worker,
+                        type(self),
+                        str(item[1]),
+                        config,
+                    )
+                    futures[future] = item
+
+            for _ in range(max_workers * 2):
+                submit_next()
+            for item in large:
+                yield item, self.iter_file_chunks(item[1])
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = futures.pop(future)
+                    # Refill before yielding so workers stay busy while
+                    # the caller embeds this file's chunks
+                    submit_next()
+                    try:
+                        chunks = future.result()
+                    except Exception as e:
+                        logger.error(
+                            f"Error processing file {item[0]}: {str(e)}"
+                        )
+                        continue
+                    yield item, chunks
+
+    def _parser_config(self) -> Dict[str, Any]:
+        """Picklable attributes needed to parse and chunk files."""
+        return {
+            "embedding_model": self.embedding_model,
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "stream_window": self.stream_window,
+            "csv_block_rows": self.csv_block_rows,
+        }
+
+    def _flush_batch(
+        self,
+        batch: Dict[str, list],
+        batch_files: list,
+        results: Dict[str, bool],
+    ) -> bool:
+        """
+        Embed and write the buffered chunks, then record the completed files.
+
+        Returns:
+            bool: True if the batch was written, False otherwise
+        """
+        try:
+            if batch["documents"]:
+                self.collection.upsert(
+                    ids=batch["ids"],
+                    documents=batch["documents"],
+                    embeddings=self.embedding_fn(batch["documents"]),
+                    metadatas=batch["metadatas"],
+                )
+                self.query_cache.clear()
+            for name, source, fingerprint, prefix in batch_files:
+                # Every chunk of this version is written, so whatever else
+                # is indexed under the path (an older version, or chunks
+                # left by clear_processed_files) can go
+                self._drop_stale_chunks(
+                    source, prefix, fingerprint["chunks"]
+                )
+                self.file_index[source] = fingerprint
+                self.processed_files.add(source)
+                results[name] = True
+                print(f"Successfully processed {name}")
+            return True
+        except Exception as e:
+            logger.error(
+                f"Error writing batch to collection: {str(e)}"
+            )
+            # Completed files in this batch may have earlier slices
+            # written; their previous versions are kept
+            for _, _, fingerprint, prefix in batch_files:
+                self.collection.delete(
+                    ids=[
+                        f"{prefix}{i}"
+                        for i in range(fingerprint["chunks"])
+                    ]
+                )
+            return False
+        finally:
+            for values in batch.values():
+                values.clear()
+            batch_files.clear()
+
     def add_folder(
         self,
         folder_path: Union[str, Path],
@@ -121,6 +580,10 @@ class RAGSystem:
         """
         Add all documents from a folder to the RAG system.
 
+        Files that are already indexed and unchanged are skipped, modified
+        files are re-embedded, and previously indexed files under the folder
+        that no longer exist have their chunks deleted.
+
         Args:
             folder_path: Path to the folder
             recursive: Whether to process subfolders (default: True)
@@ -178,18 +641,50 @@ class RAGSystem:
         else:
             file_types = supported_types
 
-        results = {}
         pattern = "**/*" if recursive else "*"
+        file_paths = [
+            file_path
+            for file_path in folder_path.glob(pattern)
+            if file_path.is_file()
+            and file_path.suffix.lower() in file_types
+        ]
 
-        for file_path in folder_path.glob(pattern):
-            if (
-                file_path.is_file()
-                and file_path.suffix.lower() in file_types
-            ):
-                results[str(file_path)] = self.add_document(file_path)
-
+        results = self._ingest_files(file_paths)
+        if self._remove_missing_files(folder_path, recursive):
+            self._save_manifest()
         return results
 
+    def _remove_missing_files(
+        self, folder_path: Path, recursive: bool = True
+    ) -> List[str]:
+        """
+        Delete chunks of indexed files under a folder that no longer exist.
+
+        Returns:
+            List[str]: Absolute paths of the files that were removed
+        """
+        folder = folder_path.absolute()
+        removed = []
+        for key in list(self.file_index):
+            path = Path(key)
+            if recursive:
+                inside = folder in path.parents
+            else:
+                inside = path.parent == folder
+            if inside and not path.exists():
+                self.collection.delete(where={"source": key})
+                self.file_index.pop(key, None)
+                self.processed_files.discard(key)
+                removed.append(key)
+                logger.info(f"Removed deleted file {key}")
+        if removed:
+            self.query_cache.clear()
+        return removed
+
+    def is_empty(self) -> bool:
+        """Return True if the collection holds no chunks."""
+        return self.collection.count() == 0
+
     def get_processed_files(self) -> List[str]:
         """
         Get a list of all processed file paths.
@@ -208,11 +703,15 @@ class RAGSystem:
         """
         Clear the list of processed files, allowing them to be processed again.
 
+        Indexed chunks are kept; re-adding a file replaces its chunks.
+
         Example:
             >>> rag.clear_processed_files()
             >>> rag.add_document("previously_processed.pdf")  # Will process again
         """
         self.processed_files.clear()
+        self.file_index.clear()
+        self._save_manifest()
 
     def remove_document(self, file_path: Union[str, Path]) -> bool:
         """
@@ -232,72 +731,204 @@ class RAGSystem:
         try:
             # Remove all chunks associated with this file
             self.collection.delete(where={"source": file_path})
+            self.query_cache.clear()
             self.processed_files.discard(file_path)
+            self.file_index.pop(file_path, None)
+            self._save_manifest()
             print(f"Successfully removed {file_path}")
             return True
         except Exception as e:
             print(f"Error removing {file_path}: {str(e)}")
             return False
 
+    def token_spans(self, text: str) -> List[tuple]:
+        """Return the ``(start, end)`` character offsets of every token.
+
+        Tokens come from the embedding model's fast tokenizer, so counts match
+        what the model actually sees. The tokenizer is loaded once per process
+        and the whole text is encoded in a single call. If it is unavailable,
+        words and punctuation marks are used as an approximation.
+
+        Args:
+            text (str): The text to tokenize
+
+        Returns:
+            List[tuple]: Character offsets of each token, in order
+        """
+        tokenizer = _load_tokenizer(self.embedding_model)
+        if tokenizer is not None:
+            encoding = tokenizer(
+                text,
+                add_special_tokens=False,
+                return_offsets_mapping=True,
+                return_attention_mask=False,
+                verbose=False,
+            )
+            return [
+                (start, end)
+                for start, end in encoding["offset_mapping"]
+                if end > start
+            ]
+        return [
+            match.span() for match in _TOKEN_PATTERN.finditer(text)
+        ]
+
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens in a text as the embedding model would."""
+        return len(self.token_spans(text))
+
     def chunk_text(self, text: str) -> List[str]:
         """Split text into chunks based on token count.
 
+        The text is tokenized once and walked in a single pass. Each chunk
+        holds at most ``chunk_size`` tokens and ends at the last sentence
+        boundary that fits; a sentence longer than ``chunk_size`` is cut at
+        token boundaries. Consecutive chunks share ``chunk_overlap`` tokens
+        (at most half of ``chunk_size``).
+
         Args:
             text (str): The text to split into chunks
 
         Returns:
             List[str]: List of text chunks
         """
+        return [
+            text[start:end].strip()
+            for start, end in self._chunk_offsets(text)
+        ]
+
+    def _chunk_offsets(self, text: str) -> List[tuple]:
+        """Return the ``(start, end)`` character offsets of each chunk."""
         if not text:
             return []
 
-        # Split text into sentences (rough approximation)
-        sentences = text.split(".")
+        spans = self.token_spans(text)
+        if not spans:
+            return []
+
+        size = max(1, self.chunk_size)
+        # Cap the overlap so every chunk advances by at least half a chunk
+        overlap = min(max(0, self.chunk_overlap), size // 2)
+
+        num_tokens = len(spans)
         chunks = []
-        current_chunk = []
-        current_length = 0
+        start = 0
+        while start < num_tokens:
+            end = min(start + size, num_tokens)
+            if end < num_tokens:
+                # Walk back to the last sentence break in the window. Only
+                # fall back to a hard cut when none ends late enough for
+                # the next chunk to make progress past the overlap.
+                boundary = end
+                while boundary > start + overlap:
+                    prev_end = spans[boundary - 1][1]
+                    if (
+                        text[prev_end - 1] in _SENTENCE_END
+                        or "\n" in text[prev_end : spans[boundary][0]]
+                    ):
+                        break
+                    boundary -= 1
+                if boundary > start + overlap:
+                    end = boundary
+            chunks.append((spans[start][0], spans[end - 1][1]))
+            if end == num_tokens:
+                break
+            start = end - overlap
 
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
+        return chunks
 
-            # Rough estimate of tokens (words + punctuation)
-            sentence_length = len(sentence.split())
+    def process_text(self, text: str) -> List[str]:
+        """Process and chunk text content."""
+        return self.chunk_text(text)
 
-            # If adding this sentence would exceed chunk size, save current chunk
-            if (
-                current_length + sentence_length > self.chunk_size
-                and current_chunk
-            ):
-                chunks.append(". ".join(current_chunk) + ".")
-                current_chunk = []
-                current_length = 0
+    def iter_chunks(self, texts: Iterable[str]) -> Iterator[str]:
+        """Chunk a stream of text segments incrementally.
 
-            current_chunk.append(sentence)
-            current_length += sentence_length
+        Segments are buffered until ``stream_window`` characters have
+        accumulated. The buffer is then chunked and every chunk except the
+        last is yielded; the last one may be incomplete, so the buffer from
+        its start onwards (including trailing separators) is carried over and
+        re-chunked with the following text. The chunks are the same as those
+        of ``chunk_text`` on the concatenated text, while peak memory is
+        bounded by the window size rather than by the size of the source.
 
-        # Add any remaining text as the last chunk
-        if current_chunk:
-            chunks.append(". ".join(current_chunk) + ".")
+        Args:
+            texts (Iterable[str]): Text segments such as pages or row blocks,
+                concatenated as-is (segments carry their own separators)
 
-        # Handle case where a single sentence is longer than chunk_size
-        if not chunks:
-            chunks = [text]
+        Yields:
+            str: Text chunks
+        """
+        parts: List[str] = []
+        length = 0
+        for text in texts:
+            if not text:
+                continue
+            parts.append(text)
+            length += len(text)
+            if length < self.stream_window:
+                continue
 
-        return chunks
+            buffer = "".join(parts)
+            offsets = self._chunk_offsets(buffer)
+            for start, end in offsets[:-1]:
+                yield buffer[start:end].strip()
+            # The carry is at most one chunk long, so it cannot grow
+            # without bound
+            carry = buffer[offsets[-1][0] :] if offsets else ""
+            parts = [carry] if carry else []
+            length = len(carry)
 
-    def process_text(self, text: str) -> List[str]:
-        """Process and chunk text content."""
-        return self.chunk_text(text)
+        if parts:
+            yield from self.chunk_text("".join(parts))
+
+    def iter_pdf_pages(self, file_path: str) -> Iterator[str]:
+        """Yield the extracted text of each page of a PDF file."""
+        from PyPDF2 import PdfReader
 
-    def process_pdf(self, file_path: str) -> List[str]:
-        """Extract and process text from PDF files."""
         reader = PdfReader(file_path)
-        text = ""
         for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return self.chunk_text(text)
+            yield (page.extract_text() or "") + "\n"
+
+    def iter_csv_blocks(self, file_path: str) -> Iterator[str]:
+        """Yield CSV files as text, ``csv_block_rows`` rows at a time."""
+        import pandas as pd
+
+        for block in pd.read_csv(
+            file_path, chunksize=self.csv_block_rows
+        ):
+            yield block.to_string() + "\n"
+
+    def iter_text_blocks(
+        self, file_path: str, block_size: int = 1024 * 1024
+    ) -> Iterator[str]:
+        """Yield a text file in blocks of ``block_size`` characters."""
+        with open(file_path, "r", encoding="utf-8") as f:
+            for block in iter(lambda: f.read(block_size), ""):
+                yield block
+
+    def iter_file_chunks(self, file_path: Path) -> Iterator[str]:
+        """
+        Stream the chunks of a file without loading it whole.
+
+        PDFs are read page by page, CSVs in row blocks and plain text files
+        in fixed-size blocks. Other types fall back to ``_extract_chunks``.
+        Errors are raised to the caller.
+        """
+        streamers = {
+            ".pdf": self.iter_pdf_pages,
+            ".csv": self.iter_csv_blocks,
+            ".txt": self.iter_text_blocks,
+        }
+        streamer = streamers.get(file_path.suffix.lower())
+        if not streamer:
+            yield from self._extract_chunks(file_path)
+            return
+        yield from self.iter_chunks(streamer(str(file_path)))
+
+    def process_pdf(self, file_path: str) -> List[str]:
+        """Extract and process text from PDF files."""
+        return list(self.iter_chunks(self.iter_pdf_pages(file_path)))
 
     def process_markdown(self, text: str) -> List[str]:
         """Process Markdown files.
@@ -317,9 +948,7 @@ class RAGSystem:
 
     def process_csv(self, file_path: str) -> List[str]:
         """Process CSV files into text chunks."""
-        df = pd.read_csv(file_path)
-        text = df.to_string()
-        return self.chunk_text(text)
+        return list(self.iter_chunks(self.iter_csv_blocks(file_path)))
 
     def process_json(self, file_path: str) -> List[str]:
         """Process JSON files."""
@@ -338,6 +967,8 @@ class RAGSystem:
             List[str]: List of text chunks
         """
         try:
+            from bs4 import BeautifulSoup
+
             soup = BeautifulSoup(content, "html.parser")
             # Extract text content and remove excessive whitespace
             text = " ".join(soup.get_text().split())
@@ -346,8 +977,12 @@ class RAGSystem:
             print(f"Error processing HTML content: {str(e)}")
             return []
 
-    def _process_file(self, file_path: Path) -> bool:
-        """Process a single file based on its extension."""
+    def _extract_chunks(self, file_path: Path) -> List[str]:
+        """Parse a single file based on its extension and chunk its text.
+
+        Returns:
+            List[str]: Text chunks (empty if the file is unsupported or fails)
+        """
         processors = {
             ".txt": self.process_text,
             ".md": self.process_markdown,
@@ -359,41 +994,24 @@ class RAGSystem:
 
         try:
             processor = processors.get(file_path.suffix.lower())
-            if processor:
-                # For text-based files, read content and process
-                if file_path.suffix.lower() in [
-                    ".txt",
-                    ".md",
-                    ".json",
-                    ".html",
-                ]:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        chunks = processor(f.read())
-                # For binary or special format files, pass the file path
-                else:
-                    chunks = processor(str(file_path))
-
-                # Add chunks to ChromaDB
-                if chunks:
-                    self.collection.add(
-                        documents=chunks,
-                        metadatas=[
-                            {"source": str(file_path)} for _ in chunks
-                        ],
-                        ids=[
-                            f"{file_path.stem}_{i}"
-                            for i in range(len(chunks))
-                        ],
-                    )
-                    print(f"Successfully processed {file_path}")
-                    return True
-            else:
+            if not processor:
                 print(f"Unsupported file type: {file_path}")
-            return False
+                return []
+
+            # For text-based files, read content and process
+            if file_path.suffix.lower() in [
+                ".txt",
+                ".md",
+                ".html",
+            ]:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    return processor(f.read())
+            # For binary or special format files, pass the file path
+            return processor(str(file_path))
         except Exception as e:
             # Only print the file path in the error message, not the content
             print(f"Error processing file {str(file_path)}: {str(e)}")
-            return False
+            return []
 
     def query(
         self,
@@ -411,22 +1029,126 @@ class RAGSystem:
 
         Returns:
             List of dictionaries containing matched documents and their metadata
+
+        Notes:
+            Results are cached by whitespace-normalized query text,
+            ``n_results`` and ``metadata_filter`` until the collection changes
+            or ``query_cache_ttl`` expires.
         """
-        results = self.collection.query(
-            query_texts=[query],
-            n_results=n_results,
-            where=metadata_filter,
+        return self.query_many([query], n_results, metadata_filter)[0]
+
+    def query_many(
+        self,
+        queries: List[str],
+        n_results: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Query the document collection with several queries at once.
+
+        Queries that miss the result cache are embedded in a single batch
+        and looked up with one nearest-neighbour call to the collection.
+
+        Args:
+            queries: The search queries
+            n_results: Number of results to return per query
+            metadata_filter: Optional filter for metadata fields
+
+        Returns:
+            One list of matches per query, in the same order as ``queries``
+
+        Example:
+            >>> results = rag.query_many(["pricing", "refund policy"])
+            >>> len(results)
+            2
+        """
+        normalized = [
+            self._normalize_query(query) for query in queries
+        ]
+        filter_key = json.dumps(
+            metadata_filter, sort_keys=True, default=str
         )
 
-        return [
-            {"text": doc, "metadata": meta, "distance": dist}
-            for doc, meta, dist in zip(
-                results["documents"][0],
-                results["metadatas"][0],
-                results["distances"][0],
+        matches: Dict[str, List[Dict[str, Any]]] = {}
+        missing = []
+        for query in dict.fromkeys(normalized):
+            cached = self.query_cache.get(
+                (query, n_results, filter_key)
             )
+            if cached is not None:
+                matches[query] = cached
+            else:
+                missing.append(query)
+
+        # Nothing can match, so skip embedding the queries entirely. Checked
+        # after the cache so fully cached batches skip the count as well
+        if missing and self.is_empty():
+            for query in missing:
+                matches[query] = []
+            missing = []
+
+        if missing:
+            results = self.collection.query(
+                query_embeddings=self._embed_queries(missing),
+                n_results=n_results,
+                where=metadata_filter,
+            )
+            for i, query in enumerate(missing):
+                matches[query] = [
+                    {"text": doc, "metadata": meta, "distance": dist}
+                    for doc, meta, dist in zip(
+                        results["documents"][i],
+                        results["metadatas"][i],
+                        results["distances"][i],
+                    )
+                ]
+                self.query_cache.set(
+                    (query, n_results, filter_key), matches[query]
+                )
+
+        return [
+            [dict(result) for result in matches[query]]
+            for query in normalized
         ]
 
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Collapse runs of whitespace so near-identical queries share cache entries."""
+        return " ".join(query.split())
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed queries in one batch, reusing cached embeddings."""
+        embeddings = {}
+        missing = []
+        for query in queries:
+            embedding = self.embedding_cache.get(query)
+            if embedding is None:
+                missing.append(query)
+            else:
+                embeddings[query] = embedding
+
+        if missing:
+            for query, embedding in zip(
+                missing, self.embedding_fn(missing)
+            ):
+                embeddings[query] = embedding
+                self.embedding_cache.set(query, embedding)
+
+        return [embeddings[query] for query in queries]
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get hit/miss statistics for the query result and embedding caches.
+
+        Example:
+            >>> rag.cache_stats()["query"]["hit_rate"]
+            0.5
+        """
+        return {
+            "query": self.query_cache.stats(),
+            "embedding": self.embedding_cache.stats(),
+        }
+
     def get_relevant_context(
         self, query: str, max_tokens: int = 3000
     ) -> str:
@@ -440,19 +1162,44 @@ class RAGSystem:
         Returns:
             A string containing the relevant context
         """
-        results = self.query(query, n_results=10)
+        return self._build_context(
+            self.query(query, n_results=10), max_tokens
+        )
+
+    def get_relevant_context_many(
+        self, queries: List[str], max_tokens: int = 3000
+    ) -> List[str]:
+        """
+        Get relevant context for several queries with one batched lookup.
+
+        Args:
+            queries: The search queries
+            max_tokens: Maximum number of tokens to return per query
+
+        Returns:
+            One context string per query, in the same order as ``queries``
+        """
+        return [
+            self._build_context(results, max_tokens)
+            for results in self.query_many(queries, n_results=10)
+        ]
+
+    def _build_context(
+        self, results: List[Dict[str, Any]], max_tokens: int
+    ) -> str:
+        """Join query results into a context string within the token limit."""
         context = ""
         current_tokens = 0
 
         for result in results:
             text = result["text"]
-            # Rough estimate of tokens using word count
-            word_count = len(text.split())
+            # Counted with the embedding model's tokenizer, like chunks
+            token_count = self.count_tokens(text)
 
-            if current_tokens + word_count > max_tokens:
+            if current_tokens + token_count > max_tokens:
                 break
 
             context += text + "\n\n"
-            current_tokens += word_count
+            current_tokens += token_count
 
         return context.strip()
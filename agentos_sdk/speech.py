@@ -0,0 +1,254 @@
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from loguru import logger
+
+from agentos_sdk.workspace import check_workspace_dir
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Formats whose segments form a valid file when their bytes are joined
+CONCATENABLE_FORMATS = ("mp3",)
+
+
+def split_sentences(text: str, max_chars: int = 1000) -> List[str]:
+    """
+    Split text into segments of whole sentences of at most ``max_chars``.
+
+    Consecutive sentences are packed into one segment while they fit; a
+    sentence longer than ``max_chars`` is split on whitespace.
+    """
+    segments: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text.strip()):
+        pieces = [sentence]
+        if len(sentence) > max_chars:
+            pieces, piece = [], ""
+            for word in sentence.split():
+                if piece and len(piece) + len(word) + 1 > max_chars:
+                    pieces.append(piece)
+                    piece = word
+                else:
+                    piece = f"{piece} {word}" if piece else word
+            pieces.append(piece)
+        for piece in pieces:
+            if current and len(current) + len(piece) + 1 > max_chars:
+                segments.append(current)
+                current = piece
+            else:
+                current = f"{current} {piece}" if current else piece
+    if current:
+        segments.append(current)
+    return segments
+
+
+class SpeechSynthesizer:
+    """
+    Long-form text-to-speech through LiteLLM.
+
+    Text is split on sentence boundaries, the segments are synthesized
+    concurrently (at most ``max_workers`` at a time) and written to the
+    output file in order as soon as each one and its predecessors are done.
+    MP3 frames can be concatenated directly, so no re-encoding is needed.
+    The output is written to a temporary file and renamed once complete, so
+    concurrent calls never see or produce a partial file. Synthesized
+    segments are cached on disk by (text, voice, model, format). Only
+    formats in ``CONCATENABLE_FORMATS`` are supported.
+
+    Attributes:
+        max_workers (int): Segments synthesized at the same time
+        max_chars (int): Maximum characters per segment
+        cache_dir (str): Directory of cached segments, by default
+            ``audio/.cache`` in the workspace; None when caching is disabled
+        cache_hits (int): Segments served from the cache
+
+    Example:
+        >>> synthesizer = get_speech_synthesizer()
+        >>> synthesizer.synthesize(long_text, "alloy", "openai/tts-1", "story.mp3")
+        PosixPath('artifacts/audio/story.mp3')
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        cache: bool = True,
+        cache_dir: Optional[str] = None,
+    ):
+        self.max_workers = max_workers or int(
+            os.getenv("TTS_MAX_WORKERS", "4")
+        )
+        self.max_chars = max_chars or int(
+            os.getenv("TTS_SEGMENT_CHARS", "1000")
+        )
+        self.cache_dir = (
+            (
+                cache_dir
+                or os.path.join(
+                    check_workspace_dir(), "audio", ".cache"
+                )
+            )
+            if cache
+            else None
+        )
+        self.cache_hits = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="tts"
+        )
+        self._lock = threading.Lock()
+
+    def _cache_path(
+        self, text: str, voice: str, model: str, response_format: str
+    ) -> str:
+        key = hashlib.sha256(
+            json.dumps([text, voice, model, response_format]).encode(
+                "utf-8"
+            )
+        ).hexdigest()
+        return os.path.join(
+            self.cache_dir, f"{key}.{response_format}"
+        )
+
+    @staticmethod
+    def _speech(
+        text: str, voice: str, model: str, response_format: str
+    ) -> bytes:
+        from litellm import speech
+
+        return speech(
+            model=model,
+            voice=voice,
+            input=text,
+            response_format=response_format,
+        ).content
+
+    def synthesize_segment(
+        self,
+        text: str,
+        voice: str,
+        model: str,
+        response_format: str = "mp3",
+    ) -> bytes:
+        """Return the audio for one segment, from the cache if possible."""
+        cache_path = (
+            self._cache_path(text, voice, model, response_format)
+            if self.cache_dir
+            else None
+        )
+        if cache_path and os.path.exists(cache_path):
+            with self._lock:
+                self.cache_hits += 1
+            with open(cache_path, "rb") as f:
+                return f.read()
+
+        audio = self._speech(text, voice, model, response_format)
+        if cache_path:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, cache_path)
+        return audio
+
+    def synthesize(
+        self,
+        text: str,
+        voice: str = "alloy",
+        model: str = "openai/tts-1",
+        file_path: str = "speech.mp3",
+        on_segment: Optional[Callable[[int, bytes], None]] = None,
+        response_format: str = "mp3",
+    ) -> Path:
+        """
+        Synthesize ``text`` into one audio file in the workspace.
+
+        Args:
+            text (str): The text to speak
+            voice (str): The voice to use
+            model (str): The LiteLLM speech model
+            file_path (str): Output path, relative to the workspace ``audio``
+                directory
+            on_segment (Callable, optional): Called with each segment's index
+                and audio, in order, as soon as it is written
+            response_format (str): Audio format; must be one of
+                ``CONCATENABLE_FORMATS``
+
+        Returns:
+            Path: The path of the audio file
+
+        Raises:
+            ValueError: If ``text`` is empty or the format is not supported.
+        """
+        if response_format not in CONCATENABLE_FORMATS:
+            raise ValueError(
+                f"Unsupported audio format {response_format!r}; "
+                f"expected one of {', '.join(CONCATENABLE_FORMATS)}"
+            )
+        segments = split_sentences(text, self.max_chars)
+        if not segments:
+            raise ValueError(
+                "Cannot synthesize speech from empty text"
+            )
+        output_path = (
+            Path(check_workspace_dir()) / "audio" / file_path
+        )
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        futures = [
+            self._executor.submit(
+                self.synthesize_segment,
+                segment,
+                voice,
+                model,
+                response_format,
+            )
+            for segment in segments
+        ]
+
+        tmp_path = output_path.with_name(
+            f".{output_path.name}.{uuid.uuid4().hex}.part"
+        )
+        try:
+            with open(tmp_path, "wb") as out_file:
+                for index, future in enumerate(futures):
+                    audio = future.result()
+                    out_file.write(audio)
+                    out_file.flush()
+                    if on_segment is not None:
+                        on_segment(index, audio)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+
+        logger.info(
+            f"Synthesized {len(segments)} segment(s) into {output_path}"
+        )
+        return output_path
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_speech_synthesizer: Optional[SpeechSynthesizer] = None
+_speech_synthesizer_lock = threading.Lock()
+
+
+def get_speech_synthesizer() -> SpeechSynthesizer:
+    """Return the process-wide SpeechSynthesizer, creating it on first use."""
+    global _speech_synthesizer
+    with _speech_synthesizer_lock:
+        if _speech_synthesizer is None:
+            _speech_synthesizer = SpeechSynthesizer()
+            atexit.register(_speech_synthesizer.close)
+    return _speech_synthesizer
@@ -1,23 +1,45 @@
 import asyncio
+import atexit
+import gc
+import inspect
 import json
 import os
+import queue
+import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
 
-import torch
-from claude_code_sdk import ClaudeCodeOptions, Message, query
 from dotenv import load_dotenv
-from google import genai
-from litellm import completion, speech
 from loguru import logger
-from swarms.utils.formatter import formatter
-from transformers import (
-    AutoModelForCausalLM,
-    AutoTokenizer,
-    pipeline,
-)
 
+from agentos_sdk.cache import ResponseCache
+from agentos_sdk.calculator import (
+    CalculatorError,
+    compile_expression,
+    format_result,
+)
+from agentos_sdk.event_loop import (
+    BackgroundEventLoop,
+    get_event_loop_runner,
+)
+from agentos_sdk.gemini_files import get_gemini_file_cache
+from agentos_sdk.speech import get_speech_synthesizer
+from agentos_sdk.video_analysis import get_segmented_video_analyzer
+from agentos_sdk.video_jobs import get_video_job_manager
 from agentos_sdk.workspace import check_workspace_dir
 
 # Initialize the client
@@ -28,6 +50,274 @@ LOCATION = os.getenv("GOOGLE_CLOUD_LOCATION")
 load_dotenv()
 
 
+def browser_use_supports_sessions() -> bool:
+    """
+    Return True if the installed browser_use accepts an external browser.
+
+    The pool relies on the 0.1.x API (``Browser``, ``BrowserConfig`` and the
+    ``browser``/``browser_context`` arguments of ``Agent``); later releases
+    manage their own browser and are run without the pool.
+    """
+    try:
+        from browser_use import (
+            Agent,
+            Browser,
+            BrowserConfig,
+        )  # noqa: F401
+    except ImportError:
+        return False
+    try:
+        parameters = inspect.signature(Agent.__init__).parameters
+    except (TypeError, ValueError):
+        return False
+    return "browser_context" in parameters
+
+
+class _BrowserSession:
+    """A warm browser process and the context tasks currently run in."""
+
+    def __init__(self, browser: Any, context: Any):
+        self.browser = browser
+        self.context = context
+        self.uses = 0
+
+
+class BrowserSessionPool:
+    """
+    A pool of warm ``browser_use`` browsers shared by browser agent tasks.
+
+    Launching a headless browser takes seconds, so instead of starting one per
+    task the pool keeps up to ``size`` browsers alive and hands them out to
+    tasks. Between tasks the browser context is replaced with a fresh one, so
+    cookies, storage and open tabs never leak from one task to the next while
+    the browser process stays warm. A browser is shut down and relaunched after
+    ``max_tasks_per_browser`` tasks, when a task fails, or when the browsers'
+    resident memory exceeds ``max_memory_mb`` each on average.
+
+    Playwright objects are bound to the event loop that created them, so the
+    pool runs every browser task on one long-lived background loop (by default
+    the process-wide loop from `get_event_loop_runner`).
+
+    Pooling needs the browser_use 0.1.x API; with later releases (see
+    `browser_use_supports_sessions`) tasks still run, each in its own browser.
+
+    Attributes:
+        size (int): Maximum number of browsers alive (and tasks running) at once
+        max_tasks_per_browser (int): Tasks a browser runs before it is recycled
+        max_memory_mb (float): Average browser memory that triggers recycling
+        headless (bool): Whether browsers run without a visible window
+        launches (int): Number of browsers started
+        reuses (int): Number of tasks that ran on an already warm browser
+        recycles (int): Number of browsers shut down and replaced
+
+    Example:
+        >>> pool = BrowserSessionPool(size=2)
+        >>> agent = BrowserAgent(pool=pool)
+        >>> agent.run("Go to example.com and get the page title")
+        >>> pool.stats()["reuses"]
+        0
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_tasks_per_browser: Optional[int] = None,
+        max_memory_mb: Optional[float] = None,
+        headless: bool = True,
+        runner: Optional[BackgroundEventLoop] = None,
+    ):
+        self.size = max(
+            1, size or int(os.getenv("BROWSER_POOL_SIZE", "2"))
+        )
+        self.max_tasks_per_browser = max_tasks_per_browser or int(
+            os.getenv("BROWSER_POOL_MAX_TASKS", "20")
+        )
+        self.max_memory_mb = max_memory_mb or float(
+            os.getenv("BROWSER_POOL_MAX_MEMORY_MB", "1024")
+        )
+        self.headless = headless
+        self.launches = 0
+        self.reuses = 0
+        self.recycles = 0
+        self._idle: List[_BrowserSession] = []
+        self._open = 0
+        self._memory_warned = False
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.runner = runner or get_event_loop_runner()
+
+    def submit(self, coro) -> Future:
+        """
+        Schedule a coroutine on the pool's event loop.
+
+        Args:
+            coro: Coroutine that uses ``session()``
+
+        Returns:
+            Future: Resolves to the coroutine's result
+        """
+        return self.runner.submit(coro)
+
+    @asynccontextmanager
+    async def session(self):
+        """
+        Borrow a warm browser session for the duration of a task.
+
+        Must be used from a coroutine running on the pool's loop (see ``submit``).
+        Yields an object with ``browser`` and ``context`` attributes to pass to
+        ``browser_use.Agent``.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        async with self._slots:
+            session = await self._acquire()
+            healthy = False
+            try:
+                yield session
+                healthy = True
+            finally:
+                await self._release(session, healthy)
+
+    async def _acquire(self) -> _BrowserSession:
+        if self._idle:
+            self.reuses += 1
+            return self._idle.pop()
+        return await self._launch()
+
+    async def _launch(self) -> _BrowserSession:
+        from browser_use import Browser, BrowserConfig
+
+        browser = Browser(
+            config=BrowserConfig(headless=self.headless)
+        )
+        context = await browser.new_context()
+        self._open += 1
+        self.launches += 1
+        return _BrowserSession(browser, context)
+
+    async def _release(
+        self, session: _BrowserSession, healthy: bool
+    ) -> None:
+        session.uses += 1
+        if (
+            not healthy
+            or session.uses >= self.max_tasks_per_browser
+            or self._memory_per_browser_mb() > self.max_memory_mb
+        ):
+            self.recycles += 1
+            await self._close(session)
+            return
+
+        # A fresh context drops cookies, storage and tabs of the last task
+        try:
+            await session.context.close()
+            session.context = await session.browser.new_context()
+        except Exception as e:
+            logger.error(f"Error resetting browser session: {e}")
+            self.recycles += 1
+            await self._close(session)
+            return
+        self._idle.append(session)
+
+    async def _close(self, session: _BrowserSession) -> None:
+        self._open -= 1
+        try:
+            await session.context.close()
+        except Exception:
+            pass
+        try:
+            await session.browser.close()
+        except Exception as e:
+            logger.error(f"Error closing browser: {e}")
+
+    def _memory_per_browser_mb(self) -> float:
+        """
+        Average resident memory per open browser, in MB.
+
+        This is a process-wide heuristic: Playwright does not expose the
+        browser's pid, so the figure is the memory of every Chromium process
+        descended from this interpreter, divided by the number of browsers
+        the pool has open. Browsers launched outside the pool are counted
+        too. Without psutil, memory-based recycling is disabled.
+        """
+        if not self._open:
+            return 0.0
+        try:
+            import psutil
+        except ImportError:
+            if not self._memory_warned:
+                self._memory_warned = True
+                logger.warning(
+                    "psutil is not installed; browsers will not be "
+                    "recycled based on memory use"
+                )
+            return 0.0
+        try:
+            total = sum(
+                child.memory_info().rss
+                for child in psutil.Process().children(recursive=True)
+                if "chrom" in child.name().lower()
+            )
+        except Exception:
+            return 0.0
+        return total / self._open / 1024**2
+
+    def warm_up(self, count: Optional[int] = None) -> None:
+        """
+        Launch browsers ahead of time so the first tasks do not wait for them.
+
+        Args:
+            count (int, optional): Number of browsers to start; defaults to ``size``
+        """
+        if not browser_use_supports_sessions():
+            return
+
+        async def launch():
+            missing = min(count or self.size, self.size) - self._open
+            for _ in range(max(0, missing)):
+                self._idle.append(await self._launch())
+
+        self.runner.run(launch())
+
+    def close(self) -> None:
+        """Shut down every idle browser."""
+        if not self._idle:
+            return
+
+        async def close_idle():
+            while self._idle:
+                await self._close(self._idle.pop())
+
+        try:
+            self.runner.run(close_idle(), timeout=30)
+        except Exception as e:
+            logger.error(f"Error closing browser pool: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return launch, reuse and recycle counts and the pool's size."""
+        return {
+            "size": self.size,
+            "open": self._open,
+            "idle": len(self._idle),
+            "launches": self.launches,
+            "reuses": self.reuses,
+            "recycles": self.recycles,
+        }
+
+
+_browser_pool: Optional[BrowserSessionPool] = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserSessionPool:
+    """Return the process-wide BrowserSessionPool, creating it on first use."""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserSessionPool()
+            atexit.register(_browser_pool.close)
+    return _browser_pool
+
+
 class BrowserAgent:
     """
     A high-level browser automation agent that executes web-based tasks using natural language instructions.
@@ -47,6 +337,7 @@ class BrowserAgent:
     Attributes:
         agent_name (str): Name identifier for the agent instance
         model_name (str): The language model to use for task interpretation
+        pool (BrowserSessionPool): Pool of warm browsers the tasks run in
 
     Example:
         >>> agent = BrowserAgent(agent_name="MyBrowserBot")
@@ -57,7 +348,8 @@ class BrowserAgent:
         - The agent uses a language model to interpret natural language commands
         - All browser interactions are automated and headless by default
         - Results are returned in a structured JSON format for easy parsing
-        - The agent maintains session state across multiple commands
+        - Browsers are borrowed from a shared pool and stay warm between tasks; each
+          task starts in a fresh browser context
         - Error handling is built in for common browser automation issues
     """
 
@@ -65,6 +357,7 @@ class BrowserAgent:
         self,
         agent_name: str = "BrowserAgent",
         model_name: str = "claude-3-5-sonnet-20240620",
+        pool: Optional[BrowserSessionPool] = None,
     ):
         """
         Initialize a new BrowserAgent instance.
@@ -74,8 +367,12 @@ class BrowserAgent:
                 Defaults to "BrowserAgent".
             model_name (str, optional): The language model to use for task interpretation.
                 Defaults to "claude-3-5-sonnet-20240620".
+            pool (BrowserSessionPool, optional): Browser pool to run tasks in.
+                Defaults to the process-wide pool from `get_browser_pool`.
         """
         self.agent_name = agent_name
+        self.pool = pool or get_browser_pool()
+        self._llm = None
 
     async def call_browser_agent(self, task: str):
         """
@@ -83,8 +380,9 @@ class BrowserAgent:
 
         This method creates an instance of the BrowserAgentBase, which is configured to use
         a language model (currently hardcoded to OpenAI's GPT-4o) to interpret and execute
-        the provided task in a browser environment. The agent is run asynchronously, and upon
-        completion, the result is serialized to a JSON-formatted string with indentation for readability.
+        the provided task in a browser borrowed from the agent's pool. The agent runs on the
+        pool's event loop, and upon completion, the result is serialized to a JSON-formatted
+        string with indentation for readability.
 
         Args:
             task (str): A natural language description of the task to be performed by the browser agent.
@@ -100,23 +398,73 @@ class BrowserAgent:
             >>> asyncio.run(agent.call_browser_agent("Search for weather in New York"))
             '{\n    "model_output": {...},\n    "result": [...],\n    "state": {...}\n}'
         """
+        return await self.pool.runner.run_async(
+            self._run_in_pool(task)
+        )
+
+    async def _run_in_pool(
+        self, task: str, timeout: Optional[float] = None
+    ) -> str:
+        """
+        Run ``task`` in a pooled browser. Executes on the pool's loop.
+
+        ``timeout`` only counts time spent running in a browser, not time spent
+        waiting for one to become free. A browser whose task timed out is
+        recycled rather than reused. With a browser_use release that does not
+        accept an external browser, the task runs in a browser of its own.
+        """
         from browser_use import Agent as BrowserAgentBase
-        from langchain_openai import ChatOpenAI
 
-        agent = BrowserAgentBase(
-            task=task,
-            llm=ChatOpenAI(model="gpt-4o"),
-        )
-        result = await agent.run()
+        if not browser_use_supports_sessions():
+            agent = BrowserAgentBase(task=task, llm=self._get_llm())
+            result = await asyncio.wait_for(agent.run(), timeout)
+            return result.model_dump_json(indent=4)
+
+        async with self.pool.session() as session:
+            agent = BrowserAgentBase(
+                task=task,
+                llm=self._get_llm(),
+                browser=session.browser,
+                browser_context=session.context,
+            )
+            result = await asyncio.wait_for(agent.run(), timeout)
         return result.model_dump_json(indent=4)
 
+    async def _run_many_in_pool(
+        self, tasks: List[str], timeout: Optional[float]
+    ) -> List[str]:
+        """Run ``tasks`` concurrently in pooled browsers, in order."""
+
+        async def run_one(task: str) -> str:
+            try:
+                return await self._run_in_pool(task, timeout)
+            except asyncio.TimeoutError:
+                return (
+                    f"Error: Task timed out after {timeout} seconds"
+                )
+            except Exception as e:
+                return f"Error: {str(e)}"
+
+        return list(
+            await asyncio.gather(*(run_one(task) for task in tasks))
+        )
+
+    def _get_llm(self):
+        """Return the chat model client, reused across this agent's tasks."""
+        if self._llm is None:
+            from langchain_openai import ChatOpenAI
+
+            self._llm = ChatOpenAI(model="gpt-4o")
+        return self._llm
+
     def run(self, task: str):
         """
         Synchronously runs the browser agent for a given task.
 
-        This method wraps the asynchronous `call_browser_agent` method, allowing users to
-        invoke the browser agent in a blocking (synchronous) manner. It is suitable for
-        scripts or environments where asynchronous execution is not desired or supported.
+        This method submits the task to the pool's event loop and blocks until it finishes,
+        allowing users to invoke the browser agent in a synchronous manner. It is suitable for
+        scripts or environments where asynchronous execution is not desired or supported, and
+        unlike `asyncio.run` it also works when an event loop is already running.
 
         Args:
             task (str): The task description for the browser agent to perform. This should be
@@ -135,7 +483,58 @@ class BrowserAgent:
                 "state": {...}
             }
         """
-        return asyncio.run(self.call_browser_agent(task))
+        return self.pool.runner.run(self._run_in_pool(task))
+
+    async def call_browser_agent_many(
+        self, tasks: List[str], timeout: Optional[float] = None
+    ) -> List[str]:
+        """
+        Asynchronously run several browser tasks concurrently.
+
+        Tasks share one event loop and run in the agent's browser pool, so at most
+        ``pool.size`` browsers are busy at a time and the remaining tasks wait for
+        a free one.
+
+        Args:
+            tasks (List[str]): Natural language descriptions of the browser tasks.
+            timeout (float, optional): Seconds each task may run once it has a
+                browser. None means no limit.
+
+        Returns:
+            List[str]: One JSON-formatted result per task, in the same order as
+                ``tasks``. A failing or timed-out task yields an ``"Error: ..."``
+                string instead of raising.
+
+        Example:
+            >>> results = await BrowserAgent().call_browser_agent_many(
+            ...     ["Get the title of example.com", "Get the title of example.org"],
+            ...     timeout=120,
+            ... )
+        """
+        return await self.pool.runner.run_async(
+            self._run_many_in_pool(tasks, timeout)
+        )
+
+    def run_many(
+        self, tasks: List[str], timeout: Optional[float] = None
+    ) -> List[str]:
+        """
+        Synchronously run several browser tasks concurrently.
+
+        Blocking counterpart of `call_browser_agent_many`.
+
+        Args:
+            tasks (List[str]): Natural language descriptions of the browser tasks.
+            timeout (float, optional): Seconds each task may run once it has a
+                browser. None means no limit.
+
+        Returns:
+            List[str]: One JSON-formatted result or ``"Error: ..."`` string per
+                task, in the same order as ``tasks``.
+        """
+        return self.pool.runner.run(
+            self._run_many_in_pool(tasks, timeout)
+        )
 
 
 class HuggingFaceAPI:
@@ -205,6 +604,13 @@ class HuggingFaceAPI:
             quantization_config (dict, optional): Configuration for quantization
             **kwargs: Additional arguments for model initialization
         """
+        import torch
+        from transformers import (
+            AutoModelForCausalLM,
+            AutoTokenizer,
+            pipeline,
+        )
+
         self.model_id = model_id
         self.task_type = task_type
         self.device = device or (
@@ -214,12 +620,15 @@ class HuggingFaceAPI:
         self.quantize = quantize
         self.quantization_config = quantization_config or {}
 
+        torch_dtype = kwargs.pop("torch_dtype", None)
+
         # Initialize the pipeline based on task type
         try:
             self.pipeline = pipeline(
                 task=task_type,
                 model=model_id,
                 device=self.device,
+                torch_dtype=torch_dtype,
                 **kwargs,
             )
         except Exception as e:
@@ -228,7 +637,8 @@ class HuggingFaceAPI:
             self.model = AutoModelForCausalLM.from_pretrained(
                 model_id,
                 device_map=self.device,
-                torch_dtype=(
+                torch_dtype=torch_dtype
+                or (
                     torch.float16
                     if self.device == "cuda"
                     else torch.float32
@@ -238,6 +648,9 @@ class HuggingFaceAPI:
             self.tokenizer = AutoTokenizer.from_pretrained(model_id)
             self.pipeline = None
 
+        self._batcher = None
+        self._batcher_lock = threading.Lock()
+
     def generate(
         self,
         prompt: str,
@@ -312,168 +725,789 @@ class HuggingFaceAPI:
             return result[0]
         return result
 
+    def generate_batch(
+        self,
+        prompts: List[str],
+        max_length: Optional[int] = None,
+        **kwargs,
+    ) -> List[str]:
+        """
+        Generate one completion for each prompt in a single padded forward pass.
 
-def call_huggingface_model(
-    task: str,
-    model_id: str,
-    max_length: int = 100,
-) -> str:
-    """
-    Call a Hugging Face model to perform a text generation task.
-
-    This function provides a simplified interface to interact with Hugging Face models.
-    It creates a new instance of HuggingFaceAPI for each call, which ensures clean
-    state management but may impact performance for repeated calls to the same model.
+        Args:
+            prompts (List[str]): Input text prompts
+            max_length (int, optional): Override default max_length
+            **kwargs: Additional generation parameters
 
-    Args:
-        task (str): The text prompt or task description to be processed by the model.
-            This could be a question, a text completion prompt, or any other text input
-            that the model should process.
+        Returns:
+            List[str]: Generated text for each prompt, in order
 
-        model_id (str): The identifier of the Hugging Face model to use.
-            Examples:
-            - "gpt2" for OpenAI's GPT-2 model
-            - "facebook/opt-350m" for Meta's OPT model
-            - "bigscience/bloom" for the BLOOM model
-            For a complete list, visit: https://huggingface.co/models
+        Raises:
+            Exception: Errors from the underlying model are propagated.
+        """
+        tokenizer = (
+            self.pipeline.tokenizer
+            if self.pipeline
+            else self.tokenizer
+        )
+        # Decoder-only models need a pad token and left padding so every
+        # prompt in the batch ends right where generation starts. The
+        # tokenizer is shared with unbatched calls, so its padding side is
+        # restored afterwards
+        padding_side = getattr(tokenizer, "padding_side", None)
+        if tokenizer is not None:
+            if tokenizer.pad_token is None:
+                tokenizer.pad_token = tokenizer.eos_token
+            if self.task_type == "text-generation":
+                tokenizer.padding_side = "left"
 
-        max_length (int, optional): The maximum length of the generated text in tokens.
-            Defaults to 100. This parameter helps control the length of the model's
-            output and manage computational resources.
+        try:
+            if self.pipeline:
+                outputs = self.pipeline(
+                    prompts,
+                    batch_size=len(prompts),
+                    max_length=max_length or self.max_length,
+                    **kwargs,
+                )
+                results = []
+                for output in outputs:
+                    if isinstance(output, list):
+                        output = output[0]
+                    if (
+                        isinstance(output, dict)
+                        and "generated_text" in output
+                    ):
+                        output = output["generated_text"]
+                    results.append(output)
+                return results
 
-    Returns:
-        str: The generated text output from the model. The exact format depends on
-            the model being used, but typically includes:
-            - For text generation: The completed text based on the input prompt
-            - For question answering: The answer to the provided question
-            - For other tasks: Task-specific output in text format
+            # Manual generation if pipeline is not available
+            inputs = self.tokenizer(
+                prompts, return_tensors="pt", padding=True
+            ).to(self.device)
+            outputs = self.model.generate(
+                **inputs,
+                max_length=max_length or self.max_length,
+                pad_token_id=self.tokenizer.pad_token_id,
+                **kwargs,
+            )
+            return self.tokenizer.batch_decode(
+                outputs, skip_special_tokens=True
+            )
+        finally:
+            if tokenizer is not None and padding_side is not None:
+                tokenizer.padding_side = padding_side
 
-    Examples:
-        >>> # Generate text with GPT-2
-        >>> result = call_huggingface_model(
-        ...     task="Once upon a time",
-        ...     model_id="gpt2",
-        ...     max_length=50
-        ... )
-        >>> print(result)
+    def get_batcher(
+        self,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+    ) -> "HuggingFaceBatcher":
+        """
+        Return the micro-batching scheduler for this model, creating it on first use.
 
-        >>> # Use a larger model for more complex tasks
-        >>> answer = call_huggingface_model(
-        ...     task="What is quantum computing?",
-        ...     model_id="facebook/opt-1.3b",
-        ...     max_length=200
-        ... )
-        >>> print(answer)
+        Args:
+            max_batch_size (int, optional): Largest batch per forward pass.
+                Defaults to the HF_BATCH_MAX_SIZE environment variable, or 8.
+            max_wait_ms (float, optional): How long the first request in a batch
+                waits for others. Defaults to HF_BATCH_MAX_WAIT_MS, or 10.
 
-    Notes:
-        - The function creates a new model instance for each call, which may be
-          inefficient for repeated calls to the same model.
-        - The model is automatically placed on GPU if available, falling back to CPU.
-        - Error handling is managed by the underlying HuggingFaceAPI class.
-        - The actual output length may be shorter than max_length depending on the
-          model's generation parameters and stopping criteria.
+        Returns:
+            HuggingFaceBatcher: The shared batcher for this model
+        """
+        with self._batcher_lock:
+            if self._batcher is None or self._batcher.closed:
+                self._batcher = HuggingFaceBatcher(
+                    self,
+                    max_batch_size=max_batch_size
+                    or int(os.getenv("HF_BATCH_MAX_SIZE", "8")),
+                    max_wait_ms=max_wait_ms
+                    or float(os.getenv("HF_BATCH_MAX_WAIT_MS", "10")),
+                )
+            return self._batcher
 
-    Raises:
-        Exception: Any exceptions from model loading or generation are caught by
-            HuggingFaceAPI and returned as error messages in the output string.
-    """
-    print(f"◢ HUGGINGFACE MODEL: Initializing {model_id}")
-    model = HuggingFaceAPI(
-        model_id=model_id,
-        task_type="text-generation",
-        max_length=max_length,
-    )
-    result = model.run(task)
-    print(f"◢ HUGGINGFACE MODEL: Generated {len(result)} characters")
-    return result
+    def close(self) -> None:
+        """Stop the batcher thread, if any, so the model can be freed."""
+        with self._batcher_lock:
+            if self._batcher is not None:
+                self._batcher.close()
+                self._batcher = None
 
 
-async def call_terminal_developer_agent_async(
-    task: str,
-    max_turns: int = 3,
-    system_prompt: str = "You are a helpful assistant",
-    cwd: str = None,
-    allowed_tools: list = None,
-    permission_mode: str = "acceptEdits",
-):
+class HuggingFaceBatcher:
     """
-    Call the Claude Code terminal developer agent with the specified parameters.
+    A dynamic batching scheduler in front of HuggingFaceAPI.generate_batch.
 
-    Args:
-        task (str): The prompt or task to send to the agent.
-        max_turns (int): Maximum number of conversational turns. Default is 3.
-        system_prompt (str): System prompt for the agent. Default is a helpful assistant.
-        cwd (str, optional): Working directory for the agent. Default is None.
-        allowed_tools (list, optional): List of allowed tools. Default is ["Read", "Write", "Bash"].
-        permission_mode (str): Permission mode for the agent. Default is "acceptEdits".
+    Callers submit single prompts from any thread. A background worker takes the
+    first pending request, keeps collecting requests for up to ``max_wait_ms`` or
+    until ``max_batch_size`` is reached, then runs requests that share the same
+    generation parameters through one padded ``generate`` call and hands each
+    caller its own result. Under concurrent load this turns many single-prompt
+    forward passes into a few batched ones.
 
-    Returns:
-        list: List of serialized Message objects returned by the agent.
-    """
+    Attributes:
+        api (HuggingFaceAPI): The model that executes the batches
+        max_batch_size (int): Largest number of prompts per forward pass
+        max_wait_ms (float): Longest time a request waits for a batch to fill
+        batches (int): Number of forward passes executed
+        requests (int): Number of prompts processed
 
-    # if allowed_tools is None:
-    allowed_tools = ["Read", "Write", "Bash"]
+    Example:
+        >>> batcher = HuggingFaceAPI("gpt2").get_batcher(max_batch_size=16)
+        >>> batcher.generate("Once upon a time", max_length=50)
+    """
 
-    async def main():
-        messages: list[Message] = []
-        options = ClaudeCodeOptions(
-            max_turns=max_turns,
-            system_prompt=system_prompt,
-            cwd=Path(cwd) if cwd else None,
-            allowed_tools=allowed_tools,
-            permission_mode=permission_mode,
+    def __init__(
+        self,
+        api: "HuggingFaceAPI",
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+    ):
+        self.api = api
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self.batches = 0
+        self.requests = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        # Orders submissions against the close sentinel
+        self._submit_lock = threading.Lock()
+        self._worker = threading.Thread(
+            target=self._run_worker,
+            name=f"hf-batcher-{api.model_id}",
+            daemon=True,
         )
-        async for message in query(prompt=task, options=options):
-            messages.append(message)
-            logger.info(
-                f"Claude Code Terminal Developer Agent Message: {message}"
-            )
+        self._worker.start()
 
-        # Convert messages to serializable format
-        serialized_messages = []
-        for msg in messages:
-            try:
-                # Try to get message attributes
-                msg_dict = {
-                    "type": (
-                        msg.type if hasattr(msg, "type") else None
-                    ),
-                    "content": (
-                        msg.content
-                        if hasattr(msg, "content")
-                        else None
-                    ),
-                    "role": (
-                        msg.role if hasattr(msg, "role") else None
-                    ),
-                    "metadata": (
-                        msg.metadata
-                        if hasattr(msg, "metadata")
-                        else None
-                    ),
-                }
-                # Remove None values
-                msg_dict = {
-                    k: v for k, v in msg_dict.items() if v is not None
-                }
-                serialized_messages.append(msg_dict)
-            except Exception as e:
-                logger.error(f"Error serializing message: {e}")
-                # Include basic string representation if serialization fails
-                serialized_messages.append({"content": str(msg)})
+    def submit(
+        self, prompt: str, max_length: Optional[int] = None, **kwargs
+    ) -> Future:
+        """
+        Queue a prompt for generation.
 
-        return json.dumps(serialized_messages, indent=2)
+        Returns:
+            Future: Resolves to the generated text
 
-    return await main()
+        Raises:
+            RuntimeError: If the batcher has been closed.
+        """
+        future: Future = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("HuggingFaceBatcher is closed")
+            self._queue.put((prompt, max_length, kwargs, future))
+        return future
 
+    @property
+    def closed(self) -> bool:
+        return self._closed
 
-def call_terminal_developer_agent(
-    task: str,
-    max_turns: int = 3,
-    system_prompt: str = "You are a helpful assistant",
-    cwd: str = None,
-    allowed_tools: list = None,
-    permission_mode: str = "acceptEdits",
+    def generate(
+        self,
+        prompt: str,
+        max_length: Optional[int] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> str:
+        """
+        Generate text for a prompt, batched with concurrent callers.
+
+        Once the batcher is closed, for example because the model registry
+        evicted its model, the prompt is generated directly without batching.
+
+        Returns:
+            str: Generated text, or an error message if generation failed
+        """
+        try:
+            try:
+                future = self.submit(prompt, max_length, **kwargs)
+            except RuntimeError:
+                if not self._closed:
+                    raise
+                return self.api.generate_batch(
+                    [prompt], max_length=max_length, **kwargs
+                )[0]
+            return future.result(timeout)
+        except Exception as e:
+            print(f"Error in generation: {e}")
+            return f"Error generating text: {str(e)}"
+
+    def close(self) -> None:
+        """
+        Stop the worker thread once pending requests are processed.
+
+        Later submissions raise, and any request still queued when the worker
+        stops is failed rather than left waiting forever.
+        """
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+
+    def _fail_pending(self) -> None:
+        """Fail every request left in the queue."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None and not item[3].done():
+                item[3].set_exception(
+                    RuntimeError("HuggingFaceBatcher is closed")
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batch counts and the mean batch size."""
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": (
+                self.requests / self.batches if self.batches else 0.0
+            ),
+        }
+
+    def _collect(self, first: tuple) -> tuple:
+        """Gather requests until the batch is full or the wait expires."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run_worker(self) -> None:
+        try:
+            self._process()
+        finally:
+            self._fail_pending()
+
+    def _process(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stop = self._collect(first)
+
+            # Only requests with identical generation parameters can share
+            # a forward pass
+            groups: Dict[str, list] = {}
+            for item in batch:
+                _, max_length, kwargs, _ = item
+                key = repr((max_length, sorted(kwargs.items())))
+                groups.setdefault(key, []).append(item)
+
+            for items in groups.values():
+                prompts = [item[0] for item in items]
+                futures = [item[3] for item in items]
+                try:
+                    results = self.api.generate_batch(
+                        prompts, max_length=items[0][1], **items[0][2]
+                    )
+                    for future, result in zip(futures, results):
+                        future.set_result(result)
+                except Exception as e:
+                    for future in futures:
+                        future.set_exception(e)
+                self.batches += 1
+                self.requests += len(items)
+
+            if stop:
+                return
+
+
+class HuggingFaceModelRegistry:
+    """
+    A process-wide cache of loaded HuggingFaceAPI instances.
+
+    Loading a transformers pipeline means reading the full model weights, which
+    takes seconds to minutes on CPU. The registry keeps loaded models keyed by
+    (model_id, task_type, dtype, device) and evicts the least recently used ones
+    once their combined parameter memory exceeds a budget.
+
+    Loading is lazy and thread-safe: concurrent requests for the same model wait
+    for a single load, while different models can load in parallel.
+
+    Attributes:
+        max_memory_bytes (int): Memory budget for cached model weights. Defaults
+            to the HF_MODEL_CACHE_MAX_GB environment variable, or 8 GB.
+
+    Example:
+        >>> registry = get_model_registry()
+        >>> model = registry.get("gpt2")  # Loads the weights
+        >>> model = registry.get("gpt2")  # Returns the cached instance
+        >>> registry.stats()["models"]
+        1
+    """
+
+    def __init__(self, max_memory_bytes: Optional[int] = None):
+        if max_memory_bytes is None:
+            max_memory_gb = float(
+                os.getenv("HF_MODEL_CACHE_MAX_GB", "8")
+            )
+            max_memory_bytes = int(max_memory_gb * 1024**3)
+        self.max_memory_bytes = max_memory_bytes
+        self._models: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._load_locks: Dict[tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _make_key(
+        model_id: str,
+        task_type: str,
+        dtype: Optional[str],
+        device: Optional[str],
+    ) -> tuple:
+        import torch
+
+        device = device or (
+            "cuda" if torch.cuda.is_available() else "cpu"
+        )
+        return (model_id, task_type, dtype or "auto", device)
+
+    @staticmethod
+    def _estimate_memory(api: "HuggingFaceAPI") -> int:
+        """Approximate the memory taken by a model's parameters, in bytes."""
+        model = (
+            api.pipeline.model
+            if api.pipeline is not None
+            else getattr(api, "model", None)
+        )
+        if model is None:
+            return 0
+        return sum(
+            param.numel() * param.element_size()
+            for param in model.parameters()
+        )
+
+    def get(
+        self,
+        model_id: str,
+        task_type: str = "text-generation",
+        dtype: Optional[str] = None,
+        device: Optional[str] = None,
+        max_length: int = 100,
+    ) -> "HuggingFaceAPI":
+        """
+        Return a loaded model, loading it on first use.
+
+        Args:
+            model_id (str): The model ID from Hugging Face Hub
+            task_type (str): Type of task, e.g. "text-generation"
+            dtype (str, optional): Torch dtype name such as "float16"; None lets
+                transformers choose
+            device (str, optional): "cuda" or "cpu"; None picks automatically
+            max_length (int): Default max_length for a newly loaded model
+
+        Returns:
+            HuggingFaceAPI: The cached or newly loaded model
+        """
+        key = self._make_key(model_id, task_type, dtype, device)
+
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            load_lock = self._load_locks.setdefault(
+                key, threading.Lock()
+            )
+
+        with load_lock:
+            # Another thread may have finished loading while we waited
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self.misses += 1
+
+            kwargs = {}
+            if dtype:
+                import torch
+
+                kwargs["torch_dtype"] = getattr(torch, dtype)
+            api = HuggingFaceAPI(
+                model_id=model_id,
+                task_type=task_type,
+                device=key[3],
+                max_length=max_length,
+                **kwargs,
+            )
+            size = self._estimate_memory(api)
+
+            with self._lock:
+                self._models[key] = (api, size)
+                self._evict(keep=key)
+                self._load_locks.pop(key, None)
+            return api
+
+    def _evict(self, keep: tuple) -> None:
+        """Drop least recently used models until the budget is met."""
+        evicted = False
+        while (
+            self.memory_usage() > self.max_memory_bytes
+            and len(self._models) > 1
+        ):
+            oldest = next(iter(self._models))
+            if oldest == keep:
+                break
+            # Queued requests still finish; callers still holding the
+            # model's batcher fall back to unbatched generation
+            self._models.pop(oldest)[0].close()
+            evicted = True
+            logger.info(f"Evicted Hugging Face model {oldest[0]}")
+
+        if self.memory_usage() > self.max_memory_bytes:
+            logger.warning(
+                f"Hugging Face model {keep[0]} exceeds the model cache budget of "
+                f"{self.max_memory_bytes / 1024**3:.1f} GB on its own"
+            )
+        if evicted:
+            gc.collect()
+            _empty_cuda_cache()
+
+    def preload(
+        self, models: List[Union[str, Dict[str, Any]]]
+    ) -> None:
+        """
+        Load models ahead of time so the first tool call does not pay for it.
+
+        Args:
+            models: Model IDs, or dicts of keyword arguments for ``get``
+                (e.g. ``{"model_id": "gpt2", "dtype": "float16"}``)
+        """
+        for spec in models:
+            if isinstance(spec, str):
+                spec = {"model_id": spec}
+            try:
+                model = self.get(**spec)
+                # Warm up kernels and caches with a tiny generation
+                model.generate("Hello", max_length=8)
+            except Exception as e:
+                logger.error(
+                    f"Error preloading Hugging Face model {spec}: {e}"
+                )
+
+    def memory_usage(self) -> int:
+        """Total estimated memory of cached models, in bytes."""
+        return sum(size for _, size in self._models.values())
+
+    def clear(self) -> None:
+        """Drop every cached model."""
+        with self._lock:
+            for api, _ in self._models.values():
+                api.close()
+            self._models.clear()
+        gc.collect()
+        _empty_cuda_cache()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache hits, misses, loaded models and memory usage."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "models": len(self._models),
+            "memory_bytes": self.memory_usage(),
+            "max_memory_bytes": self.max_memory_bytes,
+        }
+
+
+_model_registry = HuggingFaceModelRegistry()
+
+
+def _empty_cuda_cache() -> None:
+    """Release cached CUDA memory, without importing torch if it never was."""
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+def get_model_registry() -> HuggingFaceModelRegistry:
+    """Return the process-wide HuggingFaceModelRegistry."""
+    return _model_registry
+
+
+def call_huggingface_model(
+    task: str,
+    model_id: str,
+    max_length: int = 100,
+) -> str:
+    """
+    Call a Hugging Face model to perform a text generation task.
+
+    This function provides a simplified interface to interact with Hugging Face models.
+    Models are loaded once and reused across calls through the process-wide
+    HuggingFaceModelRegistry.
+
+    Args:
+        task (str): The text prompt or task description to be processed by the model.
+            This could be a question, a text completion prompt, or any other text input
+            that the model should process.
+
+        model_id (str): The identifier of the Hugging Face model to use.
+            Examples:
+            - "gpt2" for OpenAI's GPT-2 model
+            - "facebook/opt-350m" for Meta's OPT model
+            - "bigscience/bloom" for the BLOOM model
+            For a complete list, visit: https://huggingface.co/models
+
+        max_length (int, optional): The maximum length of the generated text in tokens.
+            Defaults to 100. This parameter helps control the length of the model's
+            output and manage computational resources.
+
+    Returns:
+        str: The generated text output from the model. The exact format depends on
+            the model being used, but typically includes:
+            - For text generation: The completed text based on the input prompt
+            - For question answering: The answer to the provided question
+            - For other tasks: Task-specific output in text format
+
+    Examples:
+        >>> # Generate text with GPT-2
+        >>> result = call_huggingface_model(
+        ...     task="Once upon a time",
+        ...     model_id="gpt2",
+        ...     max_length=50
+        ... )
+        >>> print(result)
+
+        >>> # Use a larger model for more complex tasks
+        >>> answer = call_huggingface_model(
+        ...     task="What is quantum computing?",
+        ...     model_id="facebook/opt-1.3b",
+        ...     max_length=200
+        ... )
+        >>> print(answer)
+
+    Notes:
+        - The first call for a model loads its weights; later calls reuse the cached
+          model until it is evicted by the registry's memory budget.
+        - Concurrent calls for the same model are coalesced into batched forward
+          passes by HuggingFaceBatcher.
+        - The model is automatically placed on GPU if available, falling back to CPU.
+        - Error handling is managed by the underlying HuggingFaceAPI class.
+        - The actual output length may be shorter than max_length depending on the
+          model's generation parameters and stopping criteria.
+
+    Raises:
+        Exception: Any exceptions from model loading or generation are caught by
+            HuggingFaceAPI and returned as error messages in the output string.
+    """
+    print(f"◢ HUGGINGFACE MODEL: Initializing {model_id}")
+    model = get_model_registry().get(
+        model_id=model_id,
+        task_type="text-generation",
+        max_length=max_length,
+    )
+    # Concurrent calls for the same model share forward passes
+    result = model.get_batcher().generate(task, max_length=max_length)
+    print(f"◢ HUGGINGFACE MODEL: Generated {len(result)} characters")
+    return result
+
+
+def _serialize_terminal_message(msg: Any) -> Dict[str, Any]:
+    """Convert a Claude Code SDK message into a plain dict."""
+    try:
+        # Try to get message attributes
+        msg_dict = {
+            "type": (msg.type if hasattr(msg, "type") else None),
+            "content": (
+                msg.content if hasattr(msg, "content") else None
+            ),
+            "role": (msg.role if hasattr(msg, "role") else None),
+            "metadata": (
+                msg.metadata if hasattr(msg, "metadata") else None
+            ),
+        }
+        # Remove None values
+        return {k: v for k, v in msg_dict.items() if v is not None}
+    except Exception as e:
+        logger.error(f"Error serializing message: {e}")
+        # Include basic string representation if serialization fails
+        return {"content": str(msg)}
+
+
+async def stream_terminal_developer_agent_async(
+    task: str,
+    max_turns: int = 3,
+    system_prompt: str = "You are a helpful assistant",
+    cwd: str = None,
+    allowed_tools: list = None,
+    permission_mode: str = "acceptEdits",
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream the Claude Code terminal developer agent's messages as they arrive.
+
+    Each message is serialized and yielded as soon as the SDK produces it, so
+    callers can render progress during a multi-turn session and nothing is
+    retained once a message has been consumed.
+
+    Args:
+        task (str): The prompt or task to send to the agent.
+        max_turns (int): Maximum number of conversational turns. Default is 3.
+        system_prompt (str): System prompt for the agent. Default is a helpful assistant.
+        cwd (str, optional): Working directory for the agent. Default is None.
+        allowed_tools (list, optional): List of allowed tools. Default is ["Read", "Write", "Bash"].
+        permission_mode (str): Permission mode for the agent. Default is "acceptEdits".
+
+    Yields:
+        dict: A serialized Message with its ``type``, ``content``, ``role`` and
+            ``metadata`` fields (fields the message lacks are omitted).
+
+    Example:
+        >>> async for message in stream_terminal_developer_agent_async("List the files"):
+        ...     print(message.get("content"))
+    """
+
+    # if allowed_tools is None:
+    allowed_tools = ["Read", "Write", "Bash"]
+
+    from claude_code_sdk import ClaudeCodeOptions, query
+
+    options = ClaudeCodeOptions(
+        max_turns=max_turns,
+        system_prompt=system_prompt,
+        cwd=Path(cwd) if cwd else None,
+        allowed_tools=allowed_tools,
+        permission_mode=permission_mode,
+    )
+    async for message in query(prompt=task, options=options):
+        logger.info(
+            f"Claude Code Terminal Developer Agent Message: {message}"
+        )
+        yield _serialize_terminal_message(message)
+
+
+def stream_terminal_developer_agent(
+    task: str,
+    max_turns: int = 3,
+    system_prompt: str = "You are a helpful assistant",
+    cwd: str = None,
+    allowed_tools: list = None,
+    permission_mode: str = "acceptEdits",
+    max_buffered: int = 8,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Synchronous iterator over the terminal developer agent's messages.
+
+    The session runs as a single task on the shared background event loop and
+    hands messages over as they arrive. At most ``max_buffered`` messages wait
+    for the caller before the session is paused. Stopping iteration early
+    (``break`` or closing the iterator) cancels the agent session.
+
+    Args:
+        task (str): The prompt or task to send to the agent.
+        max_turns (int): Maximum number of conversational turns. Default is 3.
+        system_prompt (str): System prompt for the agent. Default is a helpful assistant.
+        cwd (str, optional): Working directory for the agent. Default is None.
+        allowed_tools (list, optional): List of allowed tools. Default is ["Read", "Write", "Bash"].
+        permission_mode (str): Permission mode for the agent. Default is "acceptEdits".
+        max_buffered (int): Messages buffered ahead of the caller. Default is 8.
+
+    Yields:
+        dict: A serialized Message, as in `stream_terminal_developer_agent_async`.
+
+    Example:
+        >>> for message in stream_terminal_developer_agent("Create hello.py"):
+        ...     dashboard.append_output(str(message.get("content")))
+    """
+    runner = get_event_loop_runner()
+    messages: "queue.Queue" = queue.Queue()
+    credits = asyncio.Semaphore(max(1, max_buffered))
+    done = object()
+
+    # The SDK's task groups must be entered and exited by the same task, so
+    # one task drives the whole stream instead of one task per message
+    async def pump():
+        try:
+            async for (
+                message
+            ) in stream_terminal_developer_agent_async(
+                task=task,
+                max_turns=max_turns,
+                system_prompt=system_prompt,
+                cwd=cwd,
+                allowed_tools=allowed_tools,
+                permission_mode=permission_mode,
+            ):
+                await credits.acquire()
+                messages.put(message)
+        except Exception as e:
+            messages.put(e)
+        else:
+            messages.put(done)
+
+    future = runner.submit(pump())
+    try:
+        while True:
+            message = messages.get()
+            if message is done:
+                return
+            if isinstance(message, Exception):
+                raise message
+            runner.loop.call_soon_threadsafe(credits.release)
+            yield message
+    finally:
+        future.cancel()
+
+
+async def call_terminal_developer_agent_async(
+    task: str,
+    max_turns: int = 3,
+    system_prompt: str = "You are a helpful assistant",
+    cwd: str = None,
+    allowed_tools: list = None,
+    permission_mode: str = "acceptEdits",
+):
+    """
+    Call the Claude Code terminal developer agent with the specified parameters.
+
+    Args:
+        task (str): The prompt or task to send to the agent.
+        max_turns (int): Maximum number of conversational turns. Default is 3.
+        system_prompt (str): System prompt for the agent. Default is a helpful assistant.
+        cwd (str, optional): Working directory for the agent. Default is None.
+        allowed_tools (list, optional): List of allowed tools. Default is ["Read", "Write", "Bash"].
+        permission_mode (str): Permission mode for the agent. Default is "acceptEdits".
+
+    Returns:
+        list: List of serialized Message objects returned by the agent.
+    """
+    serialized_messages = [
+        message
+        async for message in stream_terminal_developer_agent_async(
+            task=task,
+            max_turns=max_turns,
+            system_prompt=system_prompt,
+            cwd=cwd,
+            allowed_tools=allowed_tools,
+            permission_mode=permission_mode,
+        )
+    ]
+
+    return json.dumps(serialized_messages, indent=2)
+
+
+def call_terminal_developer_agent(
+    task: str,
+    max_turns: int = 3,
+    system_prompt: str = "You are a helpful assistant",
+    cwd: str = None,
+    allowed_tools: list = None,
+    permission_mode: str = "acceptEdits",
 ) -> str:
     """
     Call the Claude Code terminal developer agent with the specified parameters. This Terminal developer agent
@@ -506,16 +1540,15 @@ def call_terminal_developer_agent(
         >>> print(messages)  # Returns JSON string of messages
 
     Notes:
-        - This function uses asyncio.run() internally to run the async version
+        - The async version runs on the shared background event loop, so this also works
+          when called from inside a running event loop
         - The function blocks until the agent completes its task or reaches max_turns
         - All exceptions from the async version are propagated to the caller
         - The returned messages can be used to track the agent's actions and reasoning
     """
-    import json
-
     print("◢ TERMINAL DEVELOPER AGENT: Starting task execution")
     logger.info(f"Calling terminal developer agent with task: {task}")
-    output = asyncio.run(
+    output = get_event_loop_runner().run(
         call_terminal_developer_agent_async(
             task=task,
             max_turns=max_turns,
@@ -526,7 +1559,8 @@ def call_terminal_developer_agent(
         )
     )
     print("◢ TERMINAL DEVELOPER AGENT: Task completed")
-    return json.dumps(output, indent=2)
+    # The async call already returns the JSON document
+    return output
 
 
 def list_models_on_litellm():
@@ -568,7 +1602,9 @@ def generate_speech(
     Generate speech audio from text using a specified voice and model.
 
     This function converts the provided text into speech using the OpenAI TTS API (or any compatible model via LiteLLM).
-    It saves the generated audio to the specified file path.
+    It saves the generated audio to the specified file path inside the workspace/audio directory.
+    Long text is split on sentence boundaries and the pieces are synthesized in parallel, then joined
+    in order into one audio file; pieces synthesized before are reused from a cache.
 
     Example usage:
         >>> audio_path = generate_speech(
@@ -580,119 +1616,663 @@ def generate_speech(
         >>> print(f"Audio saved at: {audio_path}")
 
     Args:
-        text (str): The text to be converted into speech.
-        voice (str, optional): The voice to use for speech synthesis. Defaults to "alloy".
-        model (str, optional): The speech synthesis model to use. Defaults to "openai/tts-1".
-        file_path (str, optional): The path where the generated audio file will be saved. Defaults to "speech.mp3".
+        text (str): The text to be converted into speech.
+        voice (str, optional): The voice to use for speech synthesis. Defaults to "alloy".
+        model (str, optional): The speech synthesis model to use. Defaults to "openai/tts-1".
+        file_path (str, optional): The path, relative to the workspace/audio directory, where the
+            generated audio file will be saved. Defaults to "speech.mp3".
+
+    Returns:
+        Path: The path to the generated speech audio file.
+
+    Notes for the model:
+        - You can use this function to generate speech from any text output.
+        - If a user requests audio output, call this function with the desired text.
+        - The function supports different voices and models if available.
+        - The resulting audio file can be played back or sent to the user.
+        - Long texts are fine; there is no need to split them into several calls.
+
+    """
+    return get_speech_synthesizer().synthesize(
+        text, voice, model, file_path
+    )
+
+
+def call_models_on_litellm(
+    model_name: str,
+    task: str,
+    temperature: float = 0.5,
+    max_tokens: Optional[int] = None,
+):
+    """
+    Call various LLM models through litellm's unified interface with automatic token management.
+
+    This function provides a standardized way to interact with multiple LLM providers and models
+    through litellm's abstraction layer. It automatically handles token limits and provides a
+    consistent interface across different model providers.
+
+    Available Models:
+
+    Anthropic Claude Models:
+        - 'claude-opus-4-20250514': Latest Claude Opus model (most capable)
+        - 'claude-sonnet-4-20250514': Latest Claude Sonnet model (balanced)
+        - 'claude-3-7-sonnet-20250219': Claude 3.7 Sonnet
+        - 'claude-3-5-sonnet-20240620': Claude 3.5 Sonnet
+        - 'claude-3-haiku-20240307': Claude 3 Haiku (fastest)
+        - 'claude-3-opus-20240229': Claude 3 Opus
+        - 'claude-3-sonnet-20240229': Claude 3 Sonnet
+        - 'claude-2.1': Legacy Claude 2.1
+        - 'claude-2': Legacy Claude 2
+        - 'claude-instant-1.2': Legacy Claude Instant 1.2
+        - 'claude-instant-1': Legacy Claude Instant 1
+
+    OpenAI GPT Models:
+
+    Other Models:
+        - 'gpt-4o-mini': GPT-4 Optimized Mini variant
+        - 'gpt-4o': GPT-4 Optimized
+        - 'gpt-4.1': GPT-4.1 (latest)
+
+    Args:
+        model_name (str): The identifier for the model to use. Must be one of the supported
+            model names listed above.
+        task (str): The task or prompt to send to the model.
+        temperature (float, optional): Controls randomness in the model's output.
+            Ranges from 0.0 (deterministic) to 1.0 (creative). Defaults to 0.5.
+        max_tokens (int, optional): Most tokens the answer may use. Defaults to
+            LLM_DEFAULT_MAX_TOKENS (4096), capped by the model's limits.
+        system_prompt (str, optional): A system-level prompt to guide the model's behavior.
+            If None, no system prompt is used.
+
+    Returns:
+        str: The model's response text.
+
+    Examples:
+        >>> # Using Claude 3 Opus for complex reasoning
+        >>> response = call_models_on_litellm(
+        ...     model_name="claude-3-opus-20240229",
+        ...     task="Explain quantum computing to a high school student",
+        ...     temperature=0.7,
+        ...     system_prompt="You are a helpful physics teacher"
+        ... )
+        >>> print(response)
+
+        >>> # Using GPT-4 for code generation
+        >>> code = call_models_on_litellm(
+        ...     model_name="gpt-4",
+        ...     task="Write a Python function to calculate Fibonacci numbers",
+        ...     temperature=0.2
+        ... )
+        >>> print(code)
+
+    Notes:
+        - max_tokens is right-sized from the caller's budget, the model's limits (looked up
+          once per process) and the prompt length, see `ModelCapabilityRegistry`
+        - The function uses litellm's completion endpoint which provides a unified interface
+        - System prompts can help guide the model's behavior and role
+        - Temperature values closer to 0 are better for tasks requiring accuracy
+        - Temperature values closer to 1 are better for creative tasks
+        - Identical requests can be served from the opt-in response cache, see
+          `configure_litellm_cache`
+    """
+    from litellm import completion
+
+    request = _litellm_request(
+        model_name, task, temperature, max_tokens
+    )
+    cache, key = _litellm_cache_entry(request)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    response = completion(**request)
+    content = response.choices[0].message.content
+
+    if cache is not None and content is not None:
+        cache.set(key, content)
+    return content
+
+
+async def acall_models_on_litellm(
+    model_name: str,
+    task: str,
+    temperature: float = 0.5,
+    max_tokens: Optional[int] = None,
+) -> str:
+    """
+    Asynchronous version of `call_models_on_litellm` built on LiteLLM's `acompletion`.
+
+    The request is awaited on the caller's event loop instead of blocking a thread,
+    so many calls can be in flight at once.
+
+    Args:
+        model_name (str): The identifier for the model to use.
+        task (str): The task or prompt to send to the model.
+        temperature (float, optional): Controls randomness in the model's output.
+            Defaults to 0.5.
+        max_tokens (int, optional): Most tokens the answer may use; see
+            `call_models_on_litellm`.
+
+    Returns:
+        str: The model's response text.
+
+    Example:
+        >>> response = await acall_models_on_litellm("gpt-4o-mini", "Say hi")
+    """
+    from litellm import acompletion
+
+    request = _litellm_request(
+        model_name, task, temperature, max_tokens
+    )
+    cache, key = _litellm_cache_entry(request)
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return cached
+
+    response = await acompletion(**request)
+    content = response.choices[0].message.content
+
+    if cache is not None and content is not None:
+        await asyncio.to_thread(cache.set, key, content)
+    return content
+
+
+class TokenStream:
+    """
+    Iterator over the text chunks of a streamed generation that records latency.
+
+    Wraps a sync or async source of chunks (LiteLLM streaming chunks or plain
+    strings) and yields their text as it arrives. Iterate it with ``for`` when
+    the source is synchronous and with ``async for`` when it is asynchronous.
+    Each stream can be consumed once.
+
+    Attributes:
+        label (str): Name used in log messages
+        time_to_first_token (float, optional): Seconds from the request until the
+            first non-empty chunk, or None before it arrives
+        elapsed (float, optional): Seconds from the request until the stream
+            ended, or None while it is running
+        text (str): Everything received so far
+
+    Example:
+        >>> stream = stream_models_on_litellm("gpt-4o-mini", "Write a haiku")
+        >>> for chunk in stream:
+        ...     print(chunk, end="", flush=True)
+        >>> stream.time_to_first_token
+        0.41
+    """
+
+    def __init__(
+        self,
+        chunks: Any,
+        started: Optional[float] = None,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        on_complete: Optional[Callable[[str], None]] = None,
+        label: str = "LITELLM",
+    ):
+        self._chunks = chunks
+        self.started = (
+            started if started is not None else time.perf_counter()
+        )
+        self.on_chunk = on_chunk
+        self.on_complete = on_complete
+        self.label = label
+        self.time_to_first_token: Optional[float] = None
+        self.elapsed: Optional[float] = None
+        self._parts: List[str] = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    @staticmethod
+    def _chunk_text(chunk: Any) -> Optional[str]:
+        if isinstance(chunk, str):
+            return chunk
+        choices = getattr(chunk, "choices", None)
+        if not choices:
+            return None
+        delta = getattr(choices[0], "delta", None)
+        return getattr(delta, "content", None)
+
+    def _handle(self, chunk: Any) -> Optional[str]:
+        text = self._chunk_text(chunk)
+        if not text:
+            return None
+        if self.time_to_first_token is None:
+            self.time_to_first_token = (
+                time.perf_counter() - self.started
+            )
+            logger.info(
+                f"{self.label}: first token after "
+                f"{self.time_to_first_token:.3f}s"
+            )
+        self._parts.append(text)
+        if self.on_chunk is not None:
+            self.on_chunk(text)
+        return text
+
+    def _finish(self) -> None:
+        self.elapsed = time.perf_counter() - self.started
+        logger.info(
+            f"{self.label}: stream finished after {self.elapsed:.3f}s"
+        )
+        if self.on_complete is not None:
+            self.on_complete(self.text)
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self._chunks:
+            text = self._handle(chunk)
+            if text:
+                yield text
+        self._finish()
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._aiter()
+
+    async def _aiter(self) -> AsyncIterator[str]:
+        async for chunk in self._chunks:
+            text = self._handle(chunk)
+            if text:
+                yield text
+        self._finish()
+
+
+def stream_models_on_litellm(
+    model_name: str,
+    task: str,
+    temperature: float = 0.5,
+    max_tokens: Optional[int] = None,
+    on_chunk: Optional[Callable[[str], None]] = None,
+) -> TokenStream:
+    """
+    Streaming version of `call_models_on_litellm`.
+
+    The request is sent immediately and the returned stream yields text chunks
+    as the provider produces them, so the first words can be shown long before
+    the full completion is done. Cached responses (see `configure_litellm_cache`)
+    are replayed as a single chunk, and completed streams are stored in the cache.
+
+    Args:
+        model_name (str): The identifier for the model to use.
+        task (str): The task or prompt to send to the model.
+        temperature (float, optional): Controls randomness in the model's output.
+            Defaults to 0.5.
+        max_tokens (int, optional): Most tokens the answer may use; see
+            `call_models_on_litellm`.
+        on_chunk (Callable[[str], None], optional): Called with every chunk, e.g.
+            ``lambda chunk: dashboard.append_output(chunk, newline=False)``.
 
     Returns:
-        Path: The path to the generated speech audio file.
-
-    Notes for the model:
-        - You can use this function to generate speech from any text output.
-        - If a user requests audio output, call this function with the desired text.
-        - The function supports different voices and models if available.
-        - The resulting audio file can be played back or sent to the user.
+        TokenStream: Iterate it for the text chunks; its ``time_to_first_token``,
+            ``elapsed`` and ``text`` attributes are filled in as it is consumed.
 
+    Example:
+        >>> stream = stream_models_on_litellm("gpt-4o-mini", "Explain RAG")
+        >>> answer = "".join(stream)
+        >>> print(f"TTFT: {stream.time_to_first_token:.2f}s")
     """
+    from litellm import completion
 
-    speech_file_path = Path(__file__).parent / file_path
-    response = speech(
-        model=model,
-        voice=voice,
-        input=text,
+    started = time.perf_counter()
+    request = _litellm_request(
+        model_name, task, temperature, max_tokens
+    )
+    cache, key = _litellm_cache_entry(request)
+    on_complete = None
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return TokenStream([cached], started, on_chunk)
+        on_complete = _cache_stream(cache, key)
+
+    return TokenStream(
+        completion(**request, stream=True),
+        started,
+        on_chunk,
+        on_complete,
     )
-    response.stream_to_file(speech_file_path)
-    return speech_file_path
 
 
-def call_models_on_litellm(
+async def astream_models_on_litellm(
     model_name: str,
     task: str,
     temperature: float = 0.5,
-):
+    max_tokens: Optional[int] = None,
+    on_chunk: Optional[Callable[[str], None]] = None,
+) -> TokenStream:
     """
-    Call various LLM models through litellm's unified interface with automatic token management.
+    Asynchronous version of `stream_models_on_litellm` built on `acompletion`.
 
-    This function provides a standardized way to interact with multiple LLM providers and models
-    through litellm's abstraction layer. It automatically handles token limits and provides a
-    consistent interface across different model providers.
+    Args:
+        model_name (str): The identifier for the model to use.
+        task (str): The task or prompt to send to the model.
+        temperature (float, optional): Controls randomness in the model's output.
+            Defaults to 0.5.
+        max_tokens (int, optional): Most tokens the answer may use; see
+            `call_models_on_litellm`.
+        on_chunk (Callable[[str], None], optional): Called with every chunk.
 
-    Available Models:
+    Returns:
+        TokenStream: Iterate it with ``async for`` for the text chunks.
 
-    Anthropic Claude Models:
-        - 'claude-opus-4-20250514': Latest Claude Opus model (most capable)
-        - 'claude-sonnet-4-20250514': Latest Claude Sonnet model (balanced)
-        - 'claude-3-7-sonnet-20250219': Claude 3.7 Sonnet
-        - 'claude-3-5-sonnet-20240620': Claude 3.5 Sonnet
-        - 'claude-3-haiku-20240307': Claude 3 Haiku (fastest)
-        - 'claude-3-opus-20240229': Claude 3 Opus
-        - 'claude-3-sonnet-20240229': Claude 3 Sonnet
-        - 'claude-2.1': Legacy Claude 2.1
-        - 'claude-2': Legacy Claude 2
-        - 'claude-instant-1.2': Legacy Claude Instant 1.2
-        - 'claude-instant-1': Legacy Claude Instant 1
+    Example:
+        >>> stream = await astream_models_on_litellm("gpt-4o-mini", "Explain RAG")
+        >>> async for chunk in stream:
+        ...     print(chunk, end="")
+    """
+    from litellm import acompletion
 
-    OpenAI GPT Models:
+    started = time.perf_counter()
+    request = _litellm_request(
+        model_name, task, temperature, max_tokens
+    )
+    cache, key = _litellm_cache_entry(request)
+    on_complete = None
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+
+            async def replay():
+                yield cached
+
+            return TokenStream(replay(), started, on_chunk)
+        on_complete = _cache_stream(cache, key)
+
+    return TokenStream(
+        await acompletion(**request, stream=True),
+        started,
+        on_chunk,
+        on_complete,
+    )
 
-    Other Models:
-        - 'gpt-4o-mini': GPT-4 Optimized Mini variant
-        - 'gpt-4o': GPT-4 Optimized
-        - 'gpt-4.1': GPT-4.1 (latest)
+
+_litellm_cache: Optional[ResponseCache] = None
+_litellm_cache_configured = False
+_litellm_cache_allow_sampling = False
+_litellm_cache_lock = threading.RLock()
+
+
+def configure_litellm_cache(
+    enabled: bool = True,
+    maxsize: int = 1024,
+    ttl: Optional[float] = 3600.0,
+    path: Optional[str] = None,
+    allow_sampling: bool = False,
+) -> Optional[ResponseCache]:
+    """
+    Enable, reconfigure or disable the LiteLLM response cache.
+
+    The cache is off unless this function is called or the
+    ``LLM_RESPONSE_CACHE`` environment variable is set to ``1``
+    (``LLM_RESPONSE_CACHE_SIZE``, ``LLM_RESPONSE_CACHE_TTL``,
+    ``LLM_RESPONSE_CACHE_PATH`` and ``LLM_RESPONSE_CACHE_ALLOW_SAMPLING``
+    set the other options). Only requests with ``temperature == 0`` are cached
+    by default, since sampled responses are expected to differ between calls.
 
     Args:
-        model_name (str): The identifier for the model to use. Must be one of the supported
-            model names listed above.
-        task (str): The task or prompt to send to the model.
-        temperature (float, optional): Controls randomness in the model's output.
-            Ranges from 0.0 (deterministic) to 1.0 (creative). Defaults to 0.5.
-        system_prompt (str, optional): A system-level prompt to guide the model's behavior.
-            If None, no system prompt is used.
+        enabled (bool): Whether responses are cached at all.
+        maxsize (int): Maximum number of responses kept in memory.
+        ttl (float, optional): Seconds a response stays valid; None keeps it forever.
+        path (str, optional): SQLite file used as a persistent second level.
+        allow_sampling (bool): Also cache requests with ``temperature > 0``.
 
     Returns:
-        str: The model's response text.
+        ResponseCache: The active cache, or None when disabled.
 
-    Examples:
-        >>> # Using Claude 3 Opus for complex reasoning
-        >>> response = call_models_on_litellm(
-        ...     model_name="claude-3-opus-20240229",
-        ...     task="Explain quantum computing to a high school student",
-        ...     temperature=0.7,
-        ...     system_prompt="You are a helpful physics teacher"
-        ... )
-        >>> print(response)
+    Example:
+        >>> cache = configure_litellm_cache(ttl=600, path="agent_workspace/llm_cache.db")
+        >>> call_models_on_litellm("gpt-4o-mini", "Plan the next step", temperature=0)
+        >>> cache.stats()["misses"]
+        1
+    """
+    global _litellm_cache, _litellm_cache_configured
+    global _litellm_cache_allow_sampling
+    with _litellm_cache_lock:
+        if _litellm_cache is not None:
+            _litellm_cache.close()
+        _litellm_cache = (
+            ResponseCache(maxsize=maxsize, ttl=ttl, path=path)
+            if enabled
+            else None
+        )
+        _litellm_cache_allow_sampling = allow_sampling
+        _litellm_cache_configured = True
+        return _litellm_cache
+
+
+def get_litellm_cache() -> Optional[ResponseCache]:
+    """Return the LiteLLM response cache, or None when it is disabled."""
+    with _litellm_cache_lock:
+        if not _litellm_cache_configured:
+            ttl = os.getenv("LLM_RESPONSE_CACHE_TTL", "3600")
+            configure_litellm_cache(
+                enabled=os.getenv("LLM_RESPONSE_CACHE") == "1",
+                maxsize=int(
+                    os.getenv("LLM_RESPONSE_CACHE_SIZE", "1024")
+                ),
+                ttl=float(ttl) if ttl else None,
+                path=os.getenv("LLM_RESPONSE_CACHE_PATH") or None,
+                allow_sampling=os.getenv(
+                    "LLM_RESPONSE_CACHE_ALLOW_SAMPLING"
+                )
+                == "1",
+            )
+        return _litellm_cache
 
-        >>> # Using GPT-4 for code generation
-        >>> code = call_models_on_litellm(
-        ...     model_name="gpt-4",
-        ...     task="Write a Python function to calculate Fibonacci numbers",
-        ...     temperature=0.2
-        ... )
-        >>> print(code)
 
-    Notes:
-        - Token limits are automatically handled by litellm based on the model's capabilities
-        - The function uses litellm's completion endpoint which provides a unified interface
-        - System prompts can help guide the model's behavior and role
-        - Temperature values closer to 0 are better for tasks requiring accuracy
-        - Temperature values closer to 1 are better for creative tasks
+def _cache_stream(
+    cache: ResponseCache, key: str
+) -> Callable[[str], None]:
+    """Return an ``on_complete`` callback that stores a finished stream."""
+
+    def store(text: str) -> None:
+        # A stream that ended without any text was cut off, not answered
+        if text:
+            cache.set(key, text)
+
+    return store
+
+
+def _litellm_cache_entry(request: Dict[str, Any]) -> tuple:
     """
-    from litellm.utils import get_max_tokens
+    Return ``(cache, key)`` for a LiteLLM request, or ``(None, None)``.
 
-    max_llm_tokens = get_max_tokens(model_name)
+    The key is built from the request with surrounding whitespace removed from
+    the model name and message contents, so trivially different prompts share
+    an entry. Requests that may not be cached are counted as bypassed.
+    """
+    cache = get_litellm_cache()
+    if cache is None:
+        return None, None
+    if (
+        request["temperature"] > 0
+        and not _litellm_cache_allow_sampling
+    ):
+        cache.record_bypass()
+        return None, None
 
-    response = completion(
-        model=model_name,
+    normalized = dict(
+        request,
+        model=request["model"].strip(),
         messages=[
-            # {"role": "system", "content": system_prompt},
-            {"role": "user", "content": task},
+            dict(message, content=message["content"].strip())
+            for message in request["messages"]
         ],
-        temperature=temperature,
-        max_tokens=max_llm_tokens,
-        top_p=1,
     )
+    return cache, cache.make_key(normalized)
+
+
+class ModelCapabilityRegistry:
+    """
+    A process-wide memo of LiteLLM model limits used to right-size ``max_tokens``.
+
+    Looking a model up in LiteLLM's model map on every call is wasted work, and
+    asking for a model's full output limit makes providers reserve far more
+    output than most answers need, which slows queueing and raises cost. The
+    registry looks each model up once and derives ``max_tokens`` from a caller
+    budget (``default_output_tokens`` when none is given), the model's output
+    limit and the room the prompt leaves in the context window.
+
+    Attributes:
+        default_output_tokens (int): Budget used when the caller gives none
+        safety_margin (int): Tokens kept free in the context window
+        lookups (int): Number of model map lookups performed
+
+    Example:
+        >>> registry = get_capability_registry()
+        >>> registry.limits("gpt-4o-mini")["max_output_tokens"]
+        16384
+        >>> registry.max_tokens("gpt-4o-mini", [{"role": "user", "content": "Hi"}], budget=256)
+        256
+    """
+
+    def __init__(
+        self,
+        default_output_tokens: Optional[int] = None,
+        safety_margin: int = 64,
+    ):
+        self.default_output_tokens = default_output_tokens or int(
+            os.getenv("LLM_DEFAULT_MAX_TOKENS", "4096")
+        )
+        self.safety_margin = safety_margin
+        self.lookups = 0
+        self._limits: Dict[str, Dict[str, Optional[int]]] = {}
+        self._lock = threading.Lock()
+
+    def limits(self, model_name: str) -> Dict[str, Optional[int]]:
+        """
+        Return the model's ``max_input_tokens`` and ``max_output_tokens``.
+
+        Limits LiteLLM does not know are None. Results, including unknown
+        models, are cached for the life of the process.
+        """
+        with self._lock:
+            limits = self._limits.get(model_name)
+        if limits is not None:
+            return limits
+
+        limits = {"max_input_tokens": None, "max_output_tokens": None}
+        try:
+            from litellm import get_model_info
+
+            info = get_model_info(model_name)
+            limits = {
+                # max_tokens is LiteLLM's legacy output limit, not the
+                # context window
+                "max_input_tokens": info.get("max_input_tokens"),
+                "max_output_tokens": info.get("max_output_tokens")
+                or info.get("max_tokens"),
+            }
+        except Exception as e:
+            logger.warning(
+                f"No capability information for model {model_name}: {e}"
+            )
+
+        with self._lock:
+            self.lookups += 1
+            return self._limits.setdefault(model_name, limits)
+
+    @staticmethod
+    def count_prompt_tokens(
+        model_name: str, messages: List[Dict[str, Any]]
+    ) -> int:
+        """Count the prompt tokens of ``messages`` with the model's tokenizer."""
+        try:
+            from litellm import token_counter
+
+            return token_counter(model=model_name, messages=messages)
+        except Exception:
+            # Roughly four characters per token plus per-message overhead
+            chars = sum(
+                len(str(message.get("content") or ""))
+                for message in messages
+            )
+            return chars // 4 + 4 * len(messages)
+
+    def max_tokens(
+        self,
+        model_name: str,
+        messages: List[Dict[str, Any]],
+        budget: Optional[int] = None,
+    ) -> int:
+        """
+        Compute ``max_tokens`` for a request.
 
-    return response.choices[0].message.content
+        Args:
+            model_name (str): The LiteLLM model identifier.
+            messages (List[Dict[str, Any]]): The request's chat messages.
+            budget (int, optional): Most output tokens the caller wants; defaults
+                to ``default_output_tokens``.
+
+        Returns:
+            int: The budget, capped by the model's output limit and by the room
+                left in its context window after the prompt.
+        """
+        limits = self.limits(model_name)
+        max_tokens = budget or self.default_output_tokens
+        if limits["max_output_tokens"]:
+            max_tokens = min(max_tokens, limits["max_output_tokens"])
+
+        context = limits["max_input_tokens"]
+        if context:
+            available = context - self.safety_margin - max_tokens
+            # A token covers at least one character, so prompts with fewer
+            # characters than the free room need not be tokenized
+            chars = sum(
+                len(str(message.get("content") or "")) + 8
+                for message in messages
+            )
+            if chars > available:
+                room = (
+                    context
+                    - self.safety_margin
+                    - self.count_prompt_tokens(model_name, messages)
+                )
+                max_tokens = max(1, min(max_tokens, room))
+        return max_tokens
+
+    def clear(self) -> None:
+        """Forget every cached model."""
+        with self._lock:
+            self._limits.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of cached models and lookups performed."""
+        return {"models": len(self._limits), "lookups": self.lookups}
+
+
+_capability_registry = ModelCapabilityRegistry()
+
+
+def get_capability_registry() -> ModelCapabilityRegistry:
+    """Return the process-wide ModelCapabilityRegistry."""
+    return _capability_registry
+
+
+def _litellm_request(
+    model_name: str,
+    task: str,
+    temperature: float,
+    max_tokens: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Build the keyword arguments shared by the LiteLLM completion calls."""
+    messages = [
+        # {"role": "system", "content": system_prompt},
+        {"role": "user", "content": task},
+    ]
+
+    return {
+        "model": model_name,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": get_capability_registry().max_tokens(
+            model_name, messages, budget=max_tokens
+        ),
+        "top_p": 1,
+    }
 
 
 def safe_calculator(expression: str) -> str:
@@ -731,47 +2311,53 @@ def safe_calculator(expression: str) -> str:
         >>> safe_calculator("import os")
         'Error: Invalid expression'
     """
-    # List of allowed characters
-    allowed_chars = set("0123456789.+-*/(). %")
-    # Remove all whitespace
-    expression = "".join(expression.split())
-
-    # Check if expression only contains allowed characters
-    if not all(c in allowed_chars for c in expression):
-        return "Error: Invalid expression - only basic mathematical operations are allowed"
-
     try:
-        # Additional security check for potentially dangerous expressions
-        if any(
-            keyword in expression.lower()
-            for keyword in ["eval", "exec", "import", "__"]
-        ):
-            return "Error: Invalid expression"
-
-        # Evaluate the expression
-        result = eval(expression, {"__builtins__": {}}, {})
-
-        # Format the result
-        if isinstance(result, (int, float)):
-            # Handle very large or very small numbers
-            if abs(result) > 1e15 or (
-                abs(result) < 1e-15 and result != 0
-            ):
-                return f"{result:.2e}"
-            # For regular floats, limit decimal places
-            elif isinstance(result, float):
-                return f"{result:.6f}".rstrip("0").rstrip(".")
-            return str(result)
-        return "Error: Invalid result type"
-
+        return format_result(compile_expression(expression.strip())())
     except ZeroDivisionError:
         return "Error: Division by zero"
-    except (SyntaxError, NameError, TypeError):
-        return "Error: Invalid expression"
+    except OverflowError:
+        return "Error: Result too large"
+    except CalculatorError as e:
+        return f"Error: {str(e)}"
     except Exception as e:
         return f"Error: {str(e)}"
 
 
+def safe_calculator_batch(
+    expression: str, variables: Dict[str, List[float]]
+) -> List[float]:
+    """
+    Evaluate one formula over many sets of variable values.
+
+    The formula is compiled once and evaluated for every binding in a single vectorized
+    NumPy pass, or in a pure Python loop with the same results when the optional
+    ``numpy`` extra is not installed. It accepts the same operations as safe_calculator plus variables, the
+    constants ``pi`` and ``e`` and the functions abs, sqrt, exp, log, log10, sin, cos, tan,
+    floor and ceil. Division by zero yields ``inf`` or ``nan`` for that binding.
+
+    Args:
+        expression (str): The formula, e.g. "price * quantity * (1 - discount)".
+        variables (Dict[str, List[float]]): The values of each variable; all lists must
+            have the same length, and single numbers apply to every binding.
+
+    Returns:
+        List[float]: One result per binding.
+
+    Raises:
+        CalculatorError: If the formula is invalid, uses an unknown or non-numeric
+            variable or exceeds the size limits.
+
+    Example:
+        >>> safe_calculator_batch(
+        ...     "price * quantity", {"price": [2.0, 3.5], "quantity": [10, 4]}
+        ... )
+        [20.0, 14.0]
+    """
+    return compile_expression(expression.strip()).evaluate_many(
+        variables
+    )
+
+
 def process_video_with_gemini(
     video_path: str = None,
     task: str = "Create a detailed and comprehensive summary of the video",
@@ -797,8 +2383,7 @@ def process_video_with_gemini(
             Defaults to "gemini-2.0-flash".
 
     Returns:
-        None: The function prints the model's response directly to stdout.
-            Future versions may return the response instead of printing.
+        str: The model's analysis of the video.
 
     Example:
         >>> process_video_with_gemini(
@@ -806,25 +2391,89 @@ def process_video_with_gemini(
         ...     task="Identify all people and their actions in the video",
         ...     model_name="gemini-2.0-flash"
         ... )
+        'The video shows ...'
 
     Notes:
-        - Requires the 'google.generativeai' package to be installed
+        - Requires the 'google-genai' package to be installed
         - Needs proper authentication set up for Google's API
         - Video file size and format limitations apply based on Gemini's constraints
         - Processing time depends on video length and complexity
-        - The model's response is printed to stdout (may be changed in future versions)
+        - A video is uploaded once per content and the upload is reused until it expires;
+          use ask_video_questions to ask several questions about the same video
     """
-    from google import genai
+    return get_gemini_file_cache().generate(
+        video_path, task, model_name
+    )
+
+
+def process_long_video_with_gemini(
+    video_path: str,
+    task: str = "Create a detailed and comprehensive summary of the video",
+    model_name: str = "gemini-2.0-flash",
+    segment_seconds: Optional[float] = None,
+) -> str:
+    """
+    Analyze a long video with Google's Gemini model in parallel segments.
+
+    The video is split into time windows with ffmpeg, the windows are analyzed concurrently
+    and their analyses are merged into one answer. Segment and merged results are cached
+    by content hash. Short videos, or any video when ffmpeg is not installed, are processed
+    like process_video_with_gemini.
 
-    client = genai.Client()
+    Args:
+        video_path (str): Path to the video file.
+        task (str, optional): The analysis instruction.
+            Defaults to "Create a detailed and comprehensive summary of the video".
+        model_name (str, optional): The Gemini model to use. Defaults to "gemini-2.0-flash".
+        segment_seconds (float, optional): Length of each segment in seconds. Defaults to
+            the VIDEO_SEGMENT_SECONDS environment variable, or 600.
 
-    myfile = client.files.upload(file=video_path)
+    Returns:
+        str: The model's analysis of the whole video.
 
-    response = client.models.generate_content(
-        model=model_name, contents=[myfile, task]
+    Example:
+        >>> process_long_video_with_gemini(
+        ...     "path/to/recording.mp4",
+        ...     task="Summarize the decisions made in this meeting",
+        ...     segment_seconds=300,
+        ... )
+        'The team agreed to ...'
+    """
+    return get_segmented_video_analyzer().analyze(
+        video_path, task, model_name, segment_seconds
     )
 
-    print(response.text)
+
+def ask_video_questions(
+    video_path: str,
+    questions: List[str],
+    model_name: str = "gemini-2.0-flash",
+) -> str:
+    """
+    Ask several questions about one video with Google's Gemini model.
+
+    The video is uploaded once (or not at all if it was uploaded before) and the questions
+    are answered concurrently.
+
+    Args:
+        video_path (str): Path to the video file.
+        questions (List[str]): The questions or analysis instructions.
+        model_name (str, optional): The Gemini model to use. Defaults to "gemini-2.0-flash".
+
+    Returns:
+        str: A JSON object mapping each question to its answer.
+
+    Example:
+        >>> ask_video_questions(
+        ...     "path/to/video.mp4",
+        ...     ["Who appears in the video?", "Where is it filmed?"],
+        ... )
+        '{"Who appears in the video?": "...", "Where is it filmed?": "..."}'
+    """
+    answers = get_gemini_file_cache().ask(
+        video_path, questions, model_name
+    )
+    return json.dumps(dict(zip(questions, answers)), indent=2)
 
 
 def run_browser_agent(task: str) -> str:
@@ -865,6 +2514,85 @@ def run_browser_agent(task: str) -> str:
     return result
 
 
+async def arun_browser_agent(task: str) -> str:
+    """
+    Asynchronous version of `run_browser_agent` for use inside a running event loop.
+
+    The browser agent is awaited on the caller's loop rather than in a fresh loop
+    created by `asyncio.run`, so it can be used from async services and overlapped
+    with other I/O.
+
+    Args:
+        task (str): The task description for the browser agent to perform.
+
+    Returns:
+        str: The JSON-formatted result of the browser agent's execution.
+
+    Example:
+        >>> output = await arun_browser_agent("Go to example.com and get the title")
+    """
+    print(f"◢ BROWSER AGENT: Executing task - {task}")
+    result = await BrowserAgent().call_browser_agent(task)
+    print("◢ BROWSER AGENT: Task completed successfully")
+    return result
+
+
+def run_browser_agent_many(
+    tasks: List[str], timeout: Optional[float] = None
+) -> List[str]:
+    """
+    Run many browser tasks concurrently and return their results in order.
+
+    All tasks run on one event loop and share the process-wide browser pool, so
+    at most ``BROWSER_POOL_SIZE`` browsers are busy at a time and warm browsers
+    are reused from task to task.
+
+    Args:
+        tasks (List[str]): Natural language descriptions of the browser tasks.
+        timeout (float, optional): Seconds each task may run once it has a
+            browser. None means no limit.
+
+    Returns:
+        List[str]: One JSON-formatted result per task, in the same order as
+            ``tasks``. A failing or timed-out task yields an ``"Error: ..."``
+            string instead of raising.
+
+    Example:
+        >>> pages = ["https://example.com", "https://example.org"]
+        >>> results = run_browser_agent_many(
+        ...     [f"Go to {page} and return the headline" for page in pages],
+        ...     timeout=120,
+        ... )
+    """
+    print(f"◢ BROWSER AGENT: Executing {len(tasks)} tasks")
+    results = BrowserAgent().run_many(tasks, timeout=timeout)
+    print("◢ BROWSER AGENT: Tasks completed")
+    return results
+
+
+async def arun_browser_agent_many(
+    tasks: List[str], timeout: Optional[float] = None
+) -> List[str]:
+    """
+    Asynchronous version of `run_browser_agent_many`.
+
+    Args:
+        tasks (List[str]): Natural language descriptions of the browser tasks.
+        timeout (float, optional): Seconds each task may run once it has a
+            browser. None means no limit.
+
+    Returns:
+        List[str]: One JSON-formatted result or ``"Error: ..."`` string per
+            task, in the same order as ``tasks``.
+    """
+    print(f"◢ BROWSER AGENT: Executing {len(tasks)} tasks")
+    results = await BrowserAgent().call_browser_agent_many(
+        tasks, timeout=timeout
+    )
+    print("◢ BROWSER AGENT: Tasks completed")
+    return results
+
+
 def respond_to_user(response: str):
     """
     Respond to the user and don't use any tools.
@@ -884,6 +2612,8 @@ def respond_to_user(response: str):
     # Print the response for console output capture
     print(f"AgentOS Response: {response}")
 
+    from swarms.utils.formatter import formatter
+
     formatter.print_panel(
         content=response,
         title="AgentOS Response",
@@ -904,7 +2634,7 @@ def generate_video_single_clip(
     hosted on Vertex AI, and supports options such as video duration, number of videos,
     aspect ratio, and whether to enhance the prompt and generate audio.
 
-    The generated video will be saved in the workspace/videos directory.
+    The generated videos will be saved in the workspace/videos directory.
 
     Args:
         prompt (str):
@@ -913,21 +2643,25 @@ def generate_video_single_clip(
             relevant details to guide the model in producing the desired video.
             Example: "A futuristic cityscape at night with flying cars and neon lights."
         number_of_videos (int, optional):
-            The number of video variations to generate for the given prompt. Default is 2.
+            The number of video variations to generate for the given prompt. Default is 1.
             Each video will be a unique interpretation of the prompt.
         video_filename (str, optional):
             The filename for the generated video (not a full path). Default is "output.mp4".
             The video will be saved in the workspace/videos directory.
 
     Returns:
-        str: The full file path where the generated video has been saved.
+        str: The full file path where the generated video has been saved. When several
+            videos are generated, one path per line. An ``"Error: ..."`` string if the
+            model produced no video.
 
     Notes:
-        - The function currently saves only the first generated video, even if multiple are requested.
+        - Every generated video is saved; the second and later variations get a "_2", "_3", ...
+          suffix before the file extension.
         - Videos are automatically saved in the workspace/videos directory.
         - The model supports additional configuration options such as aspect ratio, prompt enhancement, and audio generation.
         - Ensure that your Google Cloud project has access to the Veo 3.0 model and that you have the necessary permissions.
         - Video generation may take several minutes depending on the prompt and duration.
+          To generate several clips, use generate_video_clips so they are produced in parallel.
         - For best results, use clear and descriptive prompts.
 
     Example:
@@ -939,47 +2673,77 @@ def generate_video_single_clip(
         '/path/to/workspace/videos/cat_surfing.mp4'
 
     """
-    # Get workspace directory and create videos subdirectory
-    workspace_dir = check_workspace_dir()
-    videos_dir = os.path.join(workspace_dir, "videos")
-    os.makedirs(videos_dir, exist_ok=True)
+    paths = (
+        get_video_job_manager()
+        .submit(prompt, video_filename, number_of_videos)
+        .result()
+    )
+    if not paths:
+        return f"Error: No video was generated for prompt: {prompt}"
+    for path in paths:
+        print(f"Video saved as {path}")
+    return "\n".join(paths)
 
-    # Create full path for the video file
-    video_path = os.path.join(videos_dir, video_filename)
 
-    client = genai.Client(
-        vertexai=True, project=PROJECT_ID, location=LOCATION
-    )
+def generate_video_clips(
+    prompts: List[str],
+    video_filenames: List[str],
+    number_of_videos: int = 1,
+) -> str:
+    """
+    Generate several video clips in parallel with Google's Veo 3.0 model.
 
-    # Submit the video generation request to the Veo 3.0 model
-    operation = client.models.generate_videos(
-        model="veo-3.0-generate-preview",
-        prompt=prompt,
-        config=genai.types.GenerateVideosConfig(
-            aspect_ratio="16:9",
-            number_of_videos=number_of_videos,
-            duration_seconds=8,
-            enhance_prompt=True,
-            generate_audio=True,
-        ),
-    )
+    Use this instead of repeated generate_video_single_clip calls when a storyboard or
+    scene list needs more than one clip: all clips are submitted at once, so the total time
+    is close to that of the slowest clip rather than the sum of all of them.
 
-    # Poll the operation status until the video is ready
-    while not operation.done:
-        time.sleep(15)
-        operation = client.operations.get(operation)
-        print("Operation status:", operation)
-
-    # Save the first generated video to the specified file path
-    if operation.response:
-        video_bytes = operation.result.generated_videos[
-            0
-        ].video.video_bytes
-        with open(video_path, "wb") as out_file:
-            out_file.write(video_bytes)
-        print(f"Video saved as {video_path}")
-
-    return video_path
+    Args:
+        prompts (List[str]): One detailed description per clip.
+        video_filenames (List[str]): One filename (not a full path) per clip, in the same
+            order as ``prompts``. The videos are saved in the workspace/videos directory,
+            so every filename must be unique.
+        number_of_videos (int, optional): Variations to generate per clip. Default is 1.
+
+    Returns:
+        str: A JSON object mapping each filename to the list of saved video paths, or to an
+            ``"Error: ..."`` string if that clip failed.
+
+    Example:
+        >>> generate_video_clips(
+        ...     prompts=["A sunrise over the mountains", "A sunset over the sea"],
+        ...     video_filenames=["sunrise.mp4", "sunset.mp4"],
+        ... )
+        '{"sunrise.mp4": ["/path/to/workspace/videos/sunrise.mp4"], ...}'
+    """
+    if len(prompts) != len(video_filenames):
+        return "Error: prompts and video_filenames must have the same length"
+
+    print(f"◢ VIDEO: Generating {len(prompts)} clips")
+    try:
+        futures = get_video_job_manager().submit_many(
+            [
+                {
+                    "prompt": prompt,
+                    "video_filename": video_filename,
+                    "number_of_videos": number_of_videos,
+                }
+                for prompt, video_filename in zip(
+                    prompts, video_filenames
+                )
+            ]
+        )
+    except ValueError as e:
+        return f"Error: {str(e)}"
+    results = {}
+    for video_filename, future in zip(video_filenames, futures):
+        try:
+            results[video_filename] = future.result() or (
+                "Error: No video was generated"
+            )
+        except Exception as e:
+            results[video_filename] = f"Error: {str(e)}"
+    print("◢ VIDEO: Clips completed")
+    return json.dumps(results, indent=2)
 
 
 def create_file(
@@ -0,0 +1,334 @@
+import atexit
+import csv
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from agentos_sdk.cache import ResponseCache
+from agentos_sdk.gemini_files import (
+    GeminiFileCache,
+    get_gemini_file_cache,
+)
+
+SEGMENT_PROMPT = (
+    "This clip is segment {index} of {count} of a longer video and covers "
+    "{start} to {end} of it. {task}"
+)
+
+MERGE_PROMPT = (
+    "The following are analyses of consecutive segments of one video, in "
+    "order. Combine them into a single coherent answer to the task below, "
+    "keeping timestamps where they are useful and without mentioning the "
+    "segmentation.\n\nTask: {task}\n\n{analyses}"
+)
+
+
+def _timestamp(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class SegmentedVideoAnalyzer:
+    """
+    Analyzes long videos as concurrently processed time segments.
+
+    The video is cut into ``segment_seconds`` windows with ffmpeg (stream
+    copy, no re-encoding), each segment is uploaded and analyzed in parallel
+    (map), and the segment analyses are merged by one more model call
+    (reduce). Segment analyses are cached by the SHA-256 of the segment
+    contents and the task, whatever the segment's position, and answers by
+    that of the whole video, so repeated or overlapping questions skip the
+    work already done. Videos no longer than
+    one segment, or any video when ffmpeg is not installed, are analyzed in
+    a single request.
+
+    Attributes:
+        segment_seconds (float): Default length of a segment
+        max_workers (int): Segments analyzed at the same time
+        file_cache (GeminiFileCache): Uploads segments and calls the model
+        cache (ResponseCache): Cache of segment and merged analyses
+
+    Example:
+        >>> analyzer = get_segmented_video_analyzer()
+        >>> analyzer.analyze("lecture.mp4", "List the topics covered")
+        '1. Introduction (00:00:00) ...'
+    """
+
+    def __init__(
+        self,
+        segment_seconds: float = 600,
+        max_workers: int = 4,
+        file_cache: Optional[GeminiFileCache] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
+        self.segment_seconds = segment_seconds
+        self.max_workers = max_workers
+        self.file_cache = file_cache or get_gemini_file_cache()
+        self.cache = cache or ResponseCache(
+            maxsize=int(
+                os.getenv("VIDEO_ANALYSIS_CACHE_SIZE", "512")
+            ),
+            path=os.getenv("VIDEO_ANALYSIS_CACHE_PATH"),
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        """Return True if ffmpeg and ffprobe are installed."""
+        return bool(
+            shutil.which("ffmpeg") and shutil.which("ffprobe")
+        )
+
+    @staticmethod
+    def duration(video_path: str) -> float:
+        """Return the length of a video in seconds, read with ffprobe."""
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                video_path,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return float(result.stdout.strip())
+
+    def split(
+        self, video_path: str, output_dir: str, segment_seconds: float
+    ) -> List[Tuple[str, float, float]]:
+        """
+        Cut a video into segments without re-encoding.
+
+        Segments start on keyframes, so their lengths only approximate
+        ``segment_seconds``.
+
+        Returns:
+            ``(path, start, end)`` for each segment, in order, with times
+            in seconds
+        """
+        _, ext = os.path.splitext(video_path)
+        segment_list = os.path.join(output_dir, "segments.csv")
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-v",
+                "error",
+                "-i",
+                video_path,
+                "-map",
+                "0",
+                "-c",
+                "copy",
+                "-f",
+                "segment",
+                "-segment_time",
+                str(segment_seconds),
+                "-segment_list",
+                segment_list,
+                "-segment_list_type",
+                "csv",
+                "-reset_timestamps",
+                "1",
+                os.path.join(
+                    output_dir, f"segment_%04d{ext or '.mp4'}"
+                ),
+            ],
+            capture_output=True,
+            check=True,
+        )
+        with open(segment_list, newline="") as f:
+            return [
+                (
+                    os.path.join(output_dir, name),
+                    float(start),
+                    float(end),
+                )
+                for name, start, end in csv.reader(f)
+            ]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="video-segments",
+                )
+            return self._executor
+
+    def _analyze_segment(
+        self,
+        segment: Tuple[str, float, float],
+        task: str,
+        prompt: str,
+        model_name: str,
+    ) -> str:
+        path, _, _ = segment
+        # The prompt only adds the segment's position, so the same clip
+        # inside another video still hits the cache
+        key = ResponseCache.make_key(
+            {
+                "video": self.file_cache.digest(path),
+                "task": task,
+                "model": model_name,
+            }
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        analysis = self.file_cache.generate(path, prompt, model_name)
+        self.cache.set(key, analysis)
+        return analysis
+
+    def _merge(
+        self, task: str, analyses: List[str], model_name: str
+    ) -> str:
+        response = self.file_cache.client.models.generate_content(
+            model=model_name,
+            contents=[
+                MERGE_PROMPT.format(
+                    task=task, analyses="\n\n".join(analyses)
+                )
+            ],
+        )
+        return response.text
+
+    def analyze(
+        self,
+        video_path: str,
+        task: str,
+        model_name: str = "gemini-2.0-flash",
+        segment_seconds: Optional[float] = None,
+    ) -> str:
+        """
+        Analyze a video, splitting it into segments if it is long.
+
+        Args:
+            video_path (str): Path to the video
+            task (str): What to do with the video
+            model_name (str): Gemini model for the segment and merge calls
+            segment_seconds (float, optional): Override the segment length
+
+        Returns:
+            str: The merged analysis
+
+        Raises:
+            RuntimeError: If every segment failed.
+        """
+        segment_seconds = segment_seconds or self.segment_seconds
+        if not self.available():
+            logger.warning(
+                "ffmpeg not found; analyzing the video in one request"
+            )
+            return self.file_cache.generate(
+                video_path, task, model_name
+            )
+
+        # Checked before probing the video, so a repeated question costs
+        # neither ffprobe nor a model call
+        key = ResponseCache.make_key(
+            {
+                "video": self.file_cache.digest(video_path),
+                "segment_seconds": segment_seconds,
+                "task": task,
+                "model": model_name,
+            }
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        if self.duration(video_path) <= segment_seconds:
+            answer = self.file_cache.generate(
+                video_path, task, model_name
+            )
+            if answer:
+                self.cache.set(key, answer)
+            return answer
+
+        with tempfile.TemporaryDirectory(
+            prefix="agentos-segments-"
+        ) as output_dir:
+            segments = self.split(
+                video_path, output_dir, segment_seconds
+            )
+            logger.info(
+                f"Analyzing {video_path} as {len(segments)} segments"
+            )
+            futures = [
+                self._get_executor().submit(
+                    self._analyze_segment,
+                    segment,
+                    task,
+                    SEGMENT_PROMPT.format(
+                        index=index + 1,
+                        count=len(segments),
+                        start=_timestamp(segment[1]),
+                        end=_timestamp(segment[2]),
+                        task=task,
+                    ),
+                    model_name,
+                )
+                for index, segment in enumerate(segments)
+            ]
+            analyses = []
+            for (_, start, end), future in zip(segments, futures):
+                try:
+                    analyses.append(
+                        f"[{_timestamp(start)} - {_timestamp(end)}]\n"
+                        f"{future.result()}"
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Skipping segment {_timestamp(start)} of {video_path}: {e}"
+                    )
+
+        if not analyses:
+            raise RuntimeError(
+                f"Every segment of {video_path} failed to process"
+            )
+        merged = self._merge(task, analyses, model_name)
+        # Only complete analyses are cached
+        if len(analyses) == len(segments):
+            self.cache.set(key, merged)
+        return merged
+
+    def stats(self) -> Dict[str, int]:
+        return self.cache.stats()
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.cache.close()
+
+
+_segmented_video_analyzer: Optional[SegmentedVideoAnalyzer] = None
+_segmented_video_analyzer_lock = threading.Lock()
+
+
+def get_segmented_video_analyzer() -> SegmentedVideoAnalyzer:
+    """Return the process-wide SegmentedVideoAnalyzer, creating it on first use."""
+    global _segmented_video_analyzer
+    with _segmented_video_analyzer_lock:
+        if _segmented_video_analyzer is None:
+            _segmented_video_analyzer = SegmentedVideoAnalyzer(
+                segment_seconds=float(
+                    os.getenv("VIDEO_SEGMENT_SECONDS", "600")
+                )
+            )
+            atexit.register(_segmented_video_analyzer.close)
+    return _segmented_video_analyzer
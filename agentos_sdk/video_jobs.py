@@ -0,0 +1,529 @@
+import atexit
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from agentos_sdk.workspace import check_workspace_dir
+
+VEO_MODEL = "veo-3.0-generate-preview"
+
+
+class VeoBackend:
+    """
+    Submits and polls Veo video generation operations through the GenAI SDK.
+
+    The Vertex AI client is created on first use and reused for every job.
+
+    Attributes:
+        model (str): The Veo model to call
+        project (str): Google Cloud project ID
+        location (str): Google Cloud location
+    """
+
+    def __init__(
+        self,
+        model: str = VEO_MODEL,
+        project: Optional[str] = None,
+        location: Optional[str] = None,
+    ):
+        self.model = model
+        self.project = project or os.getenv("GOOGLE_CLOUD_PROJECT_ID")
+        self.location = location or os.getenv("GOOGLE_CLOUD_LOCATION")
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                from google import genai
+
+                self._client = genai.Client(
+                    vertexai=True,
+                    project=self.project,
+                    location=self.location,
+                )
+            return self._client
+
+    def submit(self, prompt: str, number_of_videos: int = 1) -> Any:
+        """Start a generation request and return its operation."""
+        from google import genai
+
+        return self.client.models.generate_videos(
+            model=self.model,
+            prompt=prompt,
+            config=genai.types.GenerateVideosConfig(
+                aspect_ratio="16:9",
+                number_of_videos=number_of_videos,
+                duration_seconds=8,
+                enhance_prompt=True,
+                generate_audio=True,
+            ),
+        )
+
+    def refresh(self, operation: Any) -> Any:
+        """Return the latest state of an operation."""
+        return self.client.operations.get(operation)
+
+    @staticmethod
+    def is_done(operation: Any) -> bool:
+        return bool(operation.done)
+
+    @staticmethod
+    def result(operation: Any) -> List[bytes]:
+        """
+        Return the bytes of every video produced by a finished operation.
+
+        Raises:
+            RuntimeError: If the operation failed.
+        """
+        if operation.error:
+            raise RuntimeError(
+                f"Video generation failed: {operation.error}"
+            )
+        if not operation.response:
+            return []
+        return [
+            generated.video.video_bytes
+            for generated in operation.result.generated_videos
+        ]
+
+
+class FakeVideoBackend:
+    """
+    An in-process stand-in for VeoBackend, for tests and local development.
+
+    Operations finish ``latency`` seconds after submission and produce
+    ``b"fake-video:<prompt>:<index>"`` for each requested video.
+
+    Attributes:
+        latency (float): Seconds until an operation is done
+        fail_prompts (set): Prompts whose operations finish with an error
+        submitted (int): Number of operations submitted
+        polls (int): Number of refresh calls made
+    """
+
+    def __init__(
+        self, latency: float = 0.0, fail_prompts: Optional[set] = None
+    ):
+        self.latency = latency
+        self.fail_prompts = set(fail_prompts or ())
+        self.submitted = 0
+        self.polls = 0
+        self._lock = threading.Lock()
+
+    def submit(
+        self, prompt: str, number_of_videos: int = 1
+    ) -> Dict[str, Any]:
+        with self._lock:
+            self.submitted += 1
+        return {
+            "prompt": prompt,
+            "number_of_videos": number_of_videos,
+            "ready_at": time.monotonic() + self.latency,
+        }
+
+    def refresh(self, operation: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.polls += 1
+        return operation
+
+    @staticmethod
+    def is_done(operation: Dict[str, Any]) -> bool:
+        return time.monotonic() >= operation["ready_at"]
+
+    def result(self, operation: Dict[str, Any]) -> List[bytes]:
+        if operation["prompt"] in self.fail_prompts:
+            raise RuntimeError(
+                f"Video generation failed: {operation['prompt']}"
+            )
+        return [
+            f"fake-video:{operation['prompt']}:{index}".encode()
+            for index in range(operation["number_of_videos"])
+        ]
+
+
+def _video_filenames(
+    video_filename: str, number_of_videos: int
+) -> List[str]:
+    """Return the file names a job writes its videos to."""
+    stem, ext = os.path.splitext(video_filename)
+    return [video_filename] + [
+        f"{stem}_{index}{ext}"
+        for index in range(2, number_of_videos + 1)
+    ]
+
+
+class _VideoJob:
+    """A submitted request waiting for its operation to finish."""
+
+    def __init__(
+        self,
+        prompt: str,
+        video_filename: str,
+        number_of_videos: int,
+        future: Future,
+        deadline: Optional[float],
+    ):
+        self.prompt = prompt
+        self.video_filename = video_filename
+        self.number_of_videos = number_of_videos
+        self.filenames = _video_filenames(
+            video_filename, number_of_videos
+        )
+        self.future = future
+        self.deadline = deadline
+        self.operation = None
+        self.next_poll = 0.0
+        self.interval = 0.0
+
+
+class VideoJobManager:
+    """
+    Runs many video generation requests concurrently.
+
+    Requests are submitted from a small thread pool, and a single scheduler
+    thread polls every pending operation. The interval between polls of an
+    operation starts at ``poll_interval`` and grows by ``backoff`` up to
+    ``max_poll_interval``, so short jobs finish promptly without long jobs
+    flooding the API. Every video an operation returns is written to the
+    workspace ``videos`` directory; two unfinished jobs may not write the
+    same file.
+
+    Attributes:
+        backend: Object with submit, refresh, is_done and result methods,
+            such as VeoBackend or FakeVideoBackend
+        videos_dir (str): Directory the videos are written to
+        poll_interval (float): Seconds before the first poll of a job
+        max_poll_interval (float): Upper bound for the poll interval
+        backoff (float): Factor the poll interval grows by after each poll
+        job_timeout (float): Seconds a job may take before it fails.
+            Defaults to the VEO_JOB_TIMEOUT environment variable, or 600
+
+    Example:
+        >>> manager = get_video_job_manager()
+        >>> futures = [
+        ...     manager.submit(prompt, f"clip_{i}.mp4")
+        ...     for i, prompt in enumerate(storyboard)
+        ... ]
+        >>> paths = [future.result() for future in futures]
+    """
+
+    def __init__(
+        self,
+        backend: Any = None,
+        videos_dir: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        max_poll_interval: Optional[float] = None,
+        backoff: float = 1.5,
+        job_timeout: Optional[float] = None,
+        max_workers: int = 4,
+    ):
+        self.backend = backend or VeoBackend()
+        self.videos_dir = videos_dir
+        self.poll_interval = (
+            poll_interval
+            if poll_interval is not None
+            else float(os.getenv("VEO_POLL_INTERVAL", "5"))
+        )
+        self.max_poll_interval = (
+            max_poll_interval
+            if max_poll_interval is not None
+            else float(os.getenv("VEO_MAX_POLL_INTERVAL", "30"))
+        )
+        self.backoff = backoff
+        self.job_timeout = (
+            job_timeout
+            if job_timeout is not None
+            else float(os.getenv("VEO_JOB_TIMEOUT", "600"))
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="video-jobs"
+        )
+        # Jobs not yet finished, the files they will write, and those of
+        # them waiting for a poll
+        self._active: set = set()
+        self._filenames: set = set()
+        self._pending: List[_VideoJob] = []
+        self._condition = threading.Condition()
+        self._scheduler: Optional[threading.Thread] = None
+        self._closed = False
+        self.completed = 0
+        self.failed = 0
+
+    def submit(
+        self,
+        prompt: str,
+        video_filename: str,
+        number_of_videos: int = 1,
+        callback: Optional[Callable[[Future], None]] = None,
+    ) -> Future:
+        """
+        Start generating a clip without waiting for it.
+
+        Args:
+            prompt (str): Description of the video
+            video_filename (str): File name (not a path) of the first video;
+                further videos get a ``_2``, ``_3``, ... suffix
+            number_of_videos (int): Number of variations to generate
+            callback (Callable, optional): Called with the future once the
+                job finishes
+
+        Returns:
+            Future: Resolves to the list of saved video paths
+
+        Raises:
+            ValueError: If an unfinished job writes to the same file.
+        """
+        return self._enqueue(
+            [
+                self._make_job(
+                    prompt, video_filename, number_of_videos, callback
+                )
+            ]
+        )[0]
+
+    def submit_many(
+        self, clips: List[Dict[str, Any]]
+    ) -> List[Future]:
+        """
+        Start several clips at once.
+
+        Args:
+            clips: Keyword arguments for ``submit``, one dict per clip
+
+        Returns:
+            List[Future]: One future per clip, in the same order
+
+        Raises:
+            ValueError: If two clips, or a clip and an unfinished job, write
+                to the same file. No clip is started in that case.
+        """
+        return self._enqueue(
+            [self._make_job(**clip) for clip in clips]
+        )
+
+    def _make_job(
+        self,
+        prompt: str,
+        video_filename: str,
+        number_of_videos: int = 1,
+        callback: Optional[Callable[[Future], None]] = None,
+    ) -> _VideoJob:
+        future: Future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        deadline = (
+            time.monotonic() + self.job_timeout
+            if self.job_timeout is not None
+            else None
+        )
+        return _VideoJob(
+            prompt, video_filename, number_of_videos, future, deadline
+        )
+
+    def _enqueue(self, jobs: List[_VideoJob]) -> List[Future]:
+        """Reserve the jobs' files and start them, all or none."""
+        filenames = [name for job in jobs for name in job.filenames]
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("VideoJobManager is closed")
+            taken = self._filenames.intersection(filenames)
+            if not taken and len(set(filenames)) < len(filenames):
+                taken = {
+                    name
+                    for name in filenames
+                    if filenames.count(name) > 1
+                }
+            if taken:
+                raise ValueError(
+                    "Another video job is already writing "
+                    f"{', '.join(sorted(taken))}"
+                )
+            self._filenames.update(filenames)
+            self._active.update(jobs)
+        for job in jobs:
+            self._executor.submit(self._start, job)
+        return [job.future for job in jobs]
+
+    def _release(self, job: _VideoJob) -> bool:
+        """
+        Remove a job from the active set; call with the condition held.
+
+        Whoever removes a job resolves its future, so a concurrent close()
+        and _finish() never both set it.
+        """
+        if job not in self._active:
+            return False
+        self._active.discard(job)
+        self._filenames.difference_update(job.filenames)
+        return True
+
+    def _start(self, job: _VideoJob) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            with self._condition:
+                self._release(job)
+            return
+        try:
+            job.operation = self.backend.submit(
+                job.prompt, job.number_of_videos
+            )
+        except Exception as e:
+            self._fail(job, e)
+            return
+        job.interval = self.poll_interval
+        job.next_poll = time.monotonic() + job.interval
+        with self._condition:
+            self._pending.append(job)
+            self._ensure_scheduler()
+            self._condition.notify()
+
+    def _ensure_scheduler(self) -> None:
+        if self._scheduler is None or not self._scheduler.is_alive():
+            self._scheduler = threading.Thread(
+                target=self._schedule,
+                name="video-job-scheduler",
+                daemon=True,
+            )
+            self._scheduler.start()
+
+    def _schedule(self) -> None:
+        """Poll pending operations as they become due."""
+        while True:
+            with self._condition:
+                while not self._closed:
+                    now = time.monotonic()
+                    due = [
+                        job
+                        for job in self._pending
+                        if job.next_poll <= now
+                    ]
+                    if due:
+                        break
+                    wait = (
+                        min(job.next_poll for job in self._pending)
+                        - now
+                        if self._pending
+                        else None
+                    )
+                    self._condition.wait(wait)
+                if self._closed:
+                    return
+                for job in due:
+                    self._pending.remove(job)
+
+            for job in due:
+                self._poll(job)
+
+    def _poll(self, job: _VideoJob) -> None:
+        try:
+            job.operation = self.backend.refresh(job.operation)
+            done = self.backend.is_done(job.operation)
+        except Exception as e:
+            self._fail(job, e)
+            return
+
+        if done:
+            self._executor.submit(self._finish, job)
+            return
+        if (
+            job.deadline is not None
+            and time.monotonic() >= job.deadline
+        ):
+            self._fail(
+                job,
+                TimeoutError(
+                    f"Video generation timed out after {self.job_timeout} seconds"
+                ),
+            )
+            return
+
+        job.interval = min(
+            job.interval * self.backoff, self.max_poll_interval
+        )
+        job.next_poll = time.monotonic() + job.interval
+        with self._condition:
+            self._pending.append(job)
+
+    def _finish(self, job: _VideoJob) -> None:
+        try:
+            paths = self._save(
+                job.video_filename, self.backend.result(job.operation)
+            )
+        except Exception as e:
+            self._fail(job, e)
+            return
+        with self._condition:
+            if not self._release(job):
+                return
+            self.completed += 1
+        logger.info(f"Saved {len(paths)} video(s) for {job.prompt!r}")
+        job.future.set_result(paths)
+
+    def _fail(self, job: _VideoJob, error: Exception) -> None:
+        with self._condition:
+            if not self._release(job):
+                return
+            self.failed += 1
+        logger.error(f"Video job for {job.prompt!r} failed: {error}")
+        if not job.future.done():
+            job.future.set_exception(error)
+
+    def _save(
+        self, video_filename: str, videos: List[bytes]
+    ) -> List[str]:
+        """Write every generated video and return their paths."""
+        videos_dir = self.videos_dir or os.path.join(
+            check_workspace_dir(), "videos"
+        )
+        os.makedirs(videos_dir, exist_ok=True)
+        names = _video_filenames(video_filename, len(videos))
+        paths = []
+        for name, video_bytes in zip(names, videos):
+            path = os.path.join(videos_dir, name)
+            with open(path, "wb") as out_file:
+                out_file.write(video_bytes)
+            paths.append(path)
+        return paths
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            active = len(self._active)
+        return {
+            "active": active,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def close(self) -> None:
+        """Stop polling and fail jobs that have not finished."""
+        with self._condition:
+            self._closed = True
+            active, self._active = self._active, set()
+            self._filenames = set()
+            self._pending = []
+            self._condition.notify_all()
+        for job in active:
+            if not job.future.cancel() and not job.future.done():
+                job.future.set_exception(
+                    RuntimeError("VideoJobManager was closed")
+                )
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_video_job_manager: Optional[VideoJobManager] = None
+_video_job_manager_lock = threading.Lock()
+
+
+def get_video_job_manager() -> VideoJobManager:
+    """Return the process-wide VideoJobManager, creating it on first use."""
+    global _video_job_manager
+    with _video_job_manager_lock:
+        if _video_job_manager is None:
+            _video_job_manager = VideoJobManager()
+            atexit.register(_video_job_manager.close)
+    return _video_job_manager
@@ -0,0 +1,124 @@
+"""
+Benchmark RAGSystem.chunk_text throughput against the previous
+split-on-"." implementation.
+
+Usage:
+    python benchmarks/chunk_text_benchmark.py --size-mb 8 --repeat 3
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from agentos_sdk.rag import RAGSystem
+
+
+def legacy_chunk_text(text: str, chunk_size: int) -> List[str]:
+    """The chunker RAGSystem used before it became tokenizer based."""
+    if not text:
+        return []
+
+    sentences = text.split(".")
+    chunks = []
+    current_chunk = []
+    current_length = 0
+
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+
+        sentence_length = len(sentence.split())
+        if (
+            current_length + sentence_length > chunk_size
+            and current_chunk
+        ):
+            chunks.append(". ".join(current_chunk) + ".")
+            current_chunk = []
+            current_length = 0
+
+        current_chunk.append(sentence)
+        current_length += sentence_length
+
+    if current_chunk:
+        chunks.append(". ".join(current_chunk) + ".")
+
+    if not chunks:
+        chunks = [text]
+
+    return chunks
+
+
+def make_corpus(size_mb: float, seed: int = 0) -> str:
+    """Generate prose-like text of roughly ``size_mb`` megabytes."""
+    rng = random.Random(seed)
+    words = (
+        "agent system model retrieval context token document embedding "
+        "vector query latency batch pipeline memory throughput browser"
+    ).split()
+    target = int(size_mb * 1024 * 1024)
+    parts = []
+    length = 0
+    while length < target:
+        sentence = " ".join(
+            rng.choice(words) for _ in range(rng.randint(5, 30))
+        )
+        sentence = sentence.capitalize() + rng.choice(
+            [". ", "? ", ".\n"]
+        )
+        parts.append(sentence)
+        length += len(sentence)
+    return "".join(parts)
+
+
+def measure(
+    name: str, fn: Callable[[str], List[str]], text: str, repeat: int
+) -> None:
+    """Print the best-of-``repeat`` throughput of a chunker."""
+    best = float("inf")
+    chunks = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = fn(text)
+        best = min(best, time.perf_counter() - start)
+    size_mb = len(text.encode("utf-8")) / (1024 * 1024)
+    print(
+        f"{name:<10} {size_mb / best:8.2f} MB/s  "
+        f"{len(chunks):7d} chunks  {best:7.3f} s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, default=8.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--chunk-overlap", type=int, default=50)
+    parser.add_argument(
+        "--embedding-model", default="all-MiniLM-L6-v2"
+    )
+    args = parser.parse_args()
+
+    # Only the chunking configuration is needed, so skip creating the
+    # ChromaDB client and loading the embedding model
+    rag = RAGSystem.__new__(RAGSystem)
+    rag.embedding_model = args.embedding_model
+    rag.chunk_size = args.chunk_size
+    rag.chunk_overlap = args.chunk_overlap
+
+    text = make_corpus(args.size_mb)
+    # Warm up so tokenizer loading is not part of the measurement
+    rag.chunk_text(text[:1000])
+
+    measure(
+        "legacy",
+        lambda t: legacy_chunk_text(t, args.chunk_size),
+        text,
+        args.repeat,
+    )
+    measure("tokenizer", rag.chunk_text, text, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
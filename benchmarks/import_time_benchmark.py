@@ -0,0 +1,137 @@
+"""
+Measure the cold import time of agentos_sdk modules with ``python -X importtime``
+and guard against heavy dependencies creeping back into module import.
+
+Each target is imported in a fresh interpreter so nothing is shared between
+runs. The script exits non-zero if a heavy dependency is loaded at import
+time or if the best import time exceeds ``--max-ms``.
+
+Usage:
+    python benchmarks/import_time_benchmark.py --repeat 5 --max-ms 500
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Modules that must only be imported when the feature needing them is used
+HEAVY_MODULES = [
+    "torch",
+    "transformers",
+    "chromadb",
+    "pandas",
+    "numpy",
+    "PyPDF2",
+    "bs4",
+    "litellm",
+    "google.genai",
+    "claude_code_sdk",
+    "swarms",
+]
+
+DEFAULT_TARGETS = [
+    "agentos_sdk",
+    "agentos_sdk.tools",
+    "agentos_sdk.rag",
+]
+
+
+def import_time(target: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """
+    Import ``target`` in a fresh interpreter.
+
+    Returns:
+        The total import time in milliseconds and the slowest modules as
+        ``(cumulative_ms, module)`` pairs.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import {target}",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        cumulative_us = int(fields[1])
+        name = fields[2].strip()
+        modules.append((cumulative_us / 1000, name))
+        # Count the target and its parent packages, which are the
+        # unindented (top-level) entries; interpreter startup is excluded
+        is_top_level = not fields[2].startswith("  ")
+        if is_top_level and (
+            name == target or target.startswith(name + ".")
+        ):
+            total_us += cumulative_us
+    modules.sort(reverse=True)
+    return total_us / 1000, modules
+
+
+def loaded_heavy_modules(target: str) -> List[str]:
+    """Return the heavy modules present in ``sys.modules`` after import."""
+    code = (
+        "import sys\n"
+        f"import {target}\n"
+        f"heavy = {HEAVY_MODULES!r}\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    output = result.stdout.strip()
+    return output.split(",") if output else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="Fail if any target takes longer than this to import",
+    )
+    args = parser.parse_args()
+
+    failures: Dict[str, str] = {}
+    for target in args.targets:
+        runs = [import_time(target) for _ in range(args.repeat)]
+        best, slowest = min(runs, key=lambda run: run[0])
+        print(f"{target:<20} {best:8.1f} ms (best of {args.repeat})")
+        for cumulative_ms, name in slowest[: args.top]:
+            print(f"    {cumulative_ms:8.1f} ms  {name}")
+
+        heavy = loaded_heavy_modules(target)
+        if heavy:
+            failures[target] = (
+                f"imports heavy modules eagerly: {', '.join(heavy)}"
+            )
+        elif args.max_ms is not None and best > args.max_ms:
+            failures[target] = (
+                f"import took {best:.1f} ms (limit {args.max_ms:.1f} ms)"
+            )
+
+    for target, reason in failures.items():
+        print(f"FAIL {target}: {reason}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()